@@ -0,0 +1,4 @@
+"""
+Benchmarks for htmgel. See ``run.py`` for the suite, and the other modules for standalone measurements.
+
+"""
@@ -0,0 +1,101 @@
+"""
+Measure the time taken to import the template tag library, as reported by ``python -X importtime``.
+
+Django's template package is imported (and settings are configured) before the measurement, as it is already loaded
+by any process that renders templates. The remaining time is that of htmgel and the modules it imports.
+
+Usage:
+
+.. code::
+
+    python benchmarks/import_time.py [runs] [path]
+
+Pass the path to another checkout, e.g. one created with ``git worktree add``, to compare against an earlier version.
+
+"""
+# Imports
+
+import os
+import subprocess
+import sys
+
+# Constants
+
+DEFAULT_RUNS = 10
+
+MODULE = "htmgel.templatetags.htmgel_tags"
+
+PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SETUP = "; ".join((
+    "from django.conf import settings",
+    "settings.configure(HTML_FRAMEWORK='bootstrap3')",
+    "import django.template",
+    "import django.utils.translation",
+))
+
+# Functions
+
+
+def measure(path=PATH):
+    """Import the tag library in a new interpreter.
+
+    :param path: The directory that contains the ``htmgel`` package.
+    :type path: str
+
+    :rtype: tuple(int, list[str])
+    :returns: The cumulative import time in microseconds and the names of the modules that were imported with it.
+
+    """
+    code = "%s; import %s" % (SETUP, MODULE)
+    env = dict(os.environ, PYTHONPATH=path)
+    env.pop("DJANGO_SETTINGS_MODULE", None)
+
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        check=True,
+        cwd=path,
+        env=env,
+        stderr=subprocess.PIPE
+    ).stderr.decode("utf-8")
+
+    # Modules are listed after those they import, at a greater depth, so the modules imported on behalf of the
+    # library are those listed immediately before it.
+    lines = [line[len("import time:"):].split("|") for line in output.splitlines() if line.startswith("import time:")]
+    total = 0
+    modules = list()
+    depth = None
+    for self_time, cumulative, name in reversed(lines[1:]):
+        if depth is None:
+            if name.strip() == MODULE:
+                total = int(cumulative)
+                depth = len(name) - len(name.lstrip())
+
+            continue
+
+        if len(name) - len(name.lstrip()) <= depth:
+            break
+
+        modules.append(name.strip())
+
+    return total, modules
+
+
+def main(runs=DEFAULT_RUNS, path=PATH):
+    times = list()
+    modules = list()
+    for i in range(runs):
+        total, modules = measure(path)
+        times.append(total)
+
+    times.sort()
+
+    print("Import of %s from %s (%s runs)" % (MODULE, path, runs))
+    print("-" * 60)
+    print("%-40s %10.1f ms" % ("best", times[0] / 1000.0))
+    print("%-40s %10.1f ms" % ("median", times[len(times) // 2] / 1000.0))
+    print("%-40s %10s" % ("modules imported", len(modules)))
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]], *sys.argv[2:3])
@@ -0,0 +1,84 @@
+"""
+Measure the memory used per table row.
+
+``LegacyRow`` reproduces the layout of rows before ``__slots__`` were added, i.e. an instance ``__dict__`` holding the
+content, tags and a ``dict`` of attributes for every row.
+
+Usage:
+
+.. code::
+
+    python benchmarks/memory_rows.py [count]
+
+"""
+# Imports
+
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from htmgel.library import Row, SimpleRow, Table  # noqa: E402
+
+# Constants
+
+DEFAULT_COUNT = 10000
+
+# Classes
+
+
+class LegacyRow(object):
+    """A row with the instance layout used before ``__slots__``."""
+
+    def __init__(self, data, **kwargs):
+        self.content = data
+        self._close_tag = None
+        self._open_tag = "tr"
+        self._attributes = kwargs
+
+# Functions
+
+
+def measure(factory, count=DEFAULT_COUNT):
+    """Get the number of bytes allocated per row.
+
+    :param factory: A callable that accepts the row data and returns a row.
+
+    :param count: The number of rows to create.
+    :type count: int
+
+    :rtype: float
+
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+
+    # Each row gets its own data tuple, which SimpleRow copies and releases while the other rows keep a reference.
+    rows = [factory(("Project", i, "2018-01-01", "active")) for i in range(count)]
+
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # The list holding the rows is the same for every factory and is not counted.
+    return (after - before - sys.getsizeof(rows)) / float(count)
+
+
+def main(count=DEFAULT_COUNT):
+    table = Table()
+
+    results = (
+        ("before (instance __dict__)", LegacyRow),
+        ("Row (__slots__)", Row),
+        ("SimpleRow (tuple)", SimpleRow),
+        ("Table.add_rows()", lambda data: table.add_rows((data,))),
+    )
+
+    print("Bytes per row for %s rows, including the data tuple" % count)
+    print("-" * 60)
+    for label, factory in results:
+        print("%-40s %10.1f" % (label, measure(factory, count=count)))
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]])
@@ -0,0 +1,116 @@
+"""
+A Django project with an in-memory SQLite database, in which the benchmarks are run.
+
+"""
+# Imports
+
+import os
+
+# Exports
+
+__all__ = (
+    "BENCHMARKS_PATH",
+    "seed",
+    "setup",
+)
+
+# Constants
+
+BENCHMARKS_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PATH = os.path.dirname(BENCHMARKS_PATH)
+
+_seeded = 0
+
+# Functions
+
+
+def seed(count):
+    """Make sure the database holds the given number of invoices.
+
+    :param count: The number of invoices.
+    :type count: int
+
+    :rtype: django.db.models.QuerySet
+    :returns: The invoices.
+
+    """
+    global _seeded
+
+    from datetime import date, timedelta
+    from decimal import Decimal
+    from .models import Client, Invoice
+
+    if _seeded != count:
+        Invoice.objects.all().delete()
+        Client.objects.all().delete()
+
+        clients = Client.objects.bulk_create([Client(name="Client %s" % i) for i in range(100)])
+
+        issued = date(2018, 1, 1)
+        Invoice.objects.bulk_create(
+            [
+                Invoice(
+                    amount=Decimal(i) + Decimal("0.5"),
+                    client=clients[i % len(clients)],
+                    issued=issued + timedelta(days=i % 365),
+                    number="INV-%06d" % i,
+                    status="paid" if i % 3 else "open"
+                )
+                for i in range(count)
+            ],
+            batch_size=1000
+        )
+
+        _seeded = count
+
+    return Invoice.objects.all()
+
+
+def setup():
+    """Configure settings and create the database tables."""
+    import django
+    from django.conf import settings
+
+    if settings.configured:
+        return
+
+    settings.configure(
+        DATABASES={
+            'default': {
+                'ENGINE': "django.db.backends.sqlite3",
+                'NAME': ":memory:",
+            },
+        },
+        DEBUG=False,
+        HTML_FRAMEWORK="bootstrap3",
+        INSTALLED_APPS=[
+            "django.contrib.auth",
+            "django.contrib.contenttypes",
+            "htmgel",
+            "benchmarks.project",
+        ],
+        ROOT_URLCONF="benchmarks.project.urls",
+        TEMPLATES=[
+            {
+                'BACKEND': "django.template.backends.django.DjangoTemplates",
+                'DIRS': [os.path.join(PATH, "scraps", "templates")],
+                'OPTIONS': {
+                    'loaders': [
+                        ("django.template.loaders.cached.Loader", [
+                            ("htmgel.loaders.Loader", ["django.template.loaders.filesystem.Loader"]),
+                        ]),
+                    ],
+                },
+            },
+        ],
+        USE_TZ=True,
+    )
+    django.setup()
+
+    from django.db import connection
+    from .models import Client, Invoice
+
+    with connection.schema_editor() as editor:
+        editor.create_model(Client)
+        editor.create_model(Invoice)
@@ -0,0 +1,27 @@
+# Imports
+
+from django.db import models
+
+# Models
+
+
+class Client(models.Model):
+    name = models.CharField(max_length=128)
+
+    def __str__(self):
+        return self.name
+
+
+class Invoice(models.Model):
+    amount = models.DecimalField(decimal_places=2, max_digits=12)
+    client = models.ForeignKey(Client, on_delete=models.CASCADE, related_name="invoices")
+    issued = models.DateField()
+    number = models.CharField(max_length=32, unique=True)
+    status = models.CharField(max_length=16)
+
+    def __str__(self):
+        return self.number
+
+    @property
+    def is_paid(self):
+        return self.status == "paid"
@@ -0,0 +1,23 @@
+from django.http import HttpResponse
+from django.urls import include, path
+
+
+def view(request, **kwargs):
+    return HttpResponse()
+
+
+invoice_patterns = [
+    path("", view, name="invoice_list"),
+    path("<int:pk>/", view, name="invoice_detail"),
+    path("<int:pk>/delete/", view, name="invoice_delete"),
+    path("<int:pk>/update/", view, name="invoice_update"),
+    path("<int:invoice>/lines/<int:pk>/", view, name="line_detail"),
+]
+
+# Padding, so that reversing is measured against a URLconf of realistic size.
+other_patterns = [path("other/%s/<int:pk>/" % i, view, name="other_%s" % i) for i in range(500)]
+
+urlpatterns = [
+    path("", view, name="home"),
+    path("clients/<int:client>/invoices/", include((invoice_patterns, "invoices"))),
+] + other_patterns
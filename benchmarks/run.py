@@ -0,0 +1,249 @@
+"""
+Run the benchmark suite against an in-memory SQLite Django project, report operations per second and peak memory,
+and store the results so that they may be compared across commits.
+
+Usage:
+
+.. code::
+
+    python benchmarks/run.py [-k filter] [--compare REF] [--quick] [--no-save]
+
+Results are saved to ``benchmarks/results/<commit>.json``. ``--compare`` accepts a commit (as saved) or the path to a
+results file and shows the change of each benchmark.
+
+"""
+# Imports
+
+from argparse import ArgumentParser
+import inspect
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.project import BENCHMARKS_PATH, PATH, setup  # noqa: E402
+
+# Constants
+
+MIN_TIME = 0.2
+"""The minimum number of seconds that each repeat of a benchmark runs for."""
+
+REPEAT = 5
+
+RESULTS_PATH = os.path.join(BENCHMARKS_PATH, "results")
+
+# Functions
+
+
+def compare(results, previous):
+    """Print the results alongside those of a previous run.
+
+    :param results: The results of this run.
+    :type results: dict
+
+    :param previous: The results of the previous run.
+    :type previous: dict
+
+    """
+    print("")
+    print("Compared with %s" % previous['commit'])
+    print("-" * 100)
+    print("%-60s %12s %12s %10s" % ("benchmark", "before", "after", "change"))
+
+    for name, result in results['benchmarks'].items():
+        before = previous['benchmarks'].get(name)
+        if before is None:
+            print("%-60s %12s %12s %10s" % (name, "-", _format_ops(result['ops']), "new"))
+            continue
+
+        change = (result['ops'] / before['ops']) - 1
+        print("%-60s %12s %12s %+9.1f%%" % (name, _format_ops(before['ops']), _format_ops(result['ops']),
+                                          change * 100))
+
+
+def get_benchmarks(module, pattern=None):
+    """Get the benchmarks defined in a module.
+
+    :param module: The module of benchmark classes.
+
+    :param pattern: Only include benchmarks whose name contains this string.
+    :type pattern: str
+
+    :rtype: list[tuple(str, type, str, object)]
+    :returns: The name, class, method name and parameter of each benchmark.
+
+    """
+    benchmarks = list()
+    for class_name, cls in inspect.getmembers(module, inspect.isclass):
+        if cls.__module__ != module.__name__:
+            continue
+
+        params = getattr(cls, "params", [None])
+        for method_name in sorted(n for n in dir(cls) if n.startswith("time_")):
+            for param in params:
+                name = "%s.%s" % (class_name, method_name)
+                if param is not None:
+                    name = "%s(%s)" % (name, param)
+
+                if pattern and pattern not in name:
+                    continue
+
+                benchmarks.append((name, cls, method_name, param))
+
+    return benchmarks
+
+
+def get_commit():
+    """Get the abbreviated hash of the current commit, marked when the tree has changes.
+
+    :rtype: str
+
+    """
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=PATH).decode("utf-8").strip()
+        changes = subprocess.check_output(["git", "status", "--porcelain", "--untracked-files=no"], cwd=PATH)
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+    if changes.strip():
+        commit += "-dirty"
+
+    return commit
+
+
+def load_results(ref):
+    """Load the results of a previous run.
+
+    :param ref: A commit as saved by this script, or the path to a results file.
+    :type ref: str
+
+    :rtype: dict
+
+    """
+    path = ref if os.path.exists(ref) else os.path.join(RESULTS_PATH, "%s.json" % ref)
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def measure(cls, method_name, param, repeat=REPEAT, min_time=MIN_TIME):
+    """Time a benchmark and measure the peak memory of one call.
+
+    :rtype: dict
+
+    """
+    instance = cls()
+    args = () if param is None else (param,)
+
+    if hasattr(instance, "setup"):
+        instance.setup(*args)
+
+    method = getattr(instance, method_name)
+
+    # Warm up caches (compiled templates, plans and so on) before timing.
+    method(*args)
+
+    timer = timeit.Timer(lambda: method(*args))
+
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time or number >= 1000000:
+            break
+
+        number *= 10 if elapsed < min_time / 10 else 2
+
+    times = [elapsed / number] + [t / number for t in timer.repeat(repeat=repeat - 1, number=number)]
+    best = min(times)
+
+    tracemalloc.start()
+    method(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'ops': 1.0 / best,
+        'peak_bytes': peak,
+        'seconds': best,
+        'times': times,
+    }
+
+
+def main():
+    parser = ArgumentParser(description="Run the htmgel benchmarks.")
+    parser.add_argument("-k", dest="pattern", help="Only run benchmarks whose name contains this string.")
+    parser.add_argument("--compare", dest="compare", help="A commit or results file to compare with.")
+    parser.add_argument("--no-save", action="store_true", dest="no_save", help="Do not save the results.")
+    parser.add_argument("--quick", action="store_true", dest="quick", help="Time each benchmark briefly.")
+    options = parser.parse_args()
+
+    setup()
+
+    import django
+    from benchmarks import suite
+
+    repeat, min_time = (2, 0.05) if options.quick else (REPEAT, MIN_TIME)
+
+    results = {
+        'benchmarks': dict(),
+        'commit': get_commit(),
+        'django': django.get_version(),
+        'python': platform.python_version(),
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+    print("%-60s %12s %12s %12s" % ("benchmark", "ops/sec", "time", "peak memory"))
+    print("-" * 100)
+    for name, cls, method_name, param in get_benchmarks(suite, pattern=options.pattern):
+        result = measure(cls, method_name, param, repeat=repeat, min_time=min_time)
+        results['benchmarks'][name] = result
+
+        print("%-60s %12s %12s %12s" % (name, _format_ops(result['ops']), _format_time(result['seconds']),
+                                        _format_bytes(result['peak_bytes'])))
+
+    if not options.no_save:
+        if not os.path.exists(RESULTS_PATH):
+            os.makedirs(RESULTS_PATH)
+
+        path = os.path.join(RESULTS_PATH, "%s.json" % results['commit'])
+        with open(path, "w") as f:
+            json.dump(results, f, indent=4, sort_keys=True)
+
+        print("")
+        print("Saved %s" % os.path.relpath(path, PATH))
+
+    if options.compare:
+        compare(results, load_results(options.compare))
+
+
+def _format_bytes(value):
+    if value >= 1024 * 1024:
+        return "%.1f MB" % (value / (1024.0 * 1024))
+
+    return "%.1f KB" % (value / 1024.0)
+
+
+def _format_ops(value):
+    if value >= 1000:
+        return "%.0f" % value
+
+    return "%.2f" % value
+
+
+def _format_time(value):
+    if value >= 1:
+        return "%.2f s" % value
+
+    if value >= 0.001:
+        return "%.2f ms" % (value * 1000)
+
+    return "%.1f us" % (value * 1000000)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""
+The benchmarks run by ``run.py``.
+
+Benchmarks are written in the style of asv: each class may define ``params`` and a ``setup()`` method, and each
+``time_*`` method is timed once for every parameter. Settings must be configured (see ``project.setup()``) before the
+module is imported.
+
+"""
+# Imports
+
+from datetime import date
+from decimal import Decimal
+from django import forms
+from django.core.paginator import Paginator
+from django.urls import reverse
+from django.template import engines
+from htmgel.currency import format_currency, format_currency_many
+from htmgel.library import ActionColumn, Breadcrumbs, Column, ColumnarTable, Link, Menu, Pagination, QuerysetTable, \
+    Table, clear_breadcrumbs, get_form_render_plan, register_breadcrumb
+from htmgel.resolvers import URLTemplate, clear_url_cache
+from htmgel.templatetags import htmgel_tags
+from .project import seed
+
+# Classes
+
+
+class ActionColumnRendering(object):
+    """Render 500 rows with view, update and delete buttons, as action columns and as links built for each row."""
+
+    names = ("invoices:invoice_detail", "invoices:invoice_update", "invoices:invoice_delete")
+
+    def setup(self):
+        clear_url_cache()
+        self.data = [("INV-%06d" % i, "Client & Co", i) for i in range(1, 501)]
+
+    def time_action_columns(self):
+        table = Table(columns=[Column("number"), Column("client"), Column("pk", hidden=True)])
+        for name in self.names:
+            table.columns.append(ActionColumn(name, text="link", pattern_kwargs={'client': 1}))
+
+        table.add_rows(self.data)
+
+        return table.to_html()
+
+    def time_links_per_row(self):
+        table = Table(columns=[Column("number"), Column("client")])
+        for name in self.names:
+            table.add_column(name, escape=False)
+
+        for number, client, pk in self.data:
+            links = [
+                Link(reverse(name, kwargs={'client': 1, 'pk': pk}), text="link", classes="btn btn-default btn-xs")
+                for name in self.names
+            ]
+            table.add_row([number, client] + [link.to_html() for link in links])
+
+        return table.to_html()
+
+
+class BreadcrumbBuilding(object):
+    """Build the breadcrumbs of a detail page, by hand and from the registry."""
+
+    def setup(self):
+        clear_breadcrumbs()
+        clear_url_cache()
+
+        register_breadcrumb("home", "Home")
+        register_breadcrumb("invoices:invoice_list", "Invoices", parent="home", kwargs=["client"])
+        register_breadcrumb(
+            "invoices:invoice_detail",
+            title=lambda kwargs: "Invoice %s" % kwargs['pk'],
+            parent="invoices:invoice_list",
+            kwargs=["client", "pk"]
+        )
+
+    def time_add(self):
+        crumbs = Breadcrumbs()
+        crumbs.add("Home", "/")
+        crumbs.add("Invoices", "invoice_list", pattern_kwargs={'client': 1}, namespace="invoices")
+        crumbs.add("Invoice 5", "invoice_detail", pattern_kwargs={'client': 1, 'pk': 5}, namespace="invoices")
+
+        return [c.url for c in crumbs]
+
+    def time_for_view(self):
+        crumbs = Breadcrumbs.for_view("invoices:invoice_detail", kwargs={'client': 1, 'pk': 5})
+
+        return [c.url for c in crumbs]
+
+
+class CurrencyFormatting(object):
+    """Format amounts as currency, one at a time and as a column."""
+
+    params = [1000, 10000]
+
+    def setup(self, count):
+        self.values = [Decimal(i) + Decimal("0.5") for i in range(count)]
+
+    def time_format_currency(self, count):
+        return [format_currency(v, unit="EUR", locale="en") for v in self.values]
+
+    def time_format_currency_many(self, count):
+        return format_currency_many(self.values, unit="EUR", locale="en")
+
+
+class FormRendering(object):
+    """Render forms with the form render plan and with the widget filters."""
+
+    params = [10, 100]
+
+    def setup(self, count):
+        kinds = (
+            forms.CharField,
+            lambda: forms.BooleanField(required=False),
+            forms.DateField,
+            lambda: forms.ChoiceField(choices=(("a", "A"), ("b", "B"))),
+            lambda: forms.CharField(widget=forms.Textarea),
+        )
+
+        fields = {"field_%s" % i: kinds[i % len(kinds)]() for i in range(count)}
+        form_class = type("BenchmarkForm%s" % count, (forms.Form,), fields)
+
+        self.form = form_class(data={"field_%s" % i: "a" for i in range(count)})
+        self.form.is_valid()
+
+        self.filters = (
+            htmgel_tags.is_checkbox,
+            htmgel_tags.is_date,
+            htmgel_tags.is_hidden,
+            htmgel_tags.is_select,
+            htmgel_tags.is_text,
+        )
+
+        # The isinstance() checks that the filters made before widgets were classified.
+        widget_classes = (forms.CheckboxInput, forms.DateInput, forms.HiddenInput, forms.Select, forms.Textarea)
+        self.isinstance_filters = [
+            lambda field, cls=cls: isinstance(field.field.widget, cls) for cls in widget_classes
+        ]
+
+    def time_render_form(self, count):
+        return get_form_render_plan(self.form, framework="bootstrap3").render(self.form)
+
+    def time_widget_filters(self, count):
+        return [[f(field) for f in self.filters] for field in self.form]
+
+    def time_widget_filters_isinstance(self, count):
+        return [[f(field) for f in self.isinstance_filters] for field in self.form]
+
+
+class HtmlTag(object):
+    """Render components through the html tag."""
+
+    params = ["page_header", "alert"]
+
+    def setup(self, component):
+        self.template = engines['django'].from_string(
+            '{% load htmgel_tags %}{% for i in values %}{% html "' + component + '" title=i message=i %}{% endfor %}'
+        )
+        self.context = {'values': list(range(100))}
+
+    def time_render_100(self, component):
+        return self.template.render(self.context)
+
+
+class IconRendering(object):
+    """Render 100 icons through the icon tag."""
+
+    def setup(self):
+        self.template = engines['django'].from_string(
+            '{% load htmgel_tags %}{% for name in names %}{% icon name %}{% endfor %}'
+        )
+        self.context = {'names': ["icon-%s" % (i % 20) for i in range(100)]}
+
+    def time_icon_tag(self):
+        return self.template.render(self.context)
+
+
+class LinkBuilding(object):
+    """Build and render the view, update and delete links of 500 rows."""
+
+    names = ("invoices:invoice_detail", "invoices:invoice_update", "invoices:invoice_delete")
+
+    def setup(self):
+        clear_url_cache()
+        self.pks = list(range(1, 501))
+
+    def time_reverse_per_link(self):
+        return [
+            Link(reverse(name, kwargs={'client': 1, 'pk': pk}), text="link").to_html()
+            for pk in self.pks for name in self.names
+        ]
+
+    def time_url_template(self):
+        links = list()
+        for name in self.names:
+            template = URLTemplate(name, kwargs={'client': 1})
+            links.extend(link.to_html() for link in Link.from_template(template, self.pks, text="link"))
+
+        return links
+
+
+class MenuRendering(object):
+    """Render a navigation menu of 80 items, with the Menu class and with the menu_items component."""
+
+    def setup(self):
+        class User(object):
+            def has_perm(self, permission):
+                return not permission.endswith("0")
+
+        self.menu_items = [
+            ("Page %s" % i, "/pages/%s/" % i, "page_%s" % i, "app.view_%s" % (i % 8) if i % 2 else None)
+            for i in range(80)
+        ]
+        self.menu = Menu.from_items(self.menu_items, framework="bootstrap3")
+        self.template = engines['django'].from_string(
+            '{% load htmgel_tags %}{% html "menu_items" menu_items=menu_items active_page=active_page %}'
+        )
+        self.user = User()
+
+        permissions = {p for i in self.menu_items if i[3] and self.user.has_perm(i[3]) for p in [i[3]]}
+        self.context = {'active_page': "page_40", 'menu_items': self.menu_items, 'perms': permissions}
+
+    def time_render(self):
+        return self.menu.render(self.user, active="page_40")
+
+    def time_menu_items_component(self):
+        return self.template.render(self.context)
+
+
+class Paginating(object):
+    """Fetch a page from the middle of the invoices, with Django's paginator and with each count mode."""
+
+    params = [10000, 100000]
+
+    def setup(self, count):
+        self.queryset = seed(count).order_by("id")
+        self.page = count // 50
+
+    def time_django_paginator(self, count):
+        page = Paginator(self.queryset, 25).page(self.page)
+
+        return list(page), list(page.paginator.page_range)
+
+    def time_pagination_cached(self, count):
+        p = Pagination(self.queryset, page=self.page, page_size=25, count="cached", cache_alias="default")
+
+        return list(p), p.page_range
+
+    def time_pagination_has_next(self, count):
+        p = Pagination(self.queryset, page=self.page, page_size=25, count=None)
+
+        return list(p), p.page_range
+
+
+class QuerysetTableLoading(object):
+    """Load and render a table from a queryset of invoices."""
+
+    params = [100, 10000]
+
+    def setup(self, count):
+        self.queryset = seed(count)
+
+    def time_load(self, count):
+        table = QuerysetTable(self.queryset, columns=[Column(n) for n in ("number", "client__name", "amount")])
+        table.load()
+
+        return table
+
+    def time_to_html(self, count):
+        table = QuerysetTable(self.queryset, columns=[Column(n) for n in ("number", "client__name", "amount")])
+
+        return table.to_html()
+
+
+class TableRendering(object):
+    """Render tables of plain rows, and of formatted columns."""
+
+    params = [100, 10000, 100000]
+
+    def setup(self, count):
+        self.table = Table(columns=[Column(n) for n in ("number", "client", "issued", "amount", "status")])
+        self.table.add_rows([("INV-%06d" % i, "Client & Co", "2018-01-01", "1,000.50", "paid") for i in range(count)])
+
+        self.columnar = ColumnarTable()
+        self.columnar.add_column("number", values=["INV-%06d" % i for i in range(count)])
+        self.columnar.add_column("issued", column_formatter="date", values=[date(2018, 1, 1)] * count)
+        self.columnar.add_column("amount", column_formatter="currency", values=[Decimal(i) for i in range(count)])
+
+    def time_to_html(self, count):
+        return self.table.to_html()
+
+    def time_columnar_to_html(self, count):
+        return self.columnar.to_html()
@@ -0,0 +1,17 @@
+# Imports
+
+from django.apps import AppConfig
+from .frameworks import get_framework
+from .icons import get_icon_registry
+
+# Classes
+
+
+class HtmgelConfig(AppConfig):
+    name = "htmgel"
+    verbose_name = "HTM Gel"
+
+    def ready(self):
+        # Decide the framework and load the icon set once, at startup.
+        get_framework()
+        get_icon_registry()
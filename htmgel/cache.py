@@ -0,0 +1,194 @@
+# Imports
+
+from collections import OrderedDict
+import datetime
+from decimal import Decimal
+from django.core.cache import caches
+from django.db.models import Model
+from django.utils.functional import Promise
+import hashlib
+from threading import Lock
+import time
+from uuid import UUID
+
+# Exports
+
+__all__ = (
+    "FragmentCache",
+    "get_fragment_key",
+)
+
+# Constants
+
+DEFAULT_MAX_SIZE = 256
+"""The default number of fragments kept in process."""
+
+DEFAULT_TIMEOUT = 300
+"""The default number of seconds that a fragment is cached."""
+
+KEY_TYPES = (
+    bool,
+    bytes,
+    datetime.date,
+    datetime.time,
+    datetime.timedelta,
+    Decimal,
+    float,
+    int,
+    str,
+    type(None),
+    UUID,
+)
+"""The types of the arguments from which a fragment key may be derived, whose ``repr()`` identifies their value."""
+
+# Classes
+
+
+class FragmentCache(object):
+    """Cache rendered fragments in process, in front of one of Django's caches.
+
+    Fragments are first looked up in a least-recently-used ``dict`` that is local to the process, and then in the
+    Django cache. A fragment found in the Django cache is copied to the local tier.
+
+    """
+
+    def __init__(self, alias="default", max_size=DEFAULT_MAX_SIZE):
+        """Initialize the cache.
+
+        :param alias: The alias of the Django cache to use. ``None`` caches fragments in process only.
+        :type alias: str
+
+        :param max_size: The maximum number of fragments kept in process.
+        :type max_size: int
+
+        """
+        self.alias = alias
+        self.max_size = max_size
+
+        self._fragments = OrderedDict()
+        self._lock = Lock()
+
+    def clear(self):
+        """Remove all fragments from the in-process tier."""
+        with self._lock:
+            self._fragments.clear()
+
+    def get(self, key):
+        """Get a fragment.
+
+        :param key: The fragment key.
+        :type key: str
+
+        :rtype: str | None
+
+        """
+        now = time.time()
+
+        with self._lock:
+            try:
+                expires, fragment = self._fragments[key]
+            except KeyError:
+                pass
+            else:
+                if expires is None or expires > now:
+                    self._fragments.move_to_end(key)
+                    return fragment
+
+                del self._fragments[key]
+
+        if self.alias is None:
+            return None
+
+        fragment = caches[self.alias].get(key)
+        if fragment is not None:
+            # The remaining timeout isn't known, so the fragment is held locally for the default timeout at most.
+            self._set_local(key, fragment, DEFAULT_TIMEOUT)
+
+        return fragment
+
+    def set(self, key, fragment, timeout=DEFAULT_TIMEOUT):
+        """Add a fragment.
+
+        :param key: The fragment key.
+        :type key: str
+
+        :param fragment: The rendered output.
+        :type fragment: str
+
+        :param timeout: The number of seconds to cache the fragment. ``None`` caches the fragment indefinitely.
+        :type timeout: int
+
+        """
+        self._set_local(key, fragment, timeout)
+
+        if self.alias is None:
+            return
+
+        caches[self.alias].set(key, fragment, timeout)
+
+    def _set_local(self, key, fragment, timeout):
+        """Add a fragment to the in-process tier, evicting the least recently used fragments."""
+        if timeout is None:
+            expires = None
+        else:
+            expires = time.time() + timeout
+
+        with self._lock:
+            self._fragments[key] = (expires, fragment)
+            self._fragments.move_to_end(key)
+
+            while len(self._fragments) > self.max_size:
+                self._fragments.popitem(last=False)
+
+# Functions
+
+
+def get_fragment_key(name, kwargs, *variations):
+    """Get the cache key for a fragment.
+
+    :param name: The name of the component.
+    :type name: str
+
+    :param kwargs: The arguments given to the component.
+    :type kwargs: dict
+
+    :param variations: Other values that affect the output, such as the framework or language.
+
+    :rtype: str
+    :raise: ValueError
+
+    The arguments may be simple values (see ``KEY_TYPES``), lists, tuples, and dicts of them, and saved model
+    instances, which are identified by their model and primary key. A ``ValueError`` is raised for other values, for
+    which the tag should be given a ``cache_key`` instead.
+
+    """
+    identity = repr((_get_identity(kwargs), _get_identity(variations)))
+    digest = hashlib.sha1(identity.encode("utf-8")).hexdigest()
+
+    return "htmgel:%s:%s" % (name, digest)
+
+
+def _get_identity(value):
+    """Get a value that identifies an argument, and whose ``repr()`` is stable."""
+    # The type is included because values of different types may have the same repr(), e.g. a str and a SafeString,
+    # which are not escaped in the same way.
+    if isinstance(value, KEY_TYPES):
+        return type(value).__name__, value
+
+    if isinstance(value, Promise):
+        # Lazy translations vary by the language, which is one of the variations.
+        return "str", str(value)
+
+    if isinstance(value, Model):
+        if value.pk is None:
+            raise ValueError("A fragment key cannot be derived from an unsaved %s." % value._meta.label)
+
+        return "model", value._meta.label, _get_identity(value.pk)
+
+    if isinstance(value, (list, tuple)):
+        return type(value).__name__, tuple([_get_identity(v) for v in value])
+
+    if isinstance(value, dict):
+        return "dict", tuple(sorted([(str(k), _get_identity(v)) for k, v in value.items()]))
+
+    raise ValueError("A fragment key cannot be derived from a %s. Give a cache_key instead." % type(value).__name__)
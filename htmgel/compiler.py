@@ -0,0 +1,564 @@
+"""
+Compile component templates into Python render functions.
+
+The ``htmgel_compile`` management command uses ``TemplateCompiler`` to generate a module of render functions. When the
+module is named by the ``HTMGEL_COMPILED_TEMPLATES`` setting, the ``html`` tag uses its functions instead of rendering
+the templates.
+
+Only the parts of the template language used by components are supported: text, variables, ``if``, ``for``, ``with``,
+``include`` (of a constant template name), ``autoescape``, ``trans`` (of a constant string), comments, and simple tags.
+Templates that use anything else are not compiled and continue to be rendered by Django.
+
+"""
+# Imports
+
+from django.conf import settings
+from django.template import Engine, TemplateDoesNotExist, TemplateSyntaxError, VariableDoesNotExist
+from django.template.base import FilterExpression, Lexer, Parser, TextNode, TokenType, VariableNode, \
+    render_value_in_context
+from django.template.defaulttags import AutoEscapeControlNode, CommentNode, ForNode, IfNode, LoadNode, \
+    TemplateLiteral, WithNode
+from django.template.library import SimpleNode
+from django.template.loader_tags import IncludeNode
+from django.templatetags.i18n import TranslateNode
+from django.utils.html import conditional_escape
+from django.utils.module_loading import import_string
+from django.utils.safestring import SafeData, mark_safe
+from importlib import import_module
+import logging
+import operator
+from threading import Lock
+
+# Exports
+
+__all__ = (
+    "CompilationError",
+    "Runtime",
+    "TemplateCompiler",
+    "get_compiled_renderer",
+    "reset_compiled_renderers",
+)
+
+# Constants
+
+COMPARISONS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    'in': lambda x, y: x in y,
+    'not in': lambda x, y: x not in y,
+    'is': operator.is_,
+    'is not': operator.is_not,
+}
+
+_renderers = None
+_renderers_lock = Lock()
+
+log = logging.getLogger(__name__)
+
+# Exceptions
+
+
+class CompilationError(Exception):
+    """Raised when a template uses a node that cannot be compiled."""
+    pass
+
+# Classes
+
+
+class Runtime(object):
+    """Provides the functions used by compiled templates."""
+
+    def __init__(self, libraries=None):
+        """Initialize the runtime.
+
+        :param libraries: The names of the template tag libraries loaded by the compiled templates.
+        :type libraries: list[str]
+
+        """
+        engine = Engine.get_default()
+
+        self._parser = Parser([], libraries=engine.template_libraries, builtins=engine.template_builtins)
+        for name in libraries or list():
+            self._parser.add_library(engine.template_libraries[name])
+
+    def compare(self, name, x, y):
+        """Compare two values in the same way as the ``if`` tag, which treats errors as ``False``."""
+        try:
+            return COMPARISONS[name](x, y)
+        except Exception:
+            return False
+
+    def expression(self, token):
+        """Compile a variable and its filters.
+
+        :param token: The expression, e.g. ``field|is_required``.
+        :type token: str
+
+        :rtype: FilterExpression
+
+        """
+        return FilterExpression(token, self._parser)
+
+    def include(self, template_name, context, values, isolated):
+        """Render a template that could not be compiled, in the same way as the ``include`` tag."""
+        template = Engine.get_default().get_template(template_name)
+
+        if isolated:
+            return template.render(context.new(values))
+
+        with context.push(**values):
+            return template.render(context)
+
+    def loop(self, context, sequence, loopvars, is_reversed):
+        """Iterate over a sequence in the same way as the ``for`` tag, updating the context for each item.
+
+        :rtype: collections.Iterator[int]
+
+        """
+        if "forloop" in context:
+            parentloop = context['forloop']
+        else:
+            parentloop = dict()
+
+        with context.push():
+            values = sequence.resolve(context, ignore_failures=True)
+            if values is None:
+                values = list()
+
+            if not hasattr(values, "__len__"):
+                values = list(values)
+
+            len_values = len(values)
+            if is_reversed:
+                values = reversed(values)
+
+            num_loopvars = len(loopvars)
+            loop_dict = context['forloop'] = {'parentloop': parentloop}
+            for i, item in enumerate(values):
+                loop_dict['counter0'] = i
+                loop_dict['counter'] = i + 1
+                loop_dict['revcounter'] = len_values - i
+                loop_dict['revcounter0'] = len_values - i - 1
+                loop_dict['first'] = i == 0
+                loop_dict['last'] = i == len_values - 1
+
+                if num_loopvars > 1:
+                    try:
+                        len_item = len(item)
+                    except TypeError:
+                        len_item = 1
+
+                    if num_loopvars != len_item:
+                        raise ValueError("Need %s values to unpack in for loop; got %s." % (num_loopvars, len_item))
+
+                    context.update(dict(zip(loopvars, item)))
+                    try:
+                        yield i
+                    finally:
+                        # Also when the body raises, so that the layer pushed by the loop is the one removed.
+                        context.pop()
+                else:
+                    context[loopvars[0]] = item
+                    yield i
+
+    def resolve(self, expression, context):
+        """Resolve an expression used as a condition."""
+        return expression.resolve(context, ignore_failures=True)
+
+    def tag(self, func, context, takes_context, args, kwargs, target_var):
+        """Call a simple tag in the same way as the tag's node."""
+        resolved_args = [a.resolve(context) for a in args]
+        if takes_context:
+            resolved_args = [context] + resolved_args
+
+        resolved_kwargs = dict([(k, v.resolve(context)) for k, v in kwargs.items()])
+
+        output = func(*resolved_args, **resolved_kwargs)
+        if target_var is not None:
+            context[target_var] = output
+            return ""
+
+        if context.autoescape:
+            output = conditional_escape(output)
+
+        return output
+
+    def test(self, condition, context):
+        """Evaluate a compiled condition in the same way as the ``if`` tag."""
+        try:
+            return condition(context)
+        except VariableDoesNotExist:
+            return None
+
+    def translate(self, expression, context):
+        """Render a translated string in the same way as the ``trans`` tag."""
+        value = render_value_in_context(expression.resolve(context), context)
+
+        # Percent signs in template text are doubled.
+        if isinstance(value, SafeData):
+            return mark_safe(value.replace("%%", "%"))
+
+        return value.replace("%%", "%")
+
+    def value(self, expression, context):
+        """Render an expression in the same way as ``{{ expression }}``."""
+        return render_value_in_context(expression.resolve(context), context)
+
+
+class TemplateCompiler(object):
+    """Generate the source of a Python module that renders templates."""
+
+    def __init__(self, engine=None, framework=None):
+        """Initialize the compiler.
+
+        :param engine: The template engine. Defaults to the default engine.
+        :type engine: django.template.Engine
+
+        :param framework: The HTML framework the templates are compiled for.
+        :type framework: str
+
+        """
+        self.engine = engine or Engine.get_default()
+        self.framework = framework
+
+        self._conditions = list()
+        self._count = 0
+        self._expressions = dict()
+        self._functions = dict()
+        self._imports = dict()
+        self._libraries = list()
+        self._lines = list()
+        self._renderers = dict()
+        self._uncompiled = dict()
+
+    def add(self, template_name):
+        """Compile a template, along with the templates it includes.
+
+        :param template_name: The name of the template.
+        :type template_name: str
+
+        :raises: CompilationError, TemplateDoesNotExist
+
+        """
+        self._get_function(template_name)
+        self._renderers[template_name] = self._functions[template_name]
+
+    @property
+    def uncompiled(self):
+        """The included templates that could not be compiled and are rendered by Django instead.
+
+        :rtype: dict
+        :returns: The reasons by template name.
+
+        """
+        return self._uncompiled
+
+    def get_source(self):
+        """Get the source of the compiled module.
+
+        :rtype: str
+
+        """
+        a = list()
+        a.append('"""Generated by the htmgel_compile management command. Do not edit."""')
+        a.append("")
+        a.append("from htmgel.compiler import Runtime")
+        a.append("from django.utils.safestring import mark_safe")
+        for path, alias in sorted(self._imports.items()):
+            module, name = path.rsplit(".", 1)
+            a.append("from %s import %s as %s" % (module, name, alias))
+
+        a.append("")
+        a.append("FRAMEWORK = %r" % self.framework)
+        a.append("")
+        a.append("_r = Runtime(libraries=%r)" % self._libraries)
+        a.append("")
+
+        for token, name in sorted(self._expressions.items(), key=lambda i: i[1]):
+            a.append("%s = _r.expression(%r)" % (name, token))
+
+        a.append("")
+
+        for source in self._conditions:
+            a.append("")
+            a.append(source)
+
+        a.extend(self._lines)
+
+        a.append("")
+        a.append("RENDERERS = {")
+        for template_name, function in sorted(self._renderers.items()):
+            a.append("    (FRAMEWORK, %r): %s," % (template_name, function))
+
+        a.append("}")
+        a.append("")
+
+        return "\n".join(a)
+
+    def _add_libraries(self, template):
+        """Collect the libraries loaded by a template, which are needed to compile its expressions."""
+        for token in Lexer(template.source).tokenize():
+            if token.token_type != TokenType.BLOCK:
+                continue
+
+            bits = token.split_contents()
+            if bits[0] != "load":
+                continue
+
+            if len(bits) >= 4 and bits[-2] == "from":
+                names = [bits[-1]]
+            else:
+                names = bits[1:]
+
+            for name in names:
+                if name not in self._libraries:
+                    self._libraries.append(name)
+
+    def _condition(self, condition):
+        """Compile an ``if`` condition into a module level function and return its name."""
+        name = "_c%s" % len(self._conditions)
+        self._conditions.append("def %s(context):\n    return %s\n" % (name, self._condition_expression(condition)))
+
+        return name
+
+    def _condition_expression(self, condition):
+        """Compile a node of an ``if`` condition into a Python expression."""
+        if isinstance(condition, TemplateLiteral):
+            return "_r.resolve(%s, context)" % self._expression(condition.value)
+
+        op = getattr(condition, "id", None)
+        if op == "not":
+            return "(not %s)" % self._condition_expression(condition.first)
+
+        first = self._condition_expression(condition.first)
+        second = self._condition_expression(condition.second)
+
+        if op in ("and", "or"):
+            return "(%s %s %s)" % (first, op, second)
+
+        if op in COMPARISONS:
+            return "_r.compare(%r, %s, %s)" % (op, first, second)
+
+        raise CompilationError("Unsupported operator: %s" % op)
+
+    def _expression(self, filter_expression):
+        """Get the name of the module level variable for a compiled expression."""
+        return self._expression_name(filter_expression.token)
+
+    def _expression_name(self, token):
+        """Get the name of the module level variable for the expression given as a string."""
+        if token not in self._expressions:
+            self._expressions[token] = "_e%s" % len(self._expressions)
+
+        return self._expressions[token]
+
+    def _get_function(self, template_name):
+        """Get the name of the render function for a template, compiling it when needed."""
+        if template_name in self._functions:
+            return self._functions[template_name]
+
+        template = self.engine.get_template(template_name)
+        self._add_libraries(template)
+
+        name = "render_%s" % self._count
+        self._count += 1
+
+        # Reserve the name first to allow for recursive includes.
+        self._functions[template_name] = name
+
+        lines = list()
+        try:
+            self._nodelist(template.nodelist, lines, 1)
+        except CompilationError:
+            del self._functions[template_name]
+            raise
+
+        self._lines.append("")
+        self._lines.append("")
+        self._lines.append("def %s(context):" % name)
+        self._lines.append('    """%s"""' % template_name)
+        self._lines.append("    _a = []")
+        self._lines.append("    _w = _a.append")
+        self._lines.extend(lines)
+        self._lines.append('    return mark_safe("".join(_a))')
+
+        return name
+
+    def _import(self, func):
+        """Get the alias of an imported function, which must be importable by its module and name."""
+        path = "%s.%s" % (func.__module__, func.__name__)
+        try:
+            if import_string(path) is not func:
+                raise ImportError(path)
+        except ImportError:
+            raise CompilationError("Tag function cannot be imported: %s" % path)
+
+        if path not in self._imports:
+            self._imports[path] = "_f%s" % len(self._imports)
+
+        return self._imports[path]
+
+    def _include(self, node, lines, depth):
+        """Compile an ``include`` node."""
+        indent = "    " * depth
+
+        if node.template.filters or not isinstance(node.template.var, str):
+            raise CompilationError("Only includes of a constant template name are supported.")
+
+        template_name = node.template.var
+
+        values = ["%r: %s.resolve(context)" % (k, self._expression(v)) for k, v in node.extra_context.items()]
+        values = "{%s}" % ", ".join(values)
+
+        try:
+            function = self._get_function(template_name)
+        except (CompilationError, TemplateDoesNotExist, TemplateSyntaxError) as e:
+            self._uncompiled[template_name] = "%s: %s" % (e.__class__.__name__, e)
+            lines.append("%s_w(_r.include(%r, context, %s, %s))" % (indent, template_name, values,
+                                                                    node.isolated_context))
+            return
+
+        if node.isolated_context:
+            lines.append("%s_w(%s(context.new(%s)))" % (indent, function, values))
+        else:
+            lines.append("%swith context.push(%s):" % (indent, values))
+            lines.append("%s    _w(%s(context))" % (indent, function))
+
+    def _nodelist(self, nodelist, lines, depth):
+        """Compile the nodes of a template or tag."""
+        start = len(lines)
+        for node in nodelist:
+            self._node(node, lines, depth)
+
+        if len(lines) == start:
+            lines.append("%spass" % ("    " * depth))
+
+    def _node(self, node, lines, depth):
+        """Compile a node."""
+        indent = "    " * depth
+
+        if isinstance(node, TextNode):
+            if node.s:
+                lines.append("%s_w(%r)" % (indent, node.s))
+        elif isinstance(node, VariableNode):
+            lines.append("%s_w(_r.value(%s, context))" % (indent, self._expression(node.filter_expression)))
+        elif isinstance(node, (CommentNode, LoadNode)):
+            pass
+        elif isinstance(node, IfNode):
+            keyword = "if"
+            for condition, nodelist in node.conditions_nodelists:
+                if condition is None:
+                    lines.append("%selse:" % indent)
+                else:
+                    lines.append("%s%s _r.test(%s, context):" % (indent, keyword, self._condition(condition)))
+                    keyword = "elif"
+
+                self._nodelist(nodelist, lines, depth + 1)
+        elif isinstance(node, ForNode):
+            looped = "_l%s" % depth
+            lines.append("%s%s = False" % (indent, looped))
+            lines.append("%sfor _ in _r.loop(context, %s, %r, %s):" % (
+                indent,
+                self._expression(node.sequence),
+                list(node.loopvars),
+                node.is_reversed
+            ))
+            lines.append("%s    %s = True" % (indent, looped))
+            self._nodelist(node.nodelist_loop, lines, depth + 1)
+
+            if len(node.nodelist_empty):
+                lines.append("%sif not %s:" % (indent, looped))
+                self._nodelist(node.nodelist_empty, lines, depth + 1)
+        elif isinstance(node, WithNode):
+            values = ", ".join(["%r: %s.resolve(context)" % (k, self._expression(v))
+                                for k, v in node.extra_context.items()])
+            lines.append("%swith context.push({%s}):" % (indent, values))
+            self._nodelist(node.nodelist, lines, depth + 1)
+        elif isinstance(node, IncludeNode):
+            self._include(node, lines, depth)
+        elif isinstance(node, AutoEscapeControlNode):
+            saved = "_s%s" % depth
+            lines.append("%s%s = context.autoescape" % (indent, saved))
+            lines.append("%scontext.autoescape = %s" % (indent, node.setting))
+            lines.append("%stry:" % indent)
+            self._nodelist(node.nodelist, lines, depth + 1)
+            lines.append("%sfinally:" % indent)
+            lines.append("%s    context.autoescape = %s" % (indent, saved))
+        elif isinstance(node, TranslateNode):
+            token = node.filter_expression.token
+            if node.message_context or node.filter_expression.filters or token[:1] not in ("'", '"'):
+                raise CompilationError("Only translations of a constant string are supported.")
+
+            if node.noop:
+                expression = self._expression_name(token)
+            else:
+                expression = self._expression_name("_(%s)" % token)
+
+            if node.asvar:
+                lines.append("%scontext[%r] = _r.translate(%s, context)" % (indent, node.asvar, expression))
+            else:
+                lines.append("%s_w(_r.translate(%s, context))" % (indent, expression))
+        elif isinstance(node, SimpleNode):
+            args = ", ".join([self._expression(a) for a in node.args])
+            kwargs = ", ".join(["%r: %s" % (k, self._expression(v)) for k, v in node.kwargs.items()])
+            lines.append("%s_w(_r.tag(%s, context, %s, [%s], {%s}, %r))" % (
+                indent,
+                self._import(node.func),
+                node.takes_context,
+                args,
+                kwargs,
+                node.target_var
+            ))
+        else:
+            raise CompilationError("Unsupported node: %s" % node.__class__.__name__)
+
+# Functions
+
+
+def get_compiled_renderer(template_name, framework=None):
+    """Get the compiled render function for a template.
+
+    :param template_name: The name of the template.
+    :type template_name: str
+
+    :param framework: The HTML framework in use.
+    :type framework: str
+
+    :rtype: callable | None
+    :returns: The function, which accepts a ``Context``, or ``None`` when the template has not been compiled.
+
+    """
+    global _renderers
+
+    if _renderers is None:
+        with _renderers_lock:
+            if _renderers is None:
+                _renderers = _load_renderers()
+
+    return _renderers.get((framework, template_name))
+
+
+def reset_compiled_renderers():
+    """Load the compiled module again on the next call to ``get_compiled_renderer()``."""
+    global _renderers
+    _renderers = None
+
+
+def _load_renderers():
+    """Import the renderers from the module named by ``HTMGEL_COMPILED_TEMPLATES``."""
+    module_name = getattr(settings, "HTMGEL_COMPILED_TEMPLATES", None)
+    if not module_name:
+        return dict()
+
+    try:
+        module = import_module(module_name)
+    except (ImportError, TemplateSyntaxError) as e:
+        log.warning("The compiled templates could not be loaded from %s, so templates are rendered by Django: %s",
+                    module_name, e)
+        return dict()
+
+    return getattr(module, "RENDERERS", dict())
@@ -6,11 +6,47 @@ PATH_TO_HTMGEL_BOOTSTRAP3 = os.path.join(os.path.dirname(PATH_TO_HTMGEL), "htmge
 PATH_TO_HTMGEL_BOOTSTRAP4 = os.path.join(os.path.dirname(PATH_TO_HTMGEL), "htmgel_bootstrap4")
 PATH_TO_HTMGEL_FOUNDATION6 = os.path.join(os.path.dirname(PATH_TO_HTMGEL), "htmgel_foundation6")
 
-if os.path.exists(PATH_TO_HTMGEL_BOOTSTRAP3):
-    HTMGEL_FRAMEWORK = "bootstrap3"
-elif os.path.exists(PATH_TO_HTMGEL_BOOTSTRAP4):
-    HTMGEL_FRAMEWORK = "bootstrap4"
-elif os.path.exists(PATH_TO_HTMGEL_FOUNDATION6):
-    HTMGEL_FRAMEWORK = "foundation6"
-else:
-    HTMGEL_FRAMEWORK = None
+_FRAMEWORK_PATHS = (
+    ("bootstrap3", PATH_TO_HTMGEL_BOOTSTRAP3),
+    ("bootstrap4", PATH_TO_HTMGEL_BOOTSTRAP4),
+    ("foundation6", PATH_TO_HTMGEL_FOUNDATION6),
+)
+
+# The components provided by each framework, which may be preloaded with ``htmgel.shortcuts.preload_components()``.
+COMPONENTS = (
+    "alert",
+    "breadcrumbs",
+    "carousel",
+    "crud",
+    "form",
+    "form_errors",
+    "form_field",
+    "form_submit",
+    "formset",
+    "list_group",
+    "media_object",
+    "menu_items",
+    "messages",
+    "modal",
+    "page_header",
+    "pagination",
+    "progress_bar",
+    "search_form",
+    "table",
+    "thumbnail",
+)
+
+
+def __getattr__(name):
+    # HTMGEL_FRAMEWORK probes the file system, so it is determined on first access rather than when imported.
+    if name == "HTMGEL_FRAMEWORK":
+        framework = None
+        for _framework, path in _FRAMEWORK_PATHS:
+            if os.path.exists(path):
+                framework = _framework
+                break
+
+        globals()[name] = framework
+        return framework
+
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
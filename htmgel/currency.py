@@ -0,0 +1,265 @@
+"""
+Format currency amounts. A formatter is built once for each currency and locale, with the symbol placement,
+separators and minor units worked out in advance, so formatting an amount only rounds it and fills in the digits.
+
+"""
+# Imports
+
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from django.utils.safestring import SafeString
+from django.utils.translation import get_language
+
+# Exports
+
+__all__ = (
+    "CURRENCIES",
+    "CurrencyFormatter",
+    "LOCALE_FORMATS",
+    "format_currency",
+    "format_currency_many",
+    "get_currency_formatter",
+)
+
+# Constants
+
+CURRENCIES = {
+    'AUD': ("A$", 2),
+    'BRL': ("R$", 2),
+    'CAD': ("CA$", 2),
+    'CHF': ("CHF", 2),
+    'CNY': ("&yen;", 2),
+    'EUR': ("&euro;", 2),
+    'GBP': ("&pound;", 2),
+    'INR': ("&#8377;", 2),
+    'JPY': ("&yen;", 0),
+    'KRW': ("&#8361;", 0),
+    'MXN': ("MX$", 2),
+    'USD': ("$", 2),
+}
+"""The symbol (as HTML) and the number of minor units (decimal places) of each currency. Currencies that are not
+listed are displayed with their code and two decimal places."""
+
+DEFAULT_LOCALE = "en"
+
+LOCALE_FORMATS = {
+    'de': (",", ".", "{amount}&nbsp;{symbol}"),
+    'en': (".", ",", "{symbol}{amount}"),
+    'es': (",", ".", "{amount}&nbsp;{symbol}"),
+    'fr': (",", "&#8239;", "{amount}&nbsp;{symbol}"),
+    'it': (",", ".", "{amount}&nbsp;{symbol}"),
+    'ja': (".", ",", "{symbol}{amount}"),
+    'nl': (",", ".", "{symbol}&nbsp;{amount}"),
+    'pt': (",", ".", "{symbol}&nbsp;{amount}"),
+}
+"""The decimal separator, the group (thousands) separator and the placement of the symbol for each locale."""
+
+_EMPTY = ""
+
+_formatters = dict()
+"""The formatters that have been built by currency and locale. See ``get_currency_formatter()``."""
+
+# Classes
+
+
+class CurrencyFormatter(object):
+    """Format amounts of one currency for one locale."""
+
+    __slots__ = (
+        "locale",
+        "places",
+        "symbol",
+        "unit",
+        "_exponent",
+        "_int_suffix",
+        "_negative",
+        "_positive",
+        "_spec",
+        "_translation",
+    )
+
+    def __init__(self, unit="USD", locale=DEFAULT_LOCALE):
+        """Initialize the formatter.
+
+        :param unit: The currency code.
+        :type unit: str
+
+        :param locale: A key of ``LOCALE_FORMATS``.
+        :type locale: str
+
+        """
+        self.locale = locale
+        self.unit = unit
+        self.symbol, self.places = CURRENCIES.get(unit, (unit, 2))
+
+        decimal_separator, group_separator, pattern = LOCALE_FORMATS[locale]
+
+        # Symbols such as CHF are separated from an amount that follows them.
+        if self.symbol[-1].isalpha():
+            pattern = pattern.replace("{symbol}{amount}", "{symbol}&nbsp;{amount}")
+
+        self._positive = pattern.format(amount="%s", symbol=self.symbol)
+        self._negative = "-" + self._positive
+
+        self._exponent = Decimal(1).scaleb(-self.places)
+        self._spec = ",.%sf" % self.places
+        self._int_suffix = "." + "0" * self.places if self.places else ""
+
+        if (decimal_separator, group_separator) == (".", ","):
+            self._translation = None
+        else:
+            self._translation = str.maketrans({'.': decimal_separator, ',': group_separator})
+
+    def __call__(self, amount):
+        return self.format(amount)
+
+    def __repr__(self):
+        return "<%s %s %s>" % (self.__class__.__name__, self.unit, self.locale)
+
+    def format(self, amount):
+        """Format an amount.
+
+        :param amount: The amount. Strings are parsed as ``Decimal``. ``None`` is displayed as an empty string.
+        :type amount: Decimal | float | int | str
+
+        :rtype: str
+        :raise: ValueError
+
+        Amounts are rounded half up to the minor unit of the currency. Floats are rounded by their shortest
+        representation, so ``2.675`` is ``2.68``. Booleans are amounts of ``1`` and ``0``. Amounts that are not finite
+        (``NaN`` or infinity) raise ``ValueError``.
+
+        """
+        if amount is None:
+            return _EMPTY
+
+        if amount.__class__ is int:
+            value = amount
+        else:
+            value = self._to_decimal(amount)
+
+        if value < 0:
+            template = self._negative
+            value = -value
+        else:
+            template = self._positive
+
+        if value.__class__ is int:
+            # The "f" type would convert an int to a float, which is not exact beyond 2 ** 53.
+            text = format(value, ",d") + self._int_suffix
+        else:
+            text = format(value, self._spec)
+
+        if self._translation is not None:
+            text = text.translate(self._translation)
+
+        return SafeString(template % text)
+
+    def format_many(self, values):
+        """Format a number of amounts.
+
+        :param values: The amounts.
+        :type values: collections.Iterable
+
+        :rtype: list[str]
+
+        """
+        _format = self.format
+        return [_format(v) for v in values]
+
+    def _to_decimal(self, amount):
+        """Convert an amount to a ``Decimal`` rounded to the minor unit."""
+        try:
+            if isinstance(amount, Decimal):
+                value = amount
+            elif isinstance(amount, float):
+                value = Decimal(repr(amount))
+            elif isinstance(amount, int):
+                # Including bool, whose str() is not a number.
+                value = Decimal(int(amount))
+            else:
+                value = Decimal(str(amount).strip())
+
+            # NaN would otherwise be quantized, and then fail to compare with zero.
+            if not value.is_finite():
+                raise InvalidOperation()
+
+            value = value.quantize(self._exponent, rounding=ROUND_HALF_UP)
+        except InvalidOperation:
+            raise ValueError("Not a currency amount: %r" % (amount,))
+
+        # Amounts that round to zero are not displayed as negative.
+        if value.is_zero():
+            return abs(value)
+
+        return value
+
+# Functions
+
+
+def format_currency(amount, unit="USD", locale=None):
+    """Format a currency amount.
+
+    :param amount: The amount.
+    :type amount: Decimal | float | int | str
+
+    :param unit: The currency code.
+    :type unit: str
+
+    :param locale: The locale. Defaults to the active language.
+    :type locale: str
+
+    :rtype: str
+
+    """
+    return get_currency_formatter(unit, locale=locale).format(amount)
+
+
+def format_currency_many(values, unit="USD", locale=None):
+    """Format a number of amounts of the same currency, e.g. the values of a table column.
+
+    :param values: The amounts. ``None`` is displayed as an empty string.
+    :type values: collections.Iterable
+
+    :param unit: The currency code.
+    :type unit: str
+
+    :param locale: The locale. Defaults to the active language.
+    :type locale: str
+
+    :rtype: list[str]
+
+    """
+    return get_currency_formatter(unit, locale=locale).format_many(values)
+
+
+def get_currency_formatter(unit="USD", locale=None):
+    """Get the formatter for a currency and locale, which is built once.
+
+    :param unit: The currency code.
+    :type unit: str
+
+    :param locale: The locale, or a language code such as ``de-ch``. Defaults to the active language. Locales that are
+                   not in ``LOCALE_FORMATS`` are formatted as English.
+    :type locale: str
+
+    :rtype: CurrencyFormatter
+
+    """
+    if locale is None:
+        locale = get_language() or DEFAULT_LOCALE
+
+    try:
+        return _formatters[(unit, locale)]
+    except KeyError:
+        pass
+
+    language = locale.lower().replace("_", "-")
+    if language not in LOCALE_FORMATS:
+        language = language.split("-")[0]
+
+    if language not in LOCALE_FORMATS:
+        language = DEFAULT_LOCALE
+
+    formatter = _formatters[(unit, locale)] = CurrencyFormatter(unit, locale=language)
+
+    return formatter
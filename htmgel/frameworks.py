@@ -0,0 +1,80 @@
+"""
+Resolve the HTML framework in use. This is the single source of truth for the framework, which is decided once (when
+the app is ready) and used by the template tags, the template loader, and the component registry.
+
+"""
+# Imports
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from . import constants
+
+# Exports
+
+__all__ = (
+    "FRAMEWORKS",
+    "get_framework",
+    "reset_framework",
+    "resolve_framework",
+)
+
+# Constants
+
+FRAMEWORKS = (
+    "bootstrap3",
+    "bootstrap4",
+    "foundation6",
+)
+
+_UNRESOLVED = object()
+
+_framework = _UNRESOLVED
+
+# Functions
+
+
+def get_framework():
+    """Get the HTML framework in use. The framework is resolved on the first call.
+
+    :rtype: str | None
+
+    """
+    global _framework
+
+    if _framework is _UNRESOLVED:
+        _framework = resolve_framework()
+
+    return _framework
+
+
+def reset_framework():
+    """Resolve the framework again on the next call to ``get_framework()``."""
+    global _framework
+    _framework = _UNRESOLVED
+
+
+def resolve_framework():
+    """Determine the HTML framework in use.
+
+    :rtype: str | None
+
+    The ``HTML_FRAMEWORK`` setting is used when it is defined. Otherwise, the framework is that of the first
+    ``htmgel_<framework>`` app in ``INSTALLED_APPS``, or of the framework package installed alongside htmgel.
+
+    """
+    framework = getattr(settings, "HTML_FRAMEWORK", None)
+    if framework:
+        return framework
+
+    for framework in FRAMEWORKS:
+        if "htmgel_%s" % framework in settings.INSTALLED_APPS:
+            return framework
+
+    return constants.HTMGEL_FRAMEWORK
+
+
+@receiver(setting_changed)
+def _setting_changed(setting, **kwargs):
+    if setting in ("HTML_FRAMEWORK", "INSTALLED_APPS"):
+        reset_framework()
@@ -0,0 +1,373 @@
+"""
+Render icons from a registry that is loaded once. The registry knows the names in the icon set (from a manifest), so
+names are validated, and each icon is rendered once per name and framework.
+
+Icons are rendered in one of three modes, given by the ``HTMGEL_ICON_MODE`` setting:
+
+- ``font``: markup for an icon font, i.e. Font Awesome or Glyphicons as given by the ``ICON_FRAMEWORK`` setting.
+- ``svg``: the SVG of the icon, inline.
+- ``sprite``: an SVG that uses the icon's symbol in a sprite, e.g. ``<use href="#name">``.
+
+The manifest (``HTMGEL_ICON_MANIFEST``) is the path to a JSON file of icon names (a list, or an object keyed by name
+such as Font Awesome's ``icons.json``), a directory of ``<name>.svg`` files, or an SVG sprite of ``<symbol>`` elements.
+Without a manifest, icon names are not validated and only the ``font`` and ``sprite`` modes are available.
+
+"""
+# Imports
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.html import escape
+from django.utils.safestring import SafeString
+import json
+import logging
+import os
+import re
+
+# Exports
+
+__all__ = (
+    "ICON_FONTS",
+    "IconRegistry",
+    "UnknownIcon",
+    "get_icon_registry",
+    "load_icon_set",
+    "render_icon",
+    "reset_icon_registry",
+)
+
+# Constants
+
+ICON_FONTS = {
+    'fontawesome': '<i class="fa fa-%s" aria-hidden="true"></i>',
+    'glyphicon': '<span class="glyphicon glyphicon-%s" aria-hidden="true"></span>',
+}
+"""The markup of each icon font, with a placeholder for the icon name."""
+
+ICON_FONT_ALIASES = {
+    'fa': "fontawesome",
+    'glyph': "glyphicon",
+}
+
+ICON_MODES = (
+    "font",
+    "sprite",
+    "svg",
+)
+
+UNKNOWN_ICON_POLICIES = (
+    "fallback",
+    "log",
+    "raise",
+)
+"""What to do when an icon is not in the manifest: render the fallback icon instead, log a warning and render the icon
+anyway, or raise ``UnknownIcon``."""
+
+SVG_ATTRIBUTES = 'class="icon icon-%s" aria-hidden="true" focusable="false"'
+
+_ATTRIBUTE = r'\b%s\s*=\s*"([^"]*)"'
+
+_PROLOG = re.compile(r"^\s*(<\?xml.*?\?>\s*)?(<!DOCTYPE[^>]*>\s*)?(<!--.*?-->\s*)*", re.DOTALL)
+
+_SYMBOL = re.compile(r"<symbol\b([^>]*)>(.*?)</symbol>", re.DOTALL)
+
+_registry = None
+
+log = logging.getLogger(__name__)
+
+# Exceptions
+
+
+class UnknownIcon(ValueError):
+    """Raised when an icon is not in the icon set and the unknown icon policy is ``raise``."""
+    pass
+
+# Classes
+
+
+class IconRegistry(object):
+    """The icons that may be rendered, and the icons that have been rendered."""
+
+    def __init__(self, icons=None, fallback=None, font="fontawesome", mode="font", sprite_url="", unknown="log"):
+        """Initialize the registry.
+
+        :param icons: The SVG of each icon by name (``None`` when only the name is known). ``None`` accepts any name.
+        :type icons: dict
+
+        :param fallback: The icon rendered in place of an unknown icon when ``unknown`` is ``fallback``.
+        :type fallback: str
+
+        :param font: The default icon font. See ``ICON_FONTS``.
+        :type font: str
+
+        :param mode: The output mode: ``font``, ``sprite``, or ``svg``.
+        :type mode: str
+
+        :param sprite_url: The URL of the sprite in ``sprite`` mode. Defaults to a sprite included in the page.
+        :type sprite_url: str
+
+        :param unknown: The unknown icon policy. See ``UNKNOWN_ICON_POLICIES``.
+        :type unknown: str
+
+        :raise: ImproperlyConfigured
+
+        """
+        if mode not in ICON_MODES:
+            raise ImproperlyConfigured("Unrecognized icon mode: %s" % mode)
+
+        if unknown not in UNKNOWN_ICON_POLICIES:
+            raise ImproperlyConfigured("Unrecognized unknown icon policy: %s" % unknown)
+
+        if mode == "svg" and not any((icons or dict()).values()):
+            raise ImproperlyConfigured("The svg icon mode requires an icon set that includes SVG.")
+
+        self.fallback = fallback
+        self.font = font
+        self.icons = icons
+        self.mode = mode
+        self.sprite_url = sprite_url
+        self.unknown = unknown
+
+        self._rendered = dict()
+
+    def __contains__(self, name):
+        return self.is_valid(name)
+
+    def __len__(self):
+        return len(self.icons or ())
+
+    def __repr__(self):
+        return "<%s %s>" % (self.__class__.__name__, self.mode)
+
+    @classmethod
+    def from_path(cls, path, **kwargs):
+        """Create a registry of the icons in a manifest. See ``load_icon_set()``.
+
+        :param path: The path to the manifest.
+        :type path: str
+
+        :rtype: IconRegistry
+
+        """
+        return cls(icons=load_icon_set(path), **kwargs)
+
+    def clear(self):
+        """Remove the rendered icons."""
+        self._rendered.clear()
+
+    def is_valid(self, name):
+        """Indicates whether an icon may be rendered.
+
+        :param name: The name of the icon.
+        :type name: str
+
+        :rtype: bool
+
+        """
+        if self.icons is None:
+            return True
+
+        if name not in self.icons:
+            return False
+
+        return self.mode != "svg" or self.icons[name] is not None
+
+    def render(self, name, framework=None):
+        """Render an icon.
+
+        :param name: The name of the icon.
+        :type name: str
+
+        :param framework: The icon font in ``font`` mode. Defaults to that of the registry.
+        :type framework: str
+
+        :rtype: SafeString
+        :raise: ImproperlyConfigured, UnknownIcon
+
+        The output is rendered once for each name and framework.
+
+        """
+        key = (name, framework)
+        try:
+            return self._rendered[key]
+        except KeyError:
+            pass
+
+        if not self.is_valid(name):
+            if self.unknown == "raise":
+                raise UnknownIcon("Unknown icon: %s" % name)
+
+            if self.unknown == "fallback" and self.fallback is not None and self.is_valid(self.fallback):
+                output = self.render(self.fallback, framework=framework)
+                self._rendered[key] = output
+
+                return output
+
+            # Logged once, since the output is then reused.
+            log.warning("Unknown icon: %s", name)
+
+        output = self._rendered[key] = SafeString(self._render(name, framework or self.font))
+
+        return output
+
+    def _render(self, name, font):
+        """Render the markup of an icon."""
+        if self.mode == "svg" and self.icons and self.icons.get(name):
+            return self.icons[name]
+
+        if self.mode in ("sprite", "svg"):
+            return '<svg %s><use href="%s#%s"></use></svg>' % (
+                SVG_ATTRIBUTES % escape(name),
+                escape(self.sprite_url),
+                escape(name)
+            )
+
+        font = ICON_FONT_ALIASES.get(font, font)
+        try:
+            return ICON_FONTS[font] % escape(name)
+        except KeyError:
+            raise ImproperlyConfigured("Unrecognized ICON_FRAMEWORK: %s" % font)
+
+# Functions
+
+
+def get_icon_registry():
+    """Get the icon registry, which is created from settings on the first call.
+
+    :rtype: IconRegistry
+    :raise: ImproperlyConfigured
+
+    """
+    global _registry
+
+    if _registry is None:
+        kwargs = {
+            'fallback': getattr(settings, "HTMGEL_ICON_FALLBACK", None),
+            'font': getattr(settings, "ICON_FRAMEWORK", "fontawesome"),
+            'mode': getattr(settings, "HTMGEL_ICON_MODE", "font"),
+            'sprite_url': getattr(settings, "HTMGEL_ICON_SPRITE_URL", ""),
+            'unknown': getattr(settings, "HTMGEL_ICON_UNKNOWN", "log"),
+        }
+
+        path = getattr(settings, "HTMGEL_ICON_MANIFEST", None)
+        if path:
+            _registry = IconRegistry.from_path(path, **kwargs)
+        else:
+            _registry = IconRegistry(**kwargs)
+
+    return _registry
+
+
+def load_icon_set(path):
+    """Load the icons of an icon set.
+
+    :param path: The path to a JSON manifest, a directory of SVG files, or an SVG sprite.
+    :type path: str
+
+    :rtype: dict
+    :returns: The SVG of each icon (as markup that may be included in a page) by name, or ``None`` when only the name
+              is known.
+    :raise: ImproperlyConfigured
+
+    """
+    if os.path.isdir(path):
+        icons = dict()
+        for file_name in sorted(os.listdir(path)):
+            name, extension = os.path.splitext(file_name)
+            if extension.lower() == ".svg":
+                with open(os.path.join(path, file_name), "r", encoding="utf-8") as f:
+                    icons[name] = _get_inline_svg(name, f.read())
+
+        return icons
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            content = f.read()
+    except OSError as e:
+        raise ImproperlyConfigured("Icon manifest could not be read: %s" % e)
+
+    if path.lower().endswith(".svg"):
+        return _load_sprite(content)
+
+    try:
+        manifest = json.loads(content)
+    except ValueError as e:
+        raise ImproperlyConfigured("Icon manifest is not valid JSON: %s (%s)" % (path, e))
+
+    if isinstance(manifest, list):
+        return dict([(name, None) for name in manifest])
+
+    # Font Awesome's icons.json includes the SVG of each style, e.g. {"user": {"svg": {"solid": {"raw": "<svg..."}}}}.
+    icons = dict()
+    for name, metadata in manifest.items():
+        svg = None
+        if isinstance(metadata, dict):
+            for style in (metadata.get("svg") or dict()).values():
+                if isinstance(style, dict) and style.get("raw"):
+                    svg = _get_inline_svg(name, style['raw'])
+                    break
+
+        icons[name] = svg
+
+    return icons
+
+
+def render_icon(name, framework=None):
+    """Render an icon with the icon registry.
+
+    :param name: The name of the icon.
+    :type name: str
+
+    :param framework: The icon font in ``font`` mode. Defaults to the ``ICON_FRAMEWORK`` setting.
+    :type framework: str
+
+    :rtype: SafeString
+    :raise: ImproperlyConfigured, UnknownIcon
+
+    """
+    return get_icon_registry().render(name, framework=framework)
+
+
+def reset_icon_registry():
+    """Create the icon registry again on the next call to ``get_icon_registry()``."""
+    global _registry
+    _registry = None
+
+
+def _get_inline_svg(name, svg):
+    """Prepare the SVG of an icon to be included in a page."""
+    svg = _PROLOG.sub("", svg).strip()
+
+    return svg.replace("<svg", "<svg %s" % (SVG_ATTRIBUTES % escape(name)), 1)
+
+
+def _load_sprite(content):
+    """Load the icons of an SVG sprite, building an inline SVG from each symbol."""
+    icons = dict()
+    for attributes, content in _SYMBOL.findall(content):
+        match = re.search(_ATTRIBUTE % "id", attributes)
+        if match is None:
+            continue
+
+        name = match.group(1)
+
+        svg_attributes = SVG_ATTRIBUTES % escape(name)
+
+        match = re.search(_ATTRIBUTE % "viewBox", attributes)
+        if match is not None:
+            svg_attributes += ' viewBox="%s"' % match.group(1)
+
+        icons[name] = '<svg xmlns="http://www.w3.org/2000/svg" %s>%s</svg>' % (svg_attributes, content.strip())
+
+    if not icons:
+        raise ImproperlyConfigured("Icon sprite has no symbols.")
+
+    return icons
+
+
+@receiver(setting_changed)
+def _setting_changed(setting, **kwargs):
+    if setting == "ICON_FRAMEWORK" or setting.startswith("HTMGEL_ICON_"):
+        reset_icon_registry()
@@ -1,16 +1,36 @@
 from .breacrumbs import *
 from .forms import *
 from .html import *
+from .menus import *
+from .pagination import *
 from .tables import *
 
 __all__ = (
+    ActionColumn,
     BaseHTML,
     Breadcrumb,
+    BreadcrumbDefinition,
     Breadcrumbs,
     Column,
+    ColumnarTable,
+    FieldRenderPlan,
     Fieldset,
+    FormRenderPlan,
+    Layout,
+    LayoutColumn,
+    LayoutRow,
     Link,
+    Menu,
+    MenuItem,
+    Pagination,
     QuerysetTable,
     Row,
+    SimpleRow,
     Table,
+    clear_breadcrumbs,
+    get_form_render_plan,
+    get_page_range,
+    get_widget_kind,
+    get_widget_kinds,
+    register_breadcrumb,
 )
@@ -1,31 +1,153 @@
 # Imports
 
-from django.urls import reverse
+from collections import defaultdict
+from django.core.exceptions import ImproperlyConfigured
+from django.urls import get_resolver, get_script_prefix, get_urlconf
+from django.utils.translation import get_language
+from functools import lru_cache
+from ..resolvers import reverse_url
 
 # Exports
 
 __all__ = (
     "Breadcrumb",
+    "BreadcrumbDefinition",
     "Breadcrumbs",
+    "clear_breadcrumbs",
+    "register_breadcrumb",
 )
 
+# Constants
+
+_registry = dict()
+"""The breadcrumb definitions by URL name. See ``register_breadcrumb()``."""
+
 # Classes
 
 
 class Breadcrumb(object):
     """Helper class that ensures an object has the required attributes."""
 
-    def __init__(self, text, url):
+    __slots__ = (
+        "namespace",
+        "pattern_args",
+        "pattern_kwargs",
+        "pattern_name",
+        "text",
+        "_url",
+    )
+
+    def __init__(self, text, url=None, pattern_name=None, pattern_args=None, pattern_kwargs=None, namespace=None):
+        """Initialize the breadcrumb.
+
+        :param text: The breadcrumb label/text.
+        :type text: str
+
+        :param url: The URL.
+        :type url: str
+
+        :param pattern_name: The name of the URL pattern, which is reversed (lazily) when a URL is not given.
+        :type pattern_name: str
+
+        :param pattern_args: Pattern arguments.
+        :type pattern_args: list
+
+        :param pattern_kwargs: Pattern keyword arguments.
+        :type pattern_kwargs: dict
+
+        :param namespace: The application namespace of the pattern.
+        :type namespace: str
+
+        """
+        self.namespace = namespace
+        self.pattern_args = pattern_args
+        self.pattern_kwargs = pattern_kwargs
+        self.pattern_name = pattern_name
         self.text = text
-        self.url = url
+        self._url = url
 
     def __repr__(self):
         return "<%s %s>" % (self.__class__.__name__, self.text)
 
+    @property
+    def url(self):
+        """Get the URL of the breadcrumb. A pattern is reversed when the URL is first used.
+
+        :rtype: str
+
+        """
+        if self._url is None and self.pattern_name is not None:
+            return reverse_url(self.pattern_name, args=self.pattern_args, kwargs=self.pattern_kwargs,
+                               namespace=self.namespace)
+
+        return self._url
+
+    @url.setter
+    def url(self, url):
+        self._url = url
+
     def get_absolute_url(self):
         return self.url
 
 
+class BreadcrumbDefinition(object):
+    """The breadcrumb of a URL name, which is used to build breadcrumbs automatically."""
+
+    __slots__ = (
+        "kwarg",
+        "kwargs",
+        "lookup",
+        "model",
+        "name",
+        "parent",
+        "parent_kwargs",
+        "title",
+    )
+
+    def __init__(self, name, title=None, parent=None, model=None, lookup="pk", kwarg=None, kwargs=None,
+                 parent_kwargs=None):
+        """Initialize the definition. See ``register_breadcrumb()`` for the parameters."""
+        self.kwarg = kwarg or lookup
+        self.lookup = lookup
+        self.model = model
+        self.name = name
+        self.parent = parent
+        self.parent_kwargs = parent_kwargs or dict()
+        self.title = title
+
+        if kwargs is not None:
+            self.kwargs = tuple(kwargs)
+        elif model is not None:
+            self.kwargs = (self.kwarg,)
+        else:
+            self.kwargs = ()
+
+    def __repr__(self):
+        return "<%s %s>" % (self.__class__.__name__, self.name)
+
+    def get_text(self, obj=None, kwargs=None):
+        """Get the text of the breadcrumb.
+
+        :param obj: The object of the breadcrumb when the definition has a model.
+
+        :param kwargs: The URL keyword arguments of the breadcrumb.
+        :type kwargs: dict
+
+        :rtype: str
+
+        """
+        if callable(self.title):
+            if self.model is not None:
+                return self.title(obj)
+
+            return self.title(kwargs or dict())
+
+        if self.title is None and obj is not None:
+            return str(obj)
+
+        return str(self.title)
+
+
 class Breadcrumbs(object):
     """Collect objects to be displayed as breadcrumbs."""
 
@@ -35,6 +157,101 @@ class Breadcrumbs(object):
     def __iter__(self):
         return iter(self.items)
 
+    def __len__(self):
+        return len(self.items)
+
+    @classmethod
+    def for_request(cls, request, obj=None):
+        """Build the breadcrumbs of the current view from the registered definitions.
+
+        :param request: The current request.
+        :type request: django.http.HttpRequest
+
+        :param obj: The object of the current view, which is used rather than fetched again.
+
+        :rtype: Breadcrumbs
+
+        """
+        match = getattr(request, "resolver_match", None)
+        if match is None:
+            return cls()
+
+        return cls.for_view(match.view_name, kwargs=match.kwargs, obj=obj)
+
+    @classmethod
+    def for_view(cls, name, kwargs=None, obj=None):
+        """Build the breadcrumbs of a URL name and its ancestors from the registered definitions.
+
+        :param name: The URL name, including its namespace.
+        :type name: str
+
+        :param kwargs: The keyword arguments of the URL.
+        :type kwargs: dict
+
+        :param obj: The object identified by the URL, which is used rather than fetched again.
+
+        :rtype: Breadcrumbs
+
+        The objects of the ancestors are fetched with one ``in_bulk()`` query per model. The leading breadcrumbs that
+        have no arguments (e.g. Home and Projects) are cached.
+
+        """
+        breadcrumbs = cls()
+
+        definition = _registry.get(name)
+        if definition is None:
+            return breadcrumbs
+
+        # Walk up from the current view until a breadcrumb without arguments is found.
+        chain = list()
+        kwargs = kwargs or dict()
+        static_name = None
+        while definition is not None:
+            if not definition.kwargs:
+                static_name = definition.name
+                break
+
+            try:
+                crumb_kwargs = {k: kwargs[k] for k in definition.kwargs}
+            except KeyError as e:
+                raise ImproperlyConfigured("Breadcrumb %s requires the %s URL argument." % (definition.name, e))
+
+            chain.append((definition, crumb_kwargs))
+
+            if len(chain) > len(_registry):
+                raise ImproperlyConfigured("The parents of breadcrumb %s form a cycle." % name)
+
+            # The arguments of the parent are those of this URL, some of which may be renamed.
+            parent_kwargs = dict(kwargs)
+            for k, v in definition.parent_kwargs.items():
+                if v in kwargs:
+                    parent_kwargs[k] = kwargs[v]
+
+            kwargs = parent_kwargs
+            definition = _get_definition(definition.parent)
+
+        if static_name is not None:
+            for text, url in _get_static_crumbs(static_name, get_urlconf(), get_script_prefix(), get_language(),
+                                                get_resolver(get_urlconf())):
+                breadcrumbs.items.append(Breadcrumb(text, url))
+
+        objects = _get_objects(chain, obj)
+
+        for definition, crumb_kwargs in reversed(chain):
+            crumb_obj = None
+            if definition.model is not None:
+                crumb_obj = objects.get((definition.model, definition.lookup, str(crumb_kwargs[definition.kwarg])))
+                if crumb_obj is None:
+                    continue
+
+            breadcrumbs.items.append(Breadcrumb(
+                definition.get_text(obj=crumb_obj, kwargs=crumb_kwargs),
+                pattern_kwargs=crumb_kwargs,
+                pattern_name=definition.name
+            ))
+
+        return breadcrumbs
+
     def add(self, text, url, pattern_args=None, pattern_kwargs=None, namespace=None):
         """Add a breadcrumb to the list.
 
@@ -55,18 +272,146 @@ class Breadcrumbs(object):
 
         :rtype: Breadcrumb
 
+        The pattern is reversed when the breadcrumb's URL is rendered, rather than when it is added.
+
         """
         if pattern_args or pattern_kwargs:
-            if namespace is not None:
-                _url = "%s:%s" % (namespace, url)
-            else:
-                _url = url
-
-            actual_url = reverse(_url, args=pattern_args, kwargs=pattern_kwargs)
+            breadcrumb = Breadcrumb(
+                text,
+                namespace=namespace,
+                pattern_args=pattern_args,
+                pattern_kwargs=pattern_kwargs,
+                pattern_name=url
+            )
         else:
-            actual_url = url
+            breadcrumb = Breadcrumb(text, url)
 
-        breadcrumb = Breadcrumb(text, actual_url)
         self.items.append(breadcrumb)
 
         return breadcrumb
+
+# Functions
+
+
+def clear_breadcrumbs():
+    """Remove all breadcrumb definitions."""
+    _registry.clear()
+    _get_static_crumbs.cache_clear()
+
+
+def register_breadcrumb(name, title=None, parent=None, model=None, lookup="pk", kwarg=None, kwargs=None,
+                        parent_kwargs=None):
+    """Define the breadcrumb of a URL name so that ``Breadcrumbs.for_request()`` can build breadcrumbs automatically.
+
+    :param name: The URL name, including its namespace, e.g. ``projects:project_detail``.
+    :type name: str
+
+    :param title: The text of the breadcrumb. A callable is given the object (when a model is defined) or the URL
+                  keyword arguments. Defaults to ``str()`` of the object.
+    :type title: str | callable
+
+    :param parent: The URL name of the parent breadcrumb.
+    :type parent: str
+
+    :param model: The model of the object identified by the URL.
+
+    :param lookup: The unique field of the model that the URL identifies the object by.
+    :type lookup: str
+
+    :param kwarg: The URL keyword argument holding the value of the lookup field. Defaults to the lookup.
+    :type kwarg: str
+
+    :param kwargs: The names of the URL's keyword arguments. Defaults to the ``kwarg`` when a model is defined.
+    :type kwargs: list[str]
+
+    :param parent_kwargs: The keyword arguments of the parent's URL that are named differently in this URL, e.g.
+                          ``{'pk': "project"}`` when ``projects/<project>/tasks/<pk>/`` is the child of
+                          ``projects/<pk>/``.
+    :type parent_kwargs: dict
+
+    :rtype: BreadcrumbDefinition
+
+    """
+    definition = BreadcrumbDefinition(
+        name,
+        title=title,
+        parent=parent,
+        model=model,
+        lookup=lookup,
+        kwarg=kwarg,
+        kwargs=kwargs,
+        parent_kwargs=parent_kwargs
+    )
+
+    _registry[name] = definition
+    _get_static_crumbs.cache_clear()
+
+    return definition
+
+
+def _get_definition(name):
+    """Get a registered definition, or ``None`` when no name is given."""
+    if name is None:
+        return None
+
+    try:
+        return _registry[name]
+    except KeyError:
+        raise ImproperlyConfigured("Breadcrumb is not registered: %s" % name)
+
+
+def _get_objects(chain, obj=None):
+    """Fetch the objects of a chain of breadcrumbs, using one query per model.
+
+    :param chain: The definitions and URL keyword arguments of the breadcrumbs, starting with the current view.
+    :type chain: list
+
+    :param obj: The object of the current view, which is not fetched.
+
+    :rtype: dict
+    :returns: The objects by model, lookup and (string) lookup value.
+
+    """
+    objects = dict()
+    values = defaultdict(set)
+    for i, (definition, kwargs) in enumerate(chain):
+        if definition.model is None:
+            continue
+
+        value = kwargs[definition.kwarg]
+        if i == 0 and obj is not None:
+            objects[(definition.model, definition.lookup, str(value))] = obj
+            continue
+
+        values[(definition.model, definition.lookup)].add(value)
+
+    for (model, lookup), _values in values.items():
+        # URL arguments may be strings while the keys of in_bulk() are of the field's type, so both are compared as
+        # strings.
+        for key, instance in model._default_manager.in_bulk(list(_values), field_name=lookup).items():
+            objects[(model, lookup, str(key))] = instance
+
+    return objects
+
+
+@lru_cache(maxsize=256)
+def _get_static_crumbs(name, urlconf, prefix, language, resolver):
+    """Get the text and URL of a breadcrumb that has no URL arguments, preceded by those of its ancestors.
+
+    The URLconf, script prefix, language and resolver only vary the cache.
+
+    :rtype: tuple
+
+    """
+    crumbs = list()
+
+    definition = _get_definition(name)
+    while definition is not None:
+        crumbs.insert(0, (definition.get_text(), reverse_url(definition.name, urlconf=urlconf)))
+
+        if len(crumbs) > len(_registry):
+            raise ImproperlyConfigured("The parents of breadcrumb %s form a cycle." % name)
+
+        definition = _get_definition(definition.parent)
+
+    return tuple(crumbs)
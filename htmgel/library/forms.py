@@ -1,17 +1,330 @@
 # Imports
 
+from collections import OrderedDict
+from django.utils.html import conditional_escape, format_html
 from django.utils.safestring import mark_safe
-from .html import BaseHTML
+from django.utils.translation import gettext
+from threading import Lock
+from .html import BaseHTML, flatten_attributes, get_class_attribute
 
 # Exports
 
 __all__ = (
+    "FieldRenderPlan",
     "Fieldset",
+    "FormRenderPlan",
+    "Layout",
+    "LayoutColumn",
+    "LayoutRow",
+    "clear_form_render_plans",
+    "get_form_render_plan",
+    "get_widget_kind",
+    "get_widget_kinds",
 )
 
+# Constants
+
+FORM_CSS = {
+    'bootstrap3': {
+        'checkbox': "checkbox",
+        'column': "col-md-%s",
+        'error': "error",
+        'group': "form-group",
+        'group_error': "has-error",
+        'help': "help-block",
+        'input': "form-control",
+        'label': "control-label",
+        'required': '<span class="text-danger">*</span>',
+        'row': "row",
+    },
+    'bootstrap4': {
+        'checkbox': "form-check",
+        'column': "col-md-%s",
+        'error': "invalid-feedback d-block",
+        'group': "form-group",
+        'group_error': "is-invalid",
+        'help': "form-text text-muted",
+        'input': "form-control",
+        'label': "",
+        'required': '<span class="text-danger">*</span>',
+        'row': "form-row",
+    },
+    'foundation6': {
+        'checkbox': "",
+        'column': "cell medium-%s",
+        'error': "form-error is-visible",
+        'group': "",
+        'group_error': "is-invalid-label",
+        'help': "help-text",
+        'input': "",
+        'label': "",
+        'required': '<span class="required">*</span>',
+        'row': "grid-x grid-padding-x",
+    },
+}
+"""The CSS classes (and required marker) used to render forms with each framework."""
+
+DEFAULT_FORM_CSS = FORM_CSS['bootstrap3']
+"""The CSS used when the framework is not one of the ``FORM_CSS`` keys."""
+
+PLAIN_WIDGET_KINDS = ("checkbox", "checkbox_multiple", "clearable_file", "file", "radio")
+"""Widgets of these kinds are not given the framework's input class."""
+
+MAX_FORM_RENDER_PLANS = 256
+"""The number of form render plans that are cached, after which the least recently used are discarded."""
+
+_plans = OrderedDict()
+"""The form render plans that have been built. See ``get_form_render_plan()``."""
+
+_plans_lock = Lock()
+
+WIDGET_KINDS = (
+    ("CheckboxInput", "checkbox"),
+    ("CheckboxSelectMultiple", "checkbox_multiple"),
+    ("ClearableFileInput", "clearable_file"),
+    ("DateInput", "date"),
+    ("DateTimeInput", "datetime"),
+    ("FileInput", "file"),
+    ("HiddenInput", "hidden"),
+    ("PasswordInput", "password"),
+    ("RadioSelect", "radio"),
+    ("Select", "select"),
+    ("SelectMultiple", "select_multiple"),
+    ("Textarea", "textarea"),
+    ("TextInput", "text"),
+)
+"""The names of Django's widget classes and the kind of widget they represent."""
+
+MARKDOWN_WIDGET = "MarkdownWidget"
+"""Widgets with this class name (from any package) are of the ``markdown`` kind."""
+
+OTHER_WIDGET = "other"
+"""The kind of widgets that are not one of the ``WIDGET_KINDS``."""
+
+_kinds_by_class = dict()
+"""The widget classes that have been classified. See ``get_widget_kinds()``."""
+
+_kinds_by_widget_class = None
+"""Django's widget classes and their kind, built on first use."""
+
 # Classes
 
 
+class FieldRenderPlan(object):
+    """The parts of a field's output that do not depend on the form instance.
+
+    The tags of the wrapper, label and help text are rendered when the plan is built. Rendering a field adds the text
+    of its label and help text, the widget (with its value) and any errors.
+
+    """
+
+    __slots__ = (
+        "close",
+        "error_open",
+        "help_open",
+        "hidden",
+        "kind",
+        "label_open",
+        "name",
+        "open",
+        "required",
+        "widget_attrs",
+    )
+
+    def __init__(self, bound_field, css):
+        """Build the plan for a field.
+
+        :param bound_field: The bound field of a form.
+        :type bound_field: django.forms.BoundField
+
+        :param css: The CSS classes of the framework. See ``FORM_CSS``.
+        :type css: dict
+
+        """
+        field = bound_field.field
+
+        self.name = bound_field.name
+        self.kind = get_widget_kind(field.widget)
+        self.hidden = bound_field.is_hidden
+        self.required = field.required
+
+        self.widget_attrs = dict()
+        if self.hidden:
+            self.close = self.error_open = self.help_open = self.label_open = self.open = ""
+            return
+
+        if css['input'] and self.kind not in PLAIN_WIDGET_KINDS:
+            self.widget_attrs['class'] = " ".join(c for c in (field.widget.attrs.get("class"), css['input']) if c)
+
+        self.help_open = ""
+        if field.help_text:
+            help_id = "%s_help" % bound_field.id_for_label
+            self.widget_attrs['aria-describedby'] = help_id
+            self.help_open = format_html('<p{} id="{}">', get_class_attribute(css['help']), help_id)
+
+        # A checkbox is placed within its label.
+        if self.kind == "checkbox":
+            group = css['checkbox']
+            self.label_open = "<label>"
+        else:
+            group = css['group']
+            self.label_open = format_html('<label for="{}"{}>', bound_field.id_for_label,
+                                          get_class_attribute(css['label']))
+
+        self.error_open = format_html("<div{}>", get_class_attribute(group, css['group_error']))
+        self.open = format_html("<div{}>", get_class_attribute(group))
+        self.close = "</div>"
+
+    def __repr__(self):
+        return "<%s %s %s>" % (self.__class__.__name__, self.name, self.kind)
+
+
+class FormRenderPlan(object):
+    """The fields of a form along with the parts of their output that do not depend on the request.
+
+    Plans are built by ``get_form_render_plan()``, which caches them by form class and the widgets of its fields.
+
+    """
+
+    __slots__ = (
+        "css",
+        "fields",
+        "layouts",
+    )
+
+    def __init__(self, form, css=None):
+        """Build the plan for a form.
+
+        :param form: The form instance.
+        :type form: django.forms.Form
+
+        :param css: The CSS classes to use. Defaults to those of Bootstrap 3.
+        :type css: dict
+
+        """
+        self.css = css or DEFAULT_FORM_CSS
+        self.fields = tuple(FieldRenderPlan(form[name], self.css) for name in form.fields)
+
+        # The compiled output of each layout that has been rendered with the plan. See ``Layout.get_parts()``.
+        self.layouts = dict()
+
+    def __iter__(self):
+        return iter(self.fields)
+
+    def __len__(self):
+        return len(self.fields)
+
+    @property
+    def kinds(self):
+        """Get the widget kind of each field.
+
+        :rtype: tuple[str]
+
+        """
+        return tuple(f.kind for f in self.fields)
+
+    @property
+    def required(self):
+        """Get whether each field is required.
+
+        :rtype: tuple[bool]
+
+        """
+        return tuple(f.required for f in self.fields)
+
+    def iter_html(self, form):
+        """Render a form in parts.
+
+        :param form: An instance of the form for which the plan was built.
+        :type form: django.forms.Form
+
+        :rtype: collections.Iterable[str]
+
+        """
+        yield from self.iter_errors_html(form)
+
+        for f in self.fields:
+            yield from self.iter_field_html(form, f)
+
+    def iter_errors_html(self, form):
+        """Render the errors that are not shown with a field: those of hidden fields, followed by those that are not
+        associated with a field.
+
+        :param form: An instance of the form for which the plan was built.
+        :type form: django.forms.Form
+
+        :rtype: collections.Iterable[str]
+
+        """
+        error_class = get_class_attribute(self.css['error'])
+
+        for f in self.fields:
+            if not f.hidden:
+                continue
+
+            for error in form[f.name].errors:
+                error = gettext("(Hidden field %(name)s) %(error)s") % {'name': f.name, 'error': error}
+                yield format_html("<p{}>{}</p>", error_class, error)
+
+        for error in form.non_field_errors():
+            yield format_html("<p{}>{}</p>", error_class, error)
+
+    def iter_field_html(self, form, f):
+        """Render a field in parts.
+
+        :param form: An instance of the form for which the plan was built.
+        :type form: django.forms.Form
+
+        :param f: The plan for one of the form's fields.
+        :type f: FieldRenderPlan
+
+        :rtype: collections.Iterable[str]
+
+        """
+        bound_field = form[f.name]
+
+        if f.hidden:
+            yield str(bound_field)
+            return
+
+        errors = bound_field.errors
+
+        label = conditional_escape(bound_field.label)
+        if f.required:
+            label = "%s %s" % (label, self.css['required'])
+
+        yield f.error_open if errors else f.open
+        yield f.label_open
+
+        if f.kind == "checkbox":
+            yield bound_field.as_widget(attrs=f.widget_attrs)
+            yield " %s</label>" % label
+        else:
+            yield "%s</label>" % label
+            yield bound_field.as_widget(attrs=f.widget_attrs)
+
+        if f.help_open:
+            yield "%s%s</p>" % (f.help_open, bound_field.help_text)
+
+        if errors:
+            error_class = get_class_attribute(self.css['error'])
+            for error in errors:
+                yield format_html("<p{}>{}</p>", error_class, error)
+
+        yield f.close
+
+    def render(self, form):
+        """Render a form.
+
+        :param form: An instance of the form for which the plan was built.
+        :type form: django.forms.Form
+
+        :rtype: str
+
+        """
+        return mark_safe("".join(self.iter_html(form)))
+
+
 class Fieldset(BaseHTML):
     """A fieldset within a form."""
 
@@ -43,6 +356,351 @@ class Fieldset(BaseHTML):
         for f in self.fields:
             a.append(str(f))
 
-        a.append("<%s>" % self.get_close_tag())
+        a.append("</%s>" % self.get_close_tag())
 
         return "\n".join(a)
+
+
+class Layout(object):
+    """The arrangement of a form's fields in fieldsets, rows and columns.
+
+    A layout is declared once as the ``layout`` attribute of a form class:
+
+    .. code::
+
+        class ContactForm(forms.Form):
+            layout = Layout(
+                Fieldset("Name", [
+                    LayoutRow("first_name", "last_name"),
+                ]),
+                LayoutRow(LayoutColumn("email", size=8), LayoutColumn("phone", size=4)),
+                "message",
+            )
+
+    The layout is compiled the first time it is rendered with a given form render plan (see
+    ``get_form_render_plan()``), after which rendering only adds the values and errors of the fields. Fields of the
+    form that are not in the layout are rendered after it, and fields of the layout that are not in the form (e.g.
+    because they were removed in ``__init__()``) are skipped.
+
+    """
+
+    def __init__(self, *items):
+        """Initialize the layout.
+
+        :param items: Field names, ``Fieldset``, ``LayoutRow`` or ``LayoutColumn`` instances.
+
+        """
+        self.items = items
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __repr__(self):
+        return "<%s %s>" % (self.__class__.__name__, len(self.items))
+
+    def compile(self, plan):
+        """Compile the layout for a form render plan.
+
+        :param plan: The plan for the form.
+        :type plan: FormRenderPlan
+
+        :rtype: tuple
+        :returns: The static HTML (as ``str``) and the plans of the fields, in the order they are output.
+
+        """
+        fields = OrderedDict((f.name, f) for f in plan.fields)
+
+        parts = list()
+        for item in self.items:
+            _compile_layout_item(item, parts, fields, plan.css)
+
+        parts.extend(fields.values())
+
+        # Merge adjacent static HTML.
+        compiled = list()
+        for part in parts:
+            if compiled and isinstance(part, str) and isinstance(compiled[-1], str):
+                compiled[-1] += part
+            else:
+                compiled.append(part)
+
+        return tuple(compiled)
+
+    def get_parts(self, plan):
+        """Get the compiled layout for a form render plan, which is compiled once.
+
+        :param plan: The plan for the form.
+        :type plan: FormRenderPlan
+
+        :rtype: tuple
+
+        """
+        try:
+            return plan.layouts[self]
+        except KeyError:
+            pass
+
+        parts = plan.layouts[self] = self.compile(plan)
+
+        return parts
+
+    def iter_html(self, form, framework=None):
+        """Render a form in parts, which may be streamed.
+
+        :param form: The form instance.
+        :type form: django.forms.Form
+
+        :param framework: The HTML framework whose CSS classes are used.
+        :type framework: str
+
+        :rtype: collections.Iterable[str]
+
+        """
+        plan = get_form_render_plan(form, framework=framework)
+
+        yield from plan.iter_errors_html(form)
+
+        for part in self.get_parts(plan):
+            if isinstance(part, str):
+                yield part
+            else:
+                yield from plan.iter_field_html(form, part)
+
+    def render(self, form, framework=None):
+        """Render a form.
+
+        :param form: The form instance.
+        :type form: django.forms.Form
+
+        :param framework: The HTML framework whose CSS classes are used.
+        :type framework: str
+
+        :rtype: str
+
+        """
+        return mark_safe("".join(self.iter_html(form, framework=framework)))
+
+
+class LayoutColumn(BaseHTML):
+    """A column of fields within a ``LayoutRow``."""
+
+    def __init__(self, *fields, size=None, **kwargs):
+        """Initialize the column.
+
+        :param fields: Field names, or other layout items.
+
+        :param size: The number of grid columns (of 12) to span. By default, columns share what remains of the row
+                     equally.
+        :type size: int
+
+        """
+        kwargs['open_tag'] = "div"
+        super(LayoutColumn, self).__init__("", **kwargs)
+
+        self.fields = list(fields)
+        self.size = size
+
+    def __iter__(self):
+        return iter(self.fields)
+
+
+class LayoutRow(BaseHTML):
+    """A row of columns using the framework's grid."""
+
+    def __init__(self, *columns, **kwargs):
+        """Initialize the row.
+
+        :param columns: ``LayoutColumn`` instances. A field name is placed in a column of its own.
+
+        """
+        kwargs['open_tag'] = "div"
+        super(LayoutRow, self).__init__("", **kwargs)
+
+        self.columns = [c if isinstance(c, LayoutColumn) else LayoutColumn(c) for c in columns]
+
+    def __iter__(self):
+        return iter(self.columns)
+
+# Functions
+
+
+def clear_form_render_plans():
+    """Remove all cached form render plans."""
+    with _plans_lock:
+        _plans.clear()
+
+
+def get_form_render_plan(form, framework=None):
+    """Get the render plan for a form, which is built once for each form class.
+
+    :param form: The form instance.
+    :type form: django.forms.Form
+
+    :param framework: The HTML framework whose CSS classes are used.
+    :type framework: str
+
+    :rtype: FormRenderPlan
+
+    Plans are cached by the form class, prefix, ``auto_id`` and framework. The key also includes the name, widget
+    class and ``required`` flag of each field, and whether it has help text. A form that changes its fields in
+    ``__init__()`` therefore gets a separate plan rather than a stale one. The text of labels and help text is not part
+    of the plan (or the key), as it is added when the form is rendered. At most ``MAX_FORM_RENDER_PLANS`` are cached.
+
+    """
+    key = (
+        form.__class__,
+        form.prefix,
+        form.auto_id,
+        framework,
+        tuple(
+            (name, f.widget.__class__, f.widget.is_hidden, f.widget.attrs.get("class"), not f.help_text, f.required)
+            for name, f in form.fields.items()
+        ),
+    )
+
+    with _plans_lock:
+        try:
+            _plans.move_to_end(key)
+            return _plans[key]
+        except KeyError:
+            pass
+
+    plan = FormRenderPlan(form, css=FORM_CSS.get(framework, DEFAULT_FORM_CSS))
+
+    with _plans_lock:
+        _plans[key] = plan
+
+        while len(_plans) > MAX_FORM_RENDER_PLANS:
+            _plans.popitem(last=False)
+
+    return plan
+
+
+def get_widget_kind(widget):
+    """Get the kind of a widget, such as ``checkbox``, ``date`` or ``select``.
+
+    :param widget: The widget, or a form field or bound field whose widget is to be classified.
+
+    :rtype: str
+
+    The kind is that of the most specific class in the widget's MRO, so a custom widget that extends ``DateInput`` is
+    a ``date``. Widgets that are not derived from one of the ``WIDGET_KINDS`` are ``other``.
+
+    """
+    return get_widget_kinds(widget)[0]
+
+
+def get_widget_kinds(widget):
+    """Get the kind of a widget along with every kind that it is an instance of.
+
+    :param widget: The widget, or a form field or bound field whose widget is to be classified.
+
+    :rtype: tuple(str, frozenset)
+
+    For example, a ``ClearableFileInput`` is of the ``clearable_file`` kind and of the ``clearable_file`` and ``file``
+    kinds, in the same way that ``isinstance()`` would be true for both classes. Classes are classified once.
+
+    """
+    widget_class = _get_widget(widget).__class__
+
+    try:
+        return _kinds_by_class[widget_class]
+    except KeyError:
+        pass
+
+    global _kinds_by_widget_class
+
+    if _kinds_by_widget_class is None:
+        from django import forms
+        _kinds_by_widget_class = {getattr(forms, name): kind for name, kind in WIDGET_KINDS}
+
+    kinds = list()
+    for cls in widget_class.__mro__:
+        if cls.__name__ == MARKDOWN_WIDGET:
+            kinds.append("markdown")
+        elif cls in _kinds_by_widget_class:
+            kinds.append(_kinds_by_widget_class[cls])
+
+    if not kinds:
+        kinds.append(OTHER_WIDGET)
+
+    result = _kinds_by_class[widget_class] = (kinds[0], frozenset(kinds))
+
+    return result
+
+
+def _compile_layout_item(item, parts, fields, css, size=None):
+    """Add the output of an item of a layout to the parts of a compiled layout.
+
+    :param item: A field name, bound field, ``Fieldset``, ``LayoutRow`` or ``LayoutColumn``.
+
+    :param parts: The static HTML and field plans compiled so far.
+    :type parts: list
+
+    :param fields: The field plans that have not been used, by field name.
+    :type fields: OrderedDict
+
+    :param css: The CSS classes of the framework.
+    :type css: dict
+
+    :param size: The number of grid columns spanned by a column, when not given by the column itself.
+    :type size: int
+
+    """
+    if isinstance(item, Fieldset):
+        parts.append("<%s>" % item.get_open_tag())
+        parts.append(format_html("<legend>{}</legend>", item.legend))
+
+        for f in item.fields:
+            _compile_layout_item(f, parts, fields, css)
+
+        parts.append("</%s>" % item.get_close_tag())
+    elif isinstance(item, LayoutRow):
+        parts.append("<div%s>" % _get_attributes(item, css['row']))
+
+        # Columns without a size share what remains of the row's 12 grid columns.
+        unsized = len([c for c in item.columns if not c.size])
+        if unsized:
+            size = max(1, (12 - sum(c.size or 0 for c in item.columns)) // unsized)
+
+        for column in item.columns:
+            _compile_layout_item(column, parts, fields, css, size=size)
+
+        parts.append("</div>")
+    elif isinstance(item, LayoutColumn):
+        parts.append("<div%s>" % _get_attributes(item, css['column'] % (item.size or size or 12)))
+
+        for f in item.fields:
+            _compile_layout_item(f, parts, fields, css)
+
+        parts.append("</div>")
+    else:
+        # A field name, or a bound field as accepted by Fieldset.
+        f = fields.pop(getattr(item, "name", item), None)
+        if f is not None:
+            parts.append(f)
+
+
+def _get_attributes(element, *classes):
+    """Get the flattened attributes of a layout element along with the given CSS classes."""
+    attributes = dict(element._attributes)
+
+    existing = attributes.get("class") or ""
+    if not isinstance(existing, str):
+        existing = " ".join(existing)
+
+    names = " ".join(n for n in (existing,) + classes if n)
+    if names:
+        attributes['class'] = names
+
+    return flatten_attributes(attributes)
+
+
+def _get_widget(field):
+    """Get the widget of a bound field or form field, or the widget itself."""
+    try:
+        return field.field.widget
+    except AttributeError:
+        pass
+
+    return getattr(field, "widget", field)
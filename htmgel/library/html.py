@@ -1,21 +1,43 @@
 # Imports
 
 from django.forms.utils import flatatt
+from django.utils.html import format_html
 from django.utils.safestring import mark_safe
+from functools import lru_cache
+from types import MappingProxyType
+from ..resolvers import LazyURL
 
 # Exports
 
 __all__ = (
     "BaseHTML",
     "Link",
+    "flatten_attributes",
+    "get_class_attribute",
 )
 
+# Constants
+
+EMPTY_ATTRIBUTES = MappingProxyType({})
+"""Shared by all elements that have no attributes. It is replaced by a ``dict`` when an attribute is set."""
+
+INTERNABLE_TYPES = (bool, float, int, str, type(None))
+"""Attribute values of these types may be used to share the flattened output of identical attributes."""
+
 # Classes
 
 
 class BaseHTML(object):
     """Base class for HTML elements."""
 
+    __slots__ = (
+        "content",
+        "_attributes",
+        "_close_tag",
+        "_flat_attributes",
+        "_open_tag",
+    )
+
     def __init__(self, content, close_tag=None, open_tag=None, **kwargs):
         self.content = content
         self._close_tag = close_tag
@@ -25,10 +47,11 @@ class BaseHTML(object):
         if classes is not None:
             kwargs['class'] = classes
 
-        self._attributes = kwargs
+        self._attributes = kwargs or EMPTY_ATTRIBUTES
+        self._flat_attributes = None
 
     def __repr__(self):
-        return "<%s %s%s>" % (self.__class__.__name__, self._open_tag, flatatt(self._attributes))
+        return "<%s %s%s>" % (self.__class__.__name__, self._open_tag, self.attributes)
 
     def __str__(self):
         return self.to_html()
@@ -40,7 +63,28 @@ class BaseHTML(object):
         :rtype: str
 
         """
-        return flatatt(self._attributes)
+        if self._flat_attributes is None:
+            self._flat_attributes = flatten_attributes(self._attributes)
+
+        return self._flat_attributes
+
+    def add_class(self, *names):
+        """Add one or more CSS classes to the element.
+
+        :param names: The class names.
+        :type names: str
+
+        """
+        classes = self._attributes.get("class") or ""
+        if not isinstance(classes, str):
+            classes = " ".join(classes)
+
+        existing = classes.split()
+        for name in names:
+            if name not in existing:
+                existing.append(name)
+
+        self.set_attribute("class", " ".join(existing))
 
     def get_close_tag(self):
         """Get the closing tag for the element.
@@ -56,7 +100,38 @@ class BaseHTML(object):
         :rtype: str
 
         """
-        return "%s%s" % (self._open_tag, flatatt(self._attributes))
+        return "%s%s" % (self._open_tag, self.attributes)
+
+    def remove_attribute(self, name):
+        """Remove an attribute from the element.
+
+        :param name: The attribute name.
+        :type name: str
+
+        """
+        if name in self._attributes:
+            del self._attributes[name]
+            self._flat_attributes = None
+
+    def set_attribute(self, name, value):
+        """Set an attribute of the element.
+
+        :param name: The attribute name.
+        :type name: str
+
+        :param value: The attribute value. ``True`` outputs the name only, while ``False`` or ``None`` omit the
+                      attribute.
+
+        .. note::
+            Attributes must be changed using this method (or ``add_class()`` and ``remove_attribute()``) so that the
+            flattened attributes are rendered again.
+
+        """
+        if self._attributes is EMPTY_ATTRIBUTES:
+            self._attributes = dict()
+
+        self._attributes[name] = value
+        self._flat_attributes = None
 
     @mark_safe
     def to_html(self):
@@ -69,9 +144,41 @@ class BaseHTML(object):
 
 
 class Link(BaseHTML):
-    """An HTML link."""
+    """An HTML link.
+
+    The link may be given a URL pattern instead of an ``href``, in which case the pattern is reversed (through
+    ``reverse_url()``) when the link is first rendered, so links that are never rendered cost nothing to reverse.
+
+    """
+
+    __slots__ = ()
+
+    def __init__(self, href=None, text=None, pattern_name=None, pattern_args=None, pattern_kwargs=None,
+                 namespace=None, **kwargs):
+        """Initialize the link.
+
+        :param href: The URL.
+        :type href: str
+
+        :param text: The text of the link. Defaults to the URL.
+        :type text: str
+
+        :param pattern_name: The name of the URL pattern, which is reversed (lazily) when ``href`` is not given.
+        :type pattern_name: str
+
+        :param pattern_args: Pattern arguments.
+        :type pattern_args: list
+
+        :param pattern_kwargs: Pattern keyword arguments.
+        :type pattern_kwargs: dict
+
+        :param namespace: The application namespace of the pattern.
+        :type namespace: str
+
+        """
+        if href is None and pattern_name is not None:
+            href = LazyURL(pattern_name, args=pattern_args, kwargs=pattern_kwargs, namespace=namespace)
 
-    def __init__(self, href, text=None, **kwargs):
         if text is not None:
             content = text
         else:
@@ -80,3 +187,89 @@ class Link(BaseHTML):
         kwargs['href'] = href
 
         super(Link, self).__init__(content, open_tag="a", **kwargs)
+
+    @classmethod
+    def from_template(cls, template, values, text=None, **kwargs):
+        """Create a link for each of a number of objects from a URL template, e.g. the view links of table rows.
+
+        :param template: The URL template. See ``htmgel.resolvers.URLTemplate``.
+        :type template: htmgel.resolvers.URLTemplate
+
+        :param values: The value of the varying argument for each link, e.g. primary keys.
+        :type values: collections.Iterable
+
+        :param text: The text of every link. Defaults to each URL.
+        :type text: str
+
+        :rtype: list[Link]
+
+        The pattern is reversed once, rather than once per link.
+
+        """
+        return [cls(href, text=text, **kwargs) for href in template.format_many(values)]
+
+    @property
+    def url(self):
+        """Get the URL of the link, reversing the pattern if necessary.
+
+        :rtype: str | None
+
+        """
+        href = self._attributes.get("href")
+        if href is None:
+            return None
+
+        return str(href)
+
+# Functions
+
+
+def flatten_attributes(attributes):
+    """Get the attributes of an element as a string.
+
+    :param attributes: The attribute names and values.
+    :type attributes: dict
+
+    :rtype: str
+
+    When all of the values are simple types (strings, numbers, booleans, or ``None``) the output is shared by all
+    elements with identical attributes, so each distinct set of attributes is only flattened once. The output is
+    identical to that of ``flatatt()``.
+
+    """
+    if not attributes:
+        return _flatten_items(())
+
+    items = list()
+    for name, value in attributes.items():
+        if not isinstance(value, INTERNABLE_TYPES):
+            return flatatt(attributes)
+
+        # The type is part of the key because True == 1, but they are not rendered the same.
+        items.append((name, value, type(value)))
+
+    return _flatten_items(tuple(items))
+
+
+def get_class_attribute(*names):
+    """Get the class attribute of an element with the given class names, some of which may be empty.
+
+    :param names: The class names.
+    :type names: str
+
+    :rtype: str
+    :returns: The attribute with a leading space, e.g. ``class="nav-item active"``, or an empty string when there are
+              no class names.
+
+    """
+    names = " ".join(n for n in names if n)
+    if not names:
+        return ""
+
+    return format_html(' class="{}"', names)
+
+
+@lru_cache(maxsize=1024)
+def _flatten_items(items):
+    """Flatten the attributes given as ``(name, value, type)`` items."""
+    return flatatt(dict([(name, value) for name, value, _type in items]))
@@ -0,0 +1,304 @@
+# Imports
+
+from collections import OrderedDict
+from django.urls import get_resolver, get_script_prefix, get_urlconf
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+from django.utils.translation import get_language
+from threading import Lock
+from ..frameworks import get_framework
+from ..resolvers import reverse_url
+from .html import get_class_attribute
+
+# Exports
+
+__all__ = (
+    "Menu",
+    "MenuItem",
+)
+
+# Constants
+
+MENU_CSS = {
+    'bootstrap3': {
+        'active': "active",
+        'item': "",
+        'link': "",
+        'menu': "nav navbar-nav",
+    },
+    'bootstrap4': {
+        'active': "active",
+        'item': "nav-item",
+        'link': "nav-link",
+        'menu': "navbar-nav",
+    },
+    'foundation6': {
+        'active': "is-active",
+        'item': "",
+        'link': "",
+        'menu': "menu",
+    },
+}
+"""The CSS classes used to render menus with each framework."""
+
+DEFAULT_MENU_CSS = MENU_CSS['bootstrap3']
+
+MAX_RENDERED_MENUS = 64
+"""The number of renderings of a menu (one for each framework, language, URL configuration and set of permissions) that
+are kept, after which the least recently used are discarded."""
+
+# Classes
+
+
+class MenuItem(object):
+    """An item (link) of a menu."""
+
+    __slots__ = (
+        "name",
+        "pattern_name",
+        "permissions",
+        "title",
+        "_url",
+    )
+
+    def __init__(self, title, url=None, pattern_name=None, name=None, permissions=None):
+        """Initialize the item.
+
+        :param title: The text of the link.
+        :type title: str
+
+        :param url: The URL of the link.
+        :type url: str
+
+        :param pattern_name: The name of the URL pattern, which is reversed when a URL is not given.
+        :type pattern_name: str
+
+        :param name: The name that identifies the item as active. Defaults to the pattern name.
+        :type name: str
+
+        :param permissions: The permission (or permissions) that a user must have to see the item.
+        :type permissions: str | list[str]
+
+        """
+        if isinstance(permissions, str):
+            permissions = (permissions,)
+
+        self.name = name or pattern_name
+        self.pattern_name = pattern_name
+        self.permissions = tuple(permissions or ())
+        self.title = title
+        self._url = url
+
+    def __repr__(self):
+        return "<%s %s>" % (self.__class__.__name__, self.title)
+
+    @property
+    def url(self):
+        """Get the URL of the item.
+
+        :rtype: str
+
+        """
+        if self._url is None and self.pattern_name is not None:
+            return reverse_url(self.pattern_name)
+
+        return self._url
+
+
+class Menu(object):
+    """A menu that is defined once (e.g. in a module) and rendered for each request.
+
+    The items are rendered to HTML once. Each user's permissions are checked once per distinct permission, using an
+    index of the permissions required by the items, and the visible items are cached for each set of permissions along
+    with the framework, language and URL configuration. At most ``MAX_RENDERED_MENUS`` renderings are kept.
+
+    """
+
+    def __init__(self, items=None, framework=None):
+        """Initialize the menu.
+
+        :param items: The menu items.
+        :type items: list[MenuItem]
+
+        :param framework: The HTML framework whose CSS classes are used. Defaults to the framework in use.
+        :type framework: str
+
+        """
+        self.framework = framework
+        self.items = list(items or ())
+
+        self._cache = OrderedDict()
+        self._has_patterns = None
+        self._lock = Lock()
+        self._permissions = None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    @classmethod
+    def from_items(cls, menu_items, framework=None):
+        """Create a menu from the lists given to the ``menu_items`` component.
+
+        :param menu_items: Lists (or tuples) of title, URL, name, and the permission required.
+        :type menu_items: list
+
+        :rtype: Menu
+
+        """
+        items = [MenuItem(title, url=url, name=name, permissions=permission)
+                 for title, url, name, permission in menu_items]
+
+        return cls(items, framework=framework)
+
+    def add(self, title, url=None, **kwargs):
+        """Add an item to the menu. See ``MenuItem``.
+
+        :rtype: MenuItem
+
+        """
+        item = MenuItem(title, url=url, **kwargs)
+        self.items.append(item)
+        self.clear()
+
+        return item
+
+    def clear(self):
+        """Remove the rendered items, e.g. after the items are changed."""
+        with self._lock:
+            self._cache.clear()
+
+        self._has_patterns = None
+        self._permissions = None
+
+    def get_permissions(self, user):
+        """Get the permissions of a user that are required by the items of the menu.
+
+        :param user: The user. ``None`` has no permissions.
+
+        :rtype: frozenset
+
+        """
+        if self._permissions is None:
+            self._index()
+
+        if user is None or not self._permissions:
+            return frozenset()
+
+        return frozenset(p for p in self._permissions if user.has_perm(p))
+
+    def get_visible_items(self, user=None):
+        """Get the items that a user may see.
+
+        :param user: The user.
+
+        :rtype: list[MenuItem]
+
+        """
+        permissions = self.get_permissions(user)
+
+        return [item for item in self.items if permissions.issuperset(item.permissions)]
+
+    def render(self, user=None, active=None):
+        """Render the menu.
+
+        :param user: The current user, whose permissions determine which items are shown.
+
+        :param active: The name of the active item, e.g. the URL name of the current view.
+        :type active: str | list[str]
+
+        :rtype: str
+
+        """
+        fragments, active_fragments, positions, prefix, suffix = self._get_fragments(self.get_permissions(user))
+
+        if isinstance(active, str):
+            active = (active,)
+
+        for name in active or ():
+            position = positions.get(name)
+            if position is not None:
+                fragments = list(fragments)
+                fragments[position] = active_fragments[position]
+                break
+
+        return mark_safe(prefix + "".join(fragments) + suffix)
+
+    def render_request(self, request):
+        """Render the menu for the user of a request, with the item of the current view marked as active.
+
+        :param request: The current request.
+        :type request: django.http.HttpRequest
+
+        :rtype: str
+
+        """
+        match = getattr(request, "resolver_match", None)
+        active = (match.view_name, match.url_name) if match is not None else None
+
+        return self.render(user=getattr(request, "user", None), active=active)
+
+    def _get_fragments(self, permissions):
+        """Get the rendered items that are visible with the given permissions."""
+        framework = self.framework or get_framework()
+
+        # Rendered items depend on the language and the URLs of patterns, so each is rendered separately.
+        key = (permissions, framework, get_language())
+        if self._has_patterns:
+            urlconf = get_urlconf()
+            key += (urlconf, get_script_prefix(), get_resolver(urlconf))
+
+        with self._lock:
+            try:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+            except KeyError:
+                pass
+
+        css = MENU_CSS.get(framework, DEFAULT_MENU_CSS)
+        item_class = get_class_attribute(css['item'])
+        active_class = get_class_attribute(css['item'], css['active'])
+
+        fragments = list()
+        active_fragments = list()
+        positions = dict()
+        for item in self.items:
+            if not permissions.issuperset(item.permissions):
+                continue
+
+            if item.name is not None:
+                positions.setdefault(item.name, len(fragments))
+
+            link = _render_link(item, css['link'])
+            fragments.append("<li%s>%s</li>" % (item_class, link))
+            active_fragments.append("<li%s>%s</li>" % (active_class, link))
+
+        result = (
+            tuple(fragments),
+            tuple(active_fragments),
+            positions,
+            "<ul%s>" % get_class_attribute(css['menu']),
+            "</ul>",
+        )
+
+        with self._lock:
+            self._cache[key] = result
+
+            while len(self._cache) > MAX_RENDERED_MENUS:
+                self._cache.popitem(last=False)
+
+        return result
+
+    def _index(self):
+        """Collect the permissions required by the items, and whether any item has a URL pattern."""
+        self._has_patterns = any(item._url is None and item.pattern_name for item in self.items)
+        self._permissions = frozenset(p for item in self.items for p in item.permissions)
+
+# Functions
+
+
+def _render_link(item, link_class):
+    """Render the link of a menu item."""
+    return format_html('<a{} href="{}">{}</a>', get_class_attribute(link_class), item.url, item.title)
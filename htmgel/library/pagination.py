@@ -0,0 +1,574 @@
+# Imports
+
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import EmptyPage
+from django.db import DatabaseError, connections
+from django.utils.html import escape
+from django.utils.http import urlencode
+from django.utils.safestring import mark_safe
+from django.utils.translation import gettext
+import hashlib
+from math import ceil
+from ..frameworks import get_framework
+from .html import get_class_attribute
+
+# Exports
+
+__all__ = (
+    "COUNT_CACHED",
+    "COUNT_ESTIMATE",
+    "COUNT_EXACT",
+    "Pagination",
+    "get_cached_count",
+    "get_estimated_count",
+    "get_page_range",
+)
+
+# Constants
+
+COUNT_CACHED = "cached"
+"""Count the records and cache the result for ``count_timeout`` seconds."""
+
+COUNT_ESTIMATE = "estimate"
+"""Estimate the number of records from the statistics kept by the database, or use a cached count when there are no
+statistics (e.g. for filtered querysets)."""
+
+COUNT_EXACT = "exact"
+"""Count the records for every page, as Django's paginator does."""
+
+DEFAULT_COUNT_TIMEOUT = 300
+"""The number of seconds that a cached count is kept."""
+
+DEFAULT_PAGE_SIZE = 25
+
+ESTIMATE_THRESHOLD = 10000
+"""Tables that are estimated to hold fewer records than this are counted exactly, which is cheap."""
+
+PAGINATION_CSS = {
+    'bootstrap3': {
+        'active': "active",
+        'disabled': "disabled",
+        'ellipsis': "disabled",
+        'item': "",
+        'link': "",
+        'list': "pagination",
+    },
+    'bootstrap4': {
+        'active': "active",
+        'disabled': "disabled",
+        'ellipsis': "disabled",
+        'item': "page-item",
+        'link': "page-link",
+        'list': "pagination",
+    },
+    'foundation6': {
+        'active': "current",
+        'disabled': "disabled",
+        'ellipsis': "ellipsis",
+        'item': "",
+        'link': "",
+        'list': "pagination",
+    },
+}
+"""The CSS classes used to render page links with each framework."""
+
+DEFAULT_PAGINATION_CSS = PAGINATION_CSS['bootstrap3']
+
+# Classes
+
+
+class Pagination(object):
+    """One page of a queryset, with a windowed range of page links.
+
+    Unlike Django's ``Page``, the records are never counted on every request. One record more than the page size is
+    fetched to determine whether there is a next page, and the number of pages is only as exact as the ``count`` mode:
+
+    - ``None``: the records are not counted. Only the pages up to the next page are linked.
+    - ``COUNT_CACHED``: the records are counted once and the count is cached for ``count_timeout`` seconds.
+    - ``COUNT_ESTIMATE``: the number of records is estimated from database statistics. See ``get_estimated_count()``.
+    - ``COUNT_EXACT``: the records are counted for every page.
+
+    The pagination provides the page interface used by the ``pagination.html`` template, so it may be passed as
+    ``objects``. It may also render its own links with ``to_html()``, in which case the number of links is the same
+    for every page no matter how many pages there are.
+
+    """
+
+    def __init__(self, queryset, page=1, page_size=DEFAULT_PAGE_SIZE, count=COUNT_ESTIMATE,
+                 count_timeout=DEFAULT_COUNT_TIMEOUT, cache_alias="default", margin=1, parameter="page", query=None,
+                 window=2):
+        """Initialize the pagination.
+
+        :param queryset: The records to paginate. The queryset should be ordered.
+        :type queryset: django.db.models.QuerySet
+
+        :param page: The current page number. Invalid numbers are treated as the first page, and numbers past the
+                     last page as the last page.
+        :type page: int | str
+
+        :param page_size: The number of records on each page.
+        :type page_size: int
+
+        :param count: The count mode: ``COUNT_CACHED``, ``COUNT_ESTIMATE``, ``COUNT_EXACT``, or ``None``.
+        :type count: str
+
+        :param count_timeout: The number of seconds that a cached count is kept.
+        :type count_timeout: int
+
+        :param cache_alias: The Django cache in which counts are kept.
+        :type cache_alias: str
+
+        :param margin: The number of pages linked at the start and end of the range.
+        :type margin: int
+
+        :param parameter: The name of the query parameter that holds the page number.
+        :type parameter: str
+
+        :param query: The query parameters that are kept in page links, e.g. ``request.GET``.
+        :type query: dict | django.http.QueryDict
+
+        :param window: The number of pages linked on either side of the current page.
+        :type window: int
+
+        """
+        self.cache_alias = cache_alias
+        self.count_mode = count
+        self.count_timeout = count_timeout
+        self.margin = margin
+        self.page_size = page_size
+        self.parameter = parameter
+        self.queryset = queryset
+        self.window = window
+
+        try:
+            self.number = max(int(page), 1)
+        except (TypeError, ValueError):
+            self.number = 1
+
+        self._count = None
+        self._has_next = False
+        self._is_estimated = False
+        self._object_list = None
+        self._url_prefix = _get_url_prefix(query, parameter)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __repr__(self):
+        return "<%s %s>" % (self.__class__.__name__, self.number)
+
+    def __str__(self):
+        return self.to_html()
+
+    @classmethod
+    def from_request(cls, request, queryset, **kwargs):
+        """Create the pagination for the page number given in a request.
+
+        :param request: The current request.
+        :type request: django.http.HttpRequest
+
+        :param queryset: The records to paginate.
+        :type queryset: django.db.models.QuerySet
+
+        :rtype: Pagination
+
+        """
+        parameter = kwargs.get("parameter", "page")
+        kwargs.setdefault("query", request.GET)
+
+        return cls(queryset, page=request.GET.get(parameter, 1), **kwargs)
+
+    @property
+    def count(self):
+        """Get the number of records. See ``is_estimated``.
+
+        :rtype: int | None
+        :returns: ``None`` when the records are not counted.
+
+        """
+        if self._count is None and self.count_mode is not None:
+            self._count = self.get_count()
+
+        return self._count
+
+    @property
+    def is_estimated(self):
+        """Indicates whether the count is an estimate.
+
+        :rtype: bool
+
+        """
+        self.count
+
+        return self._is_estimated
+
+    @property
+    def num_pages(self):
+        """Get the number of pages. An estimate is corrected by what is known from the current page: the next page
+        exists when a record was fetched for it, and otherwise the current page is the last.
+
+        :rtype: int | None
+        :returns: ``None`` when the records are not counted.
+
+        """
+        count = self.count
+        if count is None:
+            return None
+
+        pages = max(int(ceil(count / float(self.page_size))), 1)
+        if self.has_next():
+            return max(pages, self.number + 1)
+
+        if self.object_list:
+            return self.number
+
+        return pages
+
+    @property
+    def object_list(self):
+        """Get the records of the current page. They are fetched once, along with one more record to determine whether
+        there is a next page.
+
+        :rtype: list
+
+        When the page is past the end (e.g. a link to a page that no longer exists), the records are counted and the
+        page number is changed to that of the last page, whose records are fetched instead.
+
+        """
+        if self._object_list is None:
+            records = self._get_records()
+
+            if not records and self.number > 1:
+                count = self.queryset.count()
+                if self.count_mode is not None:
+                    self._count = count
+                    self._is_estimated = False
+
+                self.number = max(int(ceil(count / float(self.page_size))), 1)
+                records = self._get_records()
+
+            self._has_next = len(records) > self.page_size
+            self._object_list = records[:self.page_size]
+
+        return self._object_list
+
+    @property
+    def page_range(self):
+        """Get the page numbers to link, with ``None`` for the gaps. See ``get_page_range()``.
+
+        :rtype: list[int | None]
+
+        """
+        num_pages = self.num_pages
+        if num_pages is None:
+            last = self.number + 1 if self.has_next() else self.number
+            return get_page_range(self.number, last, margin=self.margin, window=self.window, show_last=False)
+
+        return get_page_range(self.number, num_pages, margin=self.margin, window=self.window)
+
+    def end_index(self):
+        """Get the 1-based index of the last record on the page.
+
+        :rtype: int
+
+        """
+        count = len(self.object_list)
+
+        return (self.number - 1) * self.page_size + count
+
+    def get_count(self):
+        """Count (or estimate) the number of records according to the count mode.
+
+        :rtype: int
+
+        """
+        self._is_estimated = False
+
+        if self.count_mode == COUNT_EXACT:
+            return self.queryset.count()
+
+        if self.count_mode == COUNT_ESTIMATE:
+            estimate = get_estimated_count(self.queryset)
+            if estimate is not None:
+                if estimate < ESTIMATE_THRESHOLD:
+                    return self.queryset.count()
+
+                self._is_estimated = True
+                return estimate
+
+        if self.count_mode in (COUNT_CACHED, COUNT_ESTIMATE):
+            return get_cached_count(self.queryset, timeout=self.count_timeout, alias=self.cache_alias)
+
+        raise ValueError("Unknown count mode: %s" % self.count_mode)
+
+    def get_url(self, number):
+        """Get the URL (query string) of a page, keeping the other query parameters.
+
+        :param number: The page number.
+        :type number: int
+
+        :rtype: str
+
+        """
+        return "%s%s" % (self._url_prefix, number)
+
+    def has_next(self):
+        """Indicates whether there is a page after the current page.
+
+        :rtype: bool
+
+        """
+        self.object_list
+
+        return self._has_next
+
+    def has_other_pages(self):
+        return self.has_previous() or self.has_next()
+
+    def has_previous(self):
+        """Indicates whether there is a page before the current page.
+
+        :rtype: bool
+
+        """
+        # The page number is only final once the records have been fetched.
+        self.object_list
+
+        return self.number > 1
+
+    def iter_html(self, framework=None):
+        """Iterate over the HTML of the page links.
+
+        :param framework: The HTML framework whose CSS classes are used. Defaults to the framework in use.
+        :type framework: str
+
+        :rtype: collections.Iterator[str]
+
+        """
+        css = PAGINATION_CSS.get(framework or get_framework(), DEFAULT_PAGINATION_CSS)
+
+        item = get_class_attribute(css['item'])
+        active = get_class_attribute(css['item'], css['active'])
+        disabled = get_class_attribute(css['item'], css['disabled'])
+        ellipsis = get_class_attribute(css['item'], css['ellipsis'])
+        link = get_class_attribute(css['link'])
+
+        # Every link shares the same (escaped) prefix, so only the page number is filled in for each.
+        prefix = escape(self._url_prefix).replace("%", "%%")
+        link_template = '<li%s><a%s href="%s%%s">%%s</a></li>' % (item, link, prefix)
+        current_template = '<li%s><span%s>%%s</span></li>' % (active, link)
+        disabled_template = '<li%s><span%s>%%s</span></li>' % (disabled, link)
+
+        previous_text = "&laquo; %s" % escape(gettext("Previous"))
+        next_text = "%s &raquo;" % escape(gettext("Next"))
+
+        yield '<ul%s>' % get_class_attribute(css['list'])
+
+        if self.has_previous():
+            yield link_template % (self.number - 1, previous_text)
+        else:
+            yield disabled_template % previous_text
+
+        for number in self.page_range:
+            if number is None:
+                yield '<li%s><span%s>&hellip;</span></li>' % (ellipsis, link)
+            elif number == self.number:
+                yield current_template % number
+            else:
+                yield link_template % (number, number)
+
+        if self.has_next():
+            yield link_template % (self.number + 1, next_text)
+        else:
+            yield disabled_template % next_text
+
+        yield "</ul>"
+
+    def next_page_number(self):
+        if not self.has_next():
+            raise EmptyPage(gettext("That page contains no results"))
+
+        return self.number + 1
+
+    def previous_page_number(self):
+        if not self.has_previous():
+            raise EmptyPage(gettext("That page number is less than 1"))
+
+        return self.number - 1
+
+    def start_index(self):
+        """Get the 1-based index of the first record on the page.
+
+        :rtype: int
+
+        """
+        if not self.object_list:
+            return 0
+
+        return (self.number - 1) * self.page_size + 1
+
+    @mark_safe
+    def to_html(self, framework=None):
+        return "".join(self.iter_html(framework=framework))
+
+    def _get_records(self):
+        """Fetch the records of the current page, along with the first record of the next page."""
+        offset = (self.number - 1) * self.page_size
+
+        return list(self.queryset[offset:offset + self.page_size + 1])
+
+# Functions
+
+
+def get_cached_count(queryset, timeout=DEFAULT_COUNT_TIMEOUT, alias="default"):
+    """Count the records of a queryset, using a count cached by a previous call with the same query.
+
+    :param queryset: The records to count.
+    :type queryset: django.db.models.QuerySet
+
+    :param timeout: The number of seconds that the count is kept.
+    :type timeout: int
+
+    :param alias: The Django cache in which the count is kept.
+    :type alias: str
+
+    :rtype: int
+
+    """
+    try:
+        sql, params = queryset.query.get_compiler(queryset.db).as_sql()
+    except EmptyResultSet:
+        return 0
+
+    digest = hashlib.md5(("%s:%s:%r" % (queryset.db, sql, params)).encode("utf-8")).hexdigest()
+    key = "htmgel.pagination.count.%s" % digest
+
+    cache = caches[alias]
+
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, timeout)
+
+    return count
+
+
+def get_estimated_count(queryset):
+    """Estimate the number of records in a queryset from the statistics kept by the database.
+
+    :param queryset: The records to count.
+    :type queryset: django.db.models.QuerySet
+
+    :rtype: int | None
+    :returns: ``None`` when the queryset is filtered (or sliced, or distinct), or the database has no statistics for
+              the table.
+
+    Statistics are read from ``pg_class.reltuples`` on PostgreSQL, ``information_schema.tables`` on MySQL, and
+    ``sqlite_stat1`` on SQLite, where they exist once ``ANALYZE`` has been run.
+
+    """
+    query = queryset.query
+    if query.has_filters() or query.is_sliced or query.distinct or query.combinator:
+        return None
+
+    connection = connections[queryset.db]
+    table = queryset.model._meta.db_table
+
+    if connection.vendor == "postgresql":
+        sql = "SELECT reltuples FROM pg_class WHERE oid = to_regclass(%s)"
+        params = [connection.ops.quote_name(table)]
+    elif connection.vendor == "mysql":
+        sql = "SELECT table_rows FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = %s"
+        params = [table]
+    elif connection.vendor == "sqlite":
+        sql = "SELECT stat FROM sqlite_stat1 WHERE tbl = %s ORDER BY idx IS NOT NULL LIMIT 1"
+        params = [table]
+    else:
+        return None
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+    except DatabaseError:
+        return None
+
+    if row is None or row[0] is None:
+        return None
+
+    # sqlite_stat1 holds the number of rows followed by the average number of rows per distinct index value.
+    value = row[0].split()[0] if isinstance(row[0], str) else row[0]
+
+    try:
+        estimate = int(float(value))
+    except ValueError:
+        return None
+
+    # PostgreSQL reports -1 for tables that have never been analyzed.
+    if estimate < 0:
+        return None
+
+    return estimate
+
+
+def get_page_range(number, num_pages, margin=1, window=2, show_last=True):
+    """Get the page numbers to link: the first and last pages, and those either side of the current page.
+
+    :param number: The current page number.
+    :type number: int
+
+    :param num_pages: The number of pages.
+    :type num_pages: int
+
+    :param margin: The number of pages linked at the start and end of the range.
+    :type margin: int
+
+    :param window: The number of pages linked on either side of the current page.
+    :type window: int
+
+    :param show_last: Whether to link the pages at the end of the range, e.g. ``False`` when the last page is unknown.
+    :type show_last: bool
+
+    :rtype: list[int | None]
+    :returns: The page numbers in order, with ``None`` where pages are skipped. A gap of one page is filled with that
+              page rather than ``None``.
+
+    """
+    pages = set(range(1, min(margin, num_pages) + 1))
+    pages.update(range(max(number - window, 1), min(number + window, num_pages) + 1))
+
+    if show_last:
+        pages.update(range(max(num_pages - margin + 1, 1), num_pages + 1))
+
+    result = list()
+    previous = 0
+    for page in sorted(pages):
+        if page - previous == 2:
+            result.append(page - 1)
+        elif page - previous > 2:
+            result.append(None)
+
+        result.append(page)
+        previous = page
+
+    return result
+
+
+def _get_url_prefix(query, parameter):
+    """Get the start of page URLs, to which the page number is appended."""
+    if not query:
+        return "?%s=" % parameter
+
+    if hasattr(query, "lists"):
+        items = [(k, v) for k, values in query.lists() if k != parameter for v in values]
+    else:
+        items = [(k, v) for k, v in query.items() if k != parameter]
+
+    if not items:
+        return "?%s=" % parameter
+
+    return "?%s&%s=" % (urlencode(items), parameter)
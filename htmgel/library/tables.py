@@ -1,15 +1,104 @@
 # Imports
 
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import EmptyPage, InvalidPage
+from django.http import StreamingHttpResponse
+from django.utils.html import conditional_escape, escape
 from django.utils.safestring import mark_safe
-from .html import BaseHTML
+from ..currency import format_currency_many
+from ..frameworks import get_framework
+from ..icons import render_icon
+from ..resolvers import URLTemplate
+from .html import EMPTY_ATTRIBUTES, BaseHTML, flatten_attributes
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Exports
+
+__all__ = (
+    "ActionColumn",
+    "Column",
+    "ColumnarTable",
+    "QuerysetTable",
+    "Row",
+    "SimpleRow",
+    "Table",
+    "compile_row_renderer",
+    "format_currency_column",
+    "format_date_column",
+    "format_number_column",
+)
+
+# Constants
+
+ACTION_CSS = {
+    'bootstrap3': "btn btn-default btn-xs",
+    'bootstrap4': "btn btn-outline-secondary btn-sm",
+    'foundation6': "button hollow tiny",
+}
+"""The CSS classes of action buttons with each framework."""
+
+DEFAULT_ACTION_CSS = ACTION_CSS['bootstrap3']
+
+DEFAULT_BATCH_SIZE = 100
+"""The number of rows rendered into each chunk when streaming a table."""
+
+DEFAULT_CHUNK_SIZE = 2000
+"""The number of records fetched from the database at a time when streaming a queryset."""
+
+LOOKUP_SEP = "__"
+
+_EMPTY = ""
 
 # Classes
 
 
 class Column(BaseHTML):
-    """A column (header) in an HTML table."""
+    """A column (header) in an HTML table.
+
+    Keyword arguments are the attributes of the header. The ``attrs``, ``escape``, and ``formatter`` options control
+    how the column's cells are rendered.
+
+    A hidden column holds data (e.g. the primary key used by an ``ActionColumn``) but is not rendered.
+
+    """
+
+    __slots__ = (
+        "cell_attributes",
+        "escape",
+        "formatter",
+        "hidden",
+        "name",
+    )
+
+    has_data = True
+    """Indicates whether rows hold a value for the column."""
+
+    def __init__(self, name, title=None, attrs=None, escape=True, formatter=None, hidden=False, **kwargs):
+        """Initialize the column.
+
+        :param name: The column name.
+        :type name: str
+
+        :param title: The column title. Defaults to the name.
+        :type title: str
+
+        :param attrs: The attributes of each cell in the column.
+        :type attrs: dict
+
+        :param escape: Indicates whether cell values are escaped. Safe strings are never escaped.
+        :type escape: bool
+
+        :param formatter: A callable that accepts the value of a cell and returns the value to be displayed.
+        :type formatter: callable
+
+        :param hidden: Indicates whether the column is hidden.
+        :type hidden: bool
 
-    def __init__(self, name, title=None, **kwargs):
+        """
         if title is not None:
             content = title
         else:
@@ -17,9 +106,32 @@ class Column(BaseHTML):
 
         super(Column, self).__init__(content, **kwargs)
 
+        self.cell_attributes = attrs or EMPTY_ATTRIBUTES
+        self.escape = escape
+        self.formatter = formatter
+        self.hidden = hidden
         self.name = name
         self._open_tag = "th"
 
+    def get_cell_converter(self):
+        """Get the callable that converts the value of a cell to its output.
+
+        :rtype: callable
+
+        """
+        formatter = self.formatter
+
+        if formatter is None:
+            if self.escape:
+                return conditional_escape
+
+            return str
+
+        if self.escape:
+            return lambda value: conditional_escape(formatter(value))
+
+        return lambda value: str(formatter(value))
+
     @property
     def label(self):
         return self.content
@@ -29,9 +141,112 @@ class Column(BaseHTML):
         return self.content
 
 
+class ActionColumn(Column):
+    """A column of buttons that link to a URL pattern for each row, e.g. to view, edit, or delete the row's record.
+
+    Rows do not hold a value for the column. The URL is formatted from the value of the ``key`` column of each row,
+    using a ``URLTemplate``, so the pattern is reversed once per table rather than once per row.
+
+    """
+
+    __slots__ = (
+        "button_class",
+        "framework",
+        "icon",
+        "key",
+        "template",
+        "text",
+    )
+
+    has_data = False
+
+    def __init__(self, url_name, text=None, icon=None, key="pk", pattern_key="pk", pattern_args=None,
+                 pattern_kwargs=None, namespace=None, button_class=None, framework=None, title="", **kwargs):
+        """Initialize the column.
+
+        :param url_name: The name of the URL pattern.
+        :type url_name: str
+
+        :param text: The text of the button.
+        :type text: str
+
+        :param icon: The name of the icon shown on the button.
+        :type icon: str
+
+        :param key: The name of the column whose value identifies the record of each row.
+        :type key: str
+
+        :param pattern_key: The keyword argument (or the index of the positional argument) of the pattern that is given
+                            the key.
+        :type pattern_key: str | int
+
+        :param pattern_args: The other positional arguments of the pattern.
+        :type pattern_args: list
+
+        :param pattern_kwargs: The other keyword arguments of the pattern.
+        :type pattern_kwargs: dict
+
+        :param namespace: The application namespace of the pattern.
+        :type namespace: str
+
+        :param button_class: The CSS classes of the button. Defaults to those of the HTML framework.
+        :type button_class: str
+
+        :param framework: The HTML framework. Defaults to the framework in use.
+        :type framework: str
+
+        :param title: The column title.
+        :type title: str
+
+        """
+        super(ActionColumn, self).__init__(url_name, title=title, escape=False, **kwargs)
+
+        self.button_class = button_class
+        self.framework = framework
+        self.icon = icon
+        self.key = key
+        self.template = URLTemplate(url_name, key=pattern_key, args=pattern_args, kwargs=pattern_kwargs,
+                                    namespace=namespace)
+        self.text = text
+
+    def get_button_html(self):
+        """Get the HTML of the button with a placeholder (``%s``) for the URL.
+
+        :rtype: str
+
+        """
+        button_class = self.button_class
+        if button_class is None:
+            button_class = ACTION_CSS.get(self.framework or get_framework(), DEFAULT_ACTION_CSS)
+
+        content = list()
+        if self.icon is not None:
+            content.append(render_icon(self.icon))
+
+        if self.text is not None:
+            content.append(escape(self.text))
+
+        attributes = flatten_attributes({'class': button_class}).replace("%", "%%")
+
+        return '<a%s href="%%s">%s</a>' % (attributes, " ".join(content).replace("%", "%%"))
+
+    def get_cell_converter(self):
+        """Get the callable that converts the key of a row to the button.
+
+        :rtype: callable
+
+        """
+        button = self.get_button_html()
+        get_url = self.template.get_formatter()
+
+        return lambda value: button % escape(get_url(value))
+
+
 class Row(BaseHTML):
     """A row in an HTML table."""
 
+    __slots__ = ()
+
     def __init__(self, data, **kwargs):
         super(Row, self).__init__(data, **kwargs)
         self._open_tag = "tr"
@@ -42,14 +257,46 @@ class Row(BaseHTML):
 
     @mark_safe
     def to_html(self):
-        a = list()
-        a.append("<%s>" % self.get_open_tag())
-        for d in self.content:
-            a.append("<td>%s</td>" % d)
+        return _render_row(self.get_open_tag(), self.get_close_tag(), self.content)
+
+
+class SimpleRow(tuple):
+    """A row without attributes, which is stored as a tuple of its data.
+
+    This is used by ``Table.add_rows()`` and ``QuerysetTable``, because it takes a fraction of the memory used by
+    ``Row``. Unlike ``Row``, it may not be changed once created.
 
-        a.append("</%s>" % self.get_close_tag())
+    """
 
-        return "\n".join(a)
+    __slots__ = ()
+
+    def __repr__(self):
+        return "<%s tr>" % self.__class__.__name__
+
+    def __str__(self):
+        return self.to_html()
+
+    @property
+    def attributes(self):
+        return ""
+
+    @property
+    def content(self):
+        return tuple(self)
+
+    @property
+    def data(self):
+        return tuple(self)
+
+    def get_close_tag(self):
+        return "tr"
+
+    def get_open_tag(self):
+        return "tr"
+
+    @mark_safe
+    def to_html(self):
+        return _render_row("tr", "tr", self)
 
 
 class Table(BaseHTML):
@@ -65,6 +312,34 @@ class Table(BaseHTML):
     def __iter__(self):
         return iter(self.rows)
 
+    def add_action_column(self, url_name, text=None, icon=None, key="pk", **kwargs):
+        """Add a column of buttons that link to a URL pattern for each row. See ``ActionColumn``.
+
+        :param url_name: The name of the URL pattern, which is given the key of each row.
+        :type url_name: str
+
+        :param text: The text of the button.
+        :type text: str
+
+        :param icon: The name of the icon shown on the button.
+        :type icon: str
+
+        :param key: The name of the column whose value identifies the record of each row. A hidden column is added when
+                    the table does not have one, in which case rows should include its value after those of the
+                    existing columns.
+        :type key: str
+
+        :rtype: ActionColumn
+
+        """
+        if key not in [c.name for c in self.get_data_columns()]:
+            self.add_column(key, hidden=True)
+
+        column = ActionColumn(url_name, text=text, icon=icon, key=key, **kwargs)
+        self.columns.append(column)
+
+        return column
+
     def add_column(self, name, title=None, **kwargs):
         column = Column(name, title=title, **kwargs)
         self.columns.append(column)
@@ -77,8 +352,37 @@ class Table(BaseHTML):
 
         return row
 
-    @mark_safe
-    def to_html(self):
+    def add_rows(self, rows):
+        """Add rows without attributes, which are stored as ``SimpleRow``.
+
+        :param rows: The data of each row.
+        :type rows: collections.Iterable[list | tuple]
+
+        Use ``add_row()`` for rows that have attributes or are changed after they are added.
+
+        """
+        self.rows.extend([SimpleRow(data) for data in rows])
+
+    def get_data_columns(self):
+        """Get the columns for which rows hold a value, in the order of the values.
+
+        :rtype: list[Column]
+
+        """
+        return [c for c in self.columns if c.has_data]
+
+    def iter_html(self, batch_size=DEFAULT_BATCH_SIZE):
+        """Iterate over the HTML of the table in chunks.
+
+        :param batch_size: The number of rows to include in each chunk.
+        :type batch_size: int
+
+        :rtype: collections.Iterator[str]
+
+        The opening tag, caption, and header are yielded first, followed by batches of rows, and finally the closing
+        tags. Joining the chunks produces the same output as ``to_html()``.
+
+        """
         a = list()
         a.append("<%s>" % self.get_open_tag())
 
@@ -88,45 +392,791 @@ class Table(BaseHTML):
 
         a.append("<thead><tr>")
         for column in self.columns:
-            a.append(column.to_html())
+            if not column.hidden:
+                a.append(column.to_html())
         a.append("</tr></thead>")
 
         a.append("<tbody>")
 
-        for row in self.rows:
-            a.append(row.to_html())
+        yield "\n".join(a) + "\n"
+
+        render = compile_row_renderer(self.columns)
+
+        batch = list()
+        for row in self.iter_rows():
+            batch.append(render(row.get_open_tag(), row.get_close_tag(), row.data))
+
+            if len(batch) >= batch_size:
+                yield "\n".join(batch) + "\n"
+                batch = list()
+
+        if batch:
+            yield "\n".join(batch) + "\n"
+
+        yield "</tbody>\n</%s>" % self.get_close_tag()
+
+    def iter_rows(self):
+        """Iterate over the rows to be rendered.
 
-        a.append("</tbody>")
+        :rtype: collections.Iterator[Row]
 
-        a.append("</%s>" % self.get_close_tag())
+        """
+        return iter(self.rows)
+
+    def stream(self, batch_size=DEFAULT_BATCH_SIZE, content_type="text/html"):
+        """Get a streaming response for the table.
+
+        :param batch_size: The number of rows to include in each chunk.
+        :type batch_size: int
 
-        return "\n".join(a)
+        :param content_type: The content type of the response.
+        :type content_type: str
+
+        :rtype: StreamingHttpResponse
+
+        """
+        return StreamingHttpResponse(self.iter_html(batch_size=batch_size), content_type=content_type)
+
+    @mark_safe
+    def to_html(self):
+        return "".join(self.iter_html())
 
 
 class QuerysetTable(Table):
+    """A table whose rows are created from a queryset.
+
+    When ``page_size`` is given, only one page of records is fetched. By default pages are selected by ``page`` number
+    using an offset. When ``order_by`` is given, keyset paging is used instead: records are ordered by that field and
+    only those after the ``cursor`` (the last value seen on the previous page) are fetched, so every page costs the
+    same to query. The ``order_by`` field should be unique.
+
+    Neither mode counts the records. Instead, one extra record is fetched to determine whether there is a next page,
+    so ``has_next()`` is only known once the rows have been loaded or rendered. With offset paging, the table provides
+    the page interface used by the ``pagination.html`` template, so it may be passed as ``objects``.
+
+    Keyset paging only moves forward: the next page is requested with ``next_cursor``, and there is no cursor for the
+    previous page, so ``has_previous()`` is always ``False``. Pages have no numbers, so ``next_page_number()`` raises
+    ``InvalidPage`` and the table may not be passed to ``pagination.html``; link to the next page using ``next_cursor``
+    instead.
 
-    def __init__(self, queryset, caption=None, columns=None, rows=None, **kwargs):
+    """
+
+    def __init__(self, queryset, caption=None, columns=None, rows=None, chunk_size=DEFAULT_CHUNK_SIZE, cursor=None,
+                 order_by=None, page=1, page_size=None, **kwargs):
         super(QuerysetTable, self).__init__(caption=caption, columns=columns, rows=rows, **kwargs)
 
+        self.chunk_size = chunk_size
+        self.cursor = cursor
         self.is_loaded = False
+        self.next_cursor = None
+        self.order_by = order_by
+        self.page_size = page_size
         self.queryset = queryset
 
+        try:
+            self.number = max(int(page), 1)
+        except (TypeError, ValueError):
+            self.number = 1
+
+        self._cursor_index = None
+        self._has_next = False
+
     def __iter__(self):
         if not self.is_loaded:
             self.load()
 
         return iter(self.rows)
 
+    def get_lookups(self):
+        """Get the ``values_list()`` lookups for the columns.
+
+        :rtype: list | None
+
+        ``None`` is returned when a column name is not a concrete field (or a ``__`` lookup that spans single-valued
+        relations) of the queryset's model. The table then falls back to loading model instances.
+
+        """
+        model = getattr(self.queryset, "model", None)
+        columns = self.get_data_columns()
+        if model is None or not columns:
+            return None
+
+        lookups = list()
+        for c in columns:
+            if not _is_field_lookup(model, c.name):
+                return None
+
+            lookups.append(c.name)
+
+        return lookups
+
+    def get_queryset(self):
+        """Get the queryset used to create rows.
+
+        :rtype: QuerySet
+
+        When every column is a field lookup, only those columns are selected using ``values_list()``. Otherwise, model
+        instances are loaded with ``select_related()`` for the relations that are traversed by the column names. The
+        result is limited to the current page when ``page_size`` is given.
+
+        """
+        queryset = self.queryset
+
+        if self.is_keyset:
+            queryset = queryset.order_by(self.order_by)
+
+            if self.cursor is not None:
+                if self.order_by.startswith("-"):
+                    lookup = "%s__lt" % self.order_by[1:]
+                else:
+                    lookup = "%s__gt" % self.order_by
+
+                queryset = queryset.filter(**{lookup: self.cursor})
+
+        self._cursor_index = None
+
+        lookups = self.get_lookups()
+        if lookups is not None:
+            if self.is_keyset:
+                field_name = self.order_by.lstrip("-")
+                if field_name not in lookups:
+                    lookups.append(field_name)
+
+                self._cursor_index = lookups.index(field_name)
+
+            queryset = queryset.values_list(*lookups)
+        else:
+            model = getattr(queryset, "model", None)
+            if model is not None:
+                related = list()
+                names = [c.name for c in self.get_data_columns()]
+                if self.is_keyset:
+                    # The cursor is read from the last record of the page.
+                    names.append(self.order_by.lstrip("-"))
+
+                for name in names:
+                    path = _get_related_path(model, name)
+                    if path and path not in related:
+                        related.append(path)
+
+                if related:
+                    queryset = queryset.select_related(*related)
+
+        if self.page_size is None:
+            return queryset
+
+        # One more record than the page size is fetched to determine whether there is a next page.
+        if self.is_keyset:
+            return queryset[:self.page_size + 1]
+
+        offset = (self.number - 1) * self.page_size
+
+        return queryset[offset:offset + self.page_size + 1]
+
+    def get_row_data(self, record):
+        """Get the values of the columns for a given record.
+
+        :param record: The model instance, or a tuple of values from ``values_list()``.
+
+        :rtype: list | tuple
+
+        """
+        columns = self.get_data_columns()
+
+        if isinstance(record, tuple):
+            if len(record) > len(columns):
+                return record[:len(columns)]
+
+            return record
+
+        return [_get_lookup_value(record, c.name) for c in columns]
+
+    def has_next(self):
+        """Indicates whether there is a page after the current page. This is only known once the rows have been loaded
+        or rendered, and is ``False`` before then.
+
+        :rtype: bool
+
+        """
+        return self._has_next
+
+    def has_other_pages(self):
+        return self.has_previous() or self.has_next()
+
+    def has_previous(self):
+        """Indicates whether there is a page before the current page. This is always ``False`` with keyset paging,
+        which has no cursor for the previous page.
+
+        :rtype: bool
+
+        """
+        if self.is_keyset:
+            return False
+
+        return self.number > 1
+
+    @property
+    def is_keyset(self):
+        """Indicates whether keyset paging is used.
+
+        :rtype: bool
+
+        """
+        return self.page_size is not None and self.order_by is not None
+
+    def iter_rows(self):
+        """Iterate over the rows of the table.
+
+        :rtype: collections.Iterator[Row]
+
+        Unless the table has already been loaded, records are fetched with ``iterator()`` and each row is created as it
+        is rendered, so the queryset and its rows are never held in memory all at once.
+
+        """
+        if self.is_loaded:
+            for row in self.rows:
+                yield row
+
+            return
+
+        records = self.get_queryset().iterator(chunk_size=self.chunk_size)
+        for record in self._iter_page(records):
+            yield SimpleRow(self.get_row_data(record))
+
     def load(self):
         """Load data from queryset into ``rows``."""
-        for record in self.queryset:
-            data = list()
-            for c in self.columns:
-                try:
-                    value = getattr(record, c.name)
-                except AttributeError:
-                    value = None
-
-                data.append(value)
+        for record in self._iter_page(self.get_queryset()):
+            self.rows.append(SimpleRow(self.get_row_data(record)))
 
         self.is_loaded = True
+
+    def next_page_number(self):
+        """Get the number of the next page.
+
+        :rtype: int
+        :raise: InvalidPage
+
+        Keyset pages have no numbers, so ``InvalidPage`` is raised with keyset paging. Use ``next_cursor`` instead.
+
+        """
+        if self.is_keyset:
+            raise InvalidPage("Keyset pages have no numbers; use next_cursor instead.")
+
+        return self.number + 1
+
+    def previous_page_number(self):
+        """Get the number of the previous page.
+
+        :rtype: int
+        :raise: EmptyPage
+
+        """
+        if not self.has_previous():
+            raise EmptyPage("There is no previous page.")
+
+        return self.number - 1
+
+    def _iter_page(self, records):
+        """Iterate over the records of the current page, recording whether there is a next page and the cursor for it.
+
+        :param records: The records fetched by ``get_queryset()``.
+
+        :rtype: collections.Iterator
+
+        """
+        self._has_next = False
+        self.next_cursor = None
+
+        count = 0
+        last = None
+        for record in records:
+            if self.page_size is not None and count == self.page_size:
+                self._has_next = True
+                break
+
+            count += 1
+            last = record
+
+            yield record
+
+        if self.is_keyset and self._has_next and last is not None:
+            if isinstance(last, tuple):
+                self.next_cursor = last[self._cursor_index]
+            else:
+                self.next_cursor = _get_lookup_value(last, self.order_by.lstrip("-"))
+
+
+class ColumnarTable(Table):
+    """A table that stores its data by column rather than by row.
+
+    Each column is a ``list`` or, when NumPy is installed, may also be given as an array. Column formatters are applied
+    to a whole column at once when the table is rendered, and operations such as ``sort()`` and ``total()`` work
+    directly on the columns. All of the columns must have the same length.
+
+    A column formatter is a callable that accepts the values of a column and returns a sequence of the same length. It
+    may also be given by name: ``currency``, ``date``, or ``number``. (This differs from the ``formatter`` of a
+    ``Column``, which is applied to each cell.)
+
+    Rows that are given or added are split into their columns, so they may not have attributes.
+
+    """
+
+    def __init__(self, caption=None, columns=None, rows=None, **kwargs):
+        super(ColumnarTable, self).__init__(caption=caption, columns=columns, **kwargs)
+
+        self.data = dict()
+        self.column_formatters = dict()
+
+        for column in self.get_data_columns():
+            self.data[column.name] = list()
+
+        if rows:
+            self.add_rows(rows)
+
+    def __iter__(self):
+        return self.iter_rows()
+
+    def __len__(self):
+        columns = self.get_data_columns()
+        if not columns:
+            return 0
+
+        return len(self.data[columns[0].name])
+
+    def add_column(self, name, title=None, column_formatter=None, values=None, **kwargs):
+        """Add a column to the table.
+
+        :param name: The column name.
+        :type name: str
+
+        :param title: The column title.
+        :type title: str
+
+        :param column_formatter: The column formatter or column formatter name.
+        :type column_formatter: callable | str
+
+        :param values: The values of the column. Otherwise, the column is empty.
+        :type values: list | numpy.ndarray
+
+        :rtype: Column
+
+        """
+        column = super(ColumnarTable, self).add_column(name, title=title, **kwargs)
+
+        if values is None:
+            values = list()
+
+        self.data[name] = values
+
+        if column_formatter is not None:
+            self.column_formatters[name] = column_formatter
+
+        return column
+
+    def add_row(self, data, **kwargs):
+        """Add a row to the table by appending each value to its column.
+
+        :param data: The values in column order.
+        :type data: list | tuple
+
+        :rtype: SimpleRow
+        :returns: The row, which is not itself stored.
+        :raise: ValueError
+
+        Row attributes may not be given, because the row is not kept once its values are added to the columns.
+
+        """
+        if kwargs:
+            raise ValueError("The rows of a columnar table may not have attributes: %s" % ", ".join(sorted(kwargs)))
+
+        columns = self.get_data_columns()
+        if len(data) != len(columns):
+            raise ValueError("The row has %s values for %s columns." % (len(data), len(columns)))
+
+        for column, value in zip(columns, data):
+            values = self.data[column.name]
+            if not isinstance(values, list):
+                values = list(values)
+                self.data[column.name] = values
+
+            values.append(value)
+
+        return SimpleRow(data)
+
+    def add_rows(self, rows):
+        """Add rows to the table by appending each value to its column.
+
+        :param rows: The data of each row, with the values in column order.
+        :type rows: collections.Iterable[list | tuple]
+
+        :raise: ValueError
+
+        """
+        for data in rows:
+            self.add_row(data)
+
+    def format_column(self, name):
+        """Get the formatted values of a column.
+
+        :param name: The column name.
+        :type name: str
+
+        :rtype: list | tuple | numpy.ndarray
+
+        """
+        values = self.data[name]
+
+        formatter = self.column_formatters.get(name)
+        if formatter is None:
+            return values
+
+        if isinstance(formatter, str):
+            formatter = COLUMN_FORMATTERS[formatter]
+
+        return formatter(values)
+
+    def get_column(self, name):
+        """Get the (unformatted) values of a column.
+
+        :param name: The column name.
+        :type name: str
+
+        :rtype: list | numpy.ndarray
+
+        """
+        return self.data[name]
+
+    def iter_rows(self):
+        """Iterate over the rows of the table, formatting each column first.
+
+        :rtype: collections.Iterator[SimpleRow]
+        :raise: ValueError
+
+        """
+        names = [c.name for c in self.get_data_columns()]
+
+        lengths = set([len(self.data[name]) for name in names])
+        if len(lengths) > 1:
+            raise ValueError("The columns have different lengths: %s" % ", ".join(
+                ["%s (%s)" % (name, len(self.data[name])) for name in names]
+            ))
+
+        columns = [self.format_column(name) for name in names]
+        for cells in zip(*columns):
+            yield SimpleRow(cells)
+
+    def set_column(self, name, values):
+        """Replace the values of a column.
+
+        :param name: The column name.
+        :type name: str
+
+        :param values: The values of the column.
+        :type values: list | numpy.ndarray
+
+        """
+        self.data[name] = values
+
+    def sort(self, name, reverse=False):
+        """Sort the rows of the table by a column.
+
+        :param name: The name of the column to sort by.
+        :type name: str
+
+        :param reverse: Sort in descending order.
+        :type reverse: bool
+
+        """
+        values = self.data[name]
+        if _is_array(values):
+            order = numpy.argsort(values, kind="stable")
+            if reverse:
+                order = order[::-1]
+        else:
+            # Empty values are sorted after the others.
+            def key(i):
+                value = values[i]
+                if value is None:
+                    return not reverse, 0
+
+                return reverse, value
+
+            order = sorted(range(len(values)), key=key, reverse=reverse)
+
+        for key, values in self.data.items():
+            if _is_array(values):
+                self.data[key] = values[order]
+            else:
+                self.data[key] = [values[i] for i in order]
+
+    def total(self, name):
+        """Get the sum of a column. Empty (``None``) values are ignored.
+
+        :param name: The column name.
+        :type name: str
+
+        """
+        values = self.data[name]
+        if _is_array(values):
+            return values.sum()
+
+        return sum([v for v in values if v is not None])
+
+# Functions
+
+
+def format_currency_column(values, unit="USD"):
+    """Format the values of a column as currency.
+
+    :param values: The column values.
+    :type values: list | numpy.ndarray
+
+    :param unit: The type of currency.
+    :type unit: str
+
+    :rtype: list
+
+    """
+    return format_currency_many(_to_list(values), unit=unit)
+
+
+def format_date_column(values, date_format="%Y-%m-%d"):
+    """Format the values of a column as dates.
+
+    :param values: The column values.
+    :type values: list | numpy.ndarray
+
+    :param date_format: The ``strftime()`` format.
+    :type date_format: str
+
+    :rtype: list
+
+    """
+    if _is_array(values) and values.dtype.kind == "M" and date_format == "%Y-%m-%d":
+        return numpy.datetime_as_string(values, unit="D").tolist()
+
+    return [_EMPTY if v is None else v.strftime(date_format) for v in _to_list(values)]
+
+
+def format_number_column(values, places=0):
+    """Format the values of a column as numbers with a thousands separator.
+
+    :param values: The column values.
+    :type values: list | numpy.ndarray
+
+    :param places: The number of decimal places.
+    :type places: int
+
+    :rtype: list
+
+    """
+    _format = ("{:,.%sf}" % places).format
+
+    return [_EMPTY if v is None else _format(v) for v in _to_list(values)]
+
+
+COLUMN_FORMATTERS = {
+    'currency': format_currency_column,
+    'date': format_date_column,
+    'number': format_number_column,
+}
+"""The column formatters that may be given to ``ColumnarTable`` by name, and the function for each."""
+
+
+def _is_array(values):
+    """Determine whether the values of a column are a NumPy array."""
+    return numpy is not None and isinstance(values, numpy.ndarray)
+
+
+def _to_list(values):
+    """Convert an array to a list of Python values, which are much faster to format than NumPy scalars."""
+    if _is_array(values):
+        return values.tolist()
+
+    return values
+
+
+def compile_row_renderer(columns):
+    """Compile the columns of a table into a function that renders a row.
+
+    :param columns: The columns of the table.
+    :type columns: list[Column]
+
+    :rtype: callable
+
+    The returned function accepts the open tag, close tag, and data of a row. The cell markup is compiled once into a
+    single format string, and each column's formatter and escaping into one converter, so that rendering a row is a
+    single string interpolation. A row that does not have one value per data column is rendered cell by cell, with
+    each value rendered by the column at its index, and values beyond the last column escaped.
+
+    Hidden columns are skipped, and the cells of action columns are rendered from the value of their key column. These
+    are located by index, so the function raises ``ValueError`` when rendering a row of a table that has hidden or
+    action columns unless the row has one value per data column.
+
+    """
+    if not columns:
+        return _render_row
+
+    data_columns = [c.name for c in columns if c.has_data]
+
+    cells = list()
+    converters = list()
+    indexes = list()
+    for column in columns:
+        if column.hidden:
+            continue
+
+        if column.has_data:
+            indexes.append(data_columns.index(column.name))
+        else:
+            try:
+                indexes.append(data_columns.index(column.key))
+            except ValueError:
+                raise ValueError("The %s column has no key column: %s" % (column.name, column.key))
+
+        attributes = flatten_attributes(column.cell_attributes).replace("%", "%%")
+        cells.append("<td%s>%%s</td>" % attributes)
+        converters.append(column.get_cell_converter())
+
+    row_format = "<%%s>\n%s\n</%%s>" % "\n".join(cells)
+    count = len(data_columns)
+
+    # Without hidden or action columns each value is rendered by the converter of its column, in order.
+    if indexes == list(range(count)):
+        def render_cells(open_tag, close_tag, data):
+            a = list()
+            a.append("<%s>" % open_tag)
+            for i, value in enumerate(data):
+                if i < count:
+                    a.append(cells[i] % converters[i](value))
+                else:
+                    a.append("<td>%s</td>" % conditional_escape(value))
+
+            a.append("</%s>" % close_tag)
+
+            return "\n".join(a)
+
+        def render(open_tag, close_tag, data):
+            if len(data) != count:
+                return render_cells(open_tag, close_tag, data)
+
+            values = [open_tag]
+            values.extend([convert(value) for convert, value in zip(converters, data)])
+            values.append(close_tag)
+
+            return row_format % tuple(values)
+
+        return render
+
+    plan = list(zip(indexes, converters))
+
+    def render(open_tag, close_tag, data):
+        if len(data) != count:
+            raise ValueError("The row has %s values for %s data columns." % (len(data), count))
+
+        values = [open_tag]
+        values.extend([convert(data[index]) for index, convert in plan])
+        values.append(close_tag)
+
+        return row_format % tuple(values)
+
+    return render
+
+
+def _render_row(open_tag, close_tag, data):
+    """Render the cells of a row."""
+    a = list()
+    a.append("<%s>" % open_tag)
+    for d in data:
+        a.append("<td>%s</td>" % conditional_escape(d))
+
+    a.append("</%s>" % close_tag)
+
+    return "\n".join(a)
+
+
+def _get_field(opts, name):
+    """Get a field from model options, allowing for the ``pk`` alias."""
+    if name == "pk":
+        return opts.pk
+
+    return opts.get_field(name)
+
+
+def _get_lookup_value(record, name):
+    """Get the value of a column name for a model instance, following ``__`` lookups across relations.
+
+    :rtype: object
+
+    ``None`` is returned when an attribute is missing or a relation along the way is empty.
+
+    """
+    value = record
+    for part in name.split(LOOKUP_SEP):
+        try:
+            value = getattr(value, part)
+        except AttributeError:
+            return None
+
+        if value is None:
+            break
+
+    return value
+
+
+def _get_related_path(model, name):
+    """Get the ``select_related()`` path for the forward relations traversed by a column name, including a relation
+    that is itself the column (which is displayed as the related object).
+
+    :rtype: str | None
+
+    """
+    opts = model._meta
+    path = list()
+    for part in name.split(LOOKUP_SEP):
+        try:
+            field = _get_field(opts, part)
+        except FieldDoesNotExist:
+            break
+
+        if not (field.many_to_one or field.one_to_one) or field.related_model is None:
+            break
+
+        path.append(part)
+        opts = field.related_model._meta
+
+    if path:
+        return LOOKUP_SEP.join(path)
+
+    return None
+
+
+def _is_field_lookup(model, name):
+    """Determine whether a column name may be given to ``values_list()`` for the given model.
+
+    :rtype: bool
+
+    """
+    opts = model._meta
+    parts = name.split(LOOKUP_SEP)
+    for i, part in enumerate(parts):
+        try:
+            field = _get_field(opts, part)
+        except FieldDoesNotExist:
+            return False
+
+        # Multi-valued relations would produce a row per related record.
+        if not field.concrete or field.many_to_many or field.one_to_many:
+            return False
+
+        if i < len(parts) - 1:
+            if field.related_model is None:
+                return False
+
+            opts = field.related_model._meta
+        elif field.is_relation:
+            # values_list() would give the key, while the column displays the related object.
+            return False
+
+    return True
+
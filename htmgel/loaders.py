@@ -0,0 +1,87 @@
+"""
+A template loader that resolves component templates directly to the templates of the framework in use.
+
+The top-level component templates, e.g. ``htmgel/alert.html``, only include the template for the framework, e.g.
+``htmgel/bootstrap3/alert.html``. This loader looks for the framework's template first, which removes the include and
+its condition from every render. It wraps other loaders in the same way as the cached loader:
+
+.. code::
+
+    TEMPLATES = [
+        {
+            'BACKEND': "django.template.backends.django.DjangoTemplates",
+            'DIRS': [...],
+            'OPTIONS': {
+                'loaders': [
+                    ("django.template.loaders.cached.Loader", [
+                        ("htmgel.loaders.Loader", [
+                            "django.template.loaders.filesystem.Loader",
+                            "django.template.loaders.app_directories.Loader",
+                        ]),
+                    ]),
+                ],
+            },
+        },
+    ]
+
+"""
+# Imports
+
+from django.template.loaders.base import Loader as BaseLoader
+from .frameworks import get_framework
+
+# Exports
+
+__all__ = (
+    "Loader",
+    "get_template_names",
+)
+
+# Classes
+
+
+class Loader(BaseLoader):
+    """Load framework-specific component templates in place of the top-level component templates."""
+
+    def __init__(self, engine, loaders):
+        super(Loader, self).__init__(engine)
+        self.loaders = engine.get_template_loaders(loaders)
+
+    def get_contents(self, origin):
+        return origin.loader.get_contents(origin)
+
+    def get_template_sources(self, template_name):
+        for name in get_template_names(template_name, get_framework()):
+            for loader in self.loaders:
+                for origin in loader.get_template_sources(name):
+                    yield origin
+
+    def reset(self):
+        for loader in self.loaders:
+            if hasattr(loader, "reset"):
+                loader.reset()
+
+# Functions
+
+
+def get_template_names(template_name, framework):
+    """Get the names of the templates to look for, in order.
+
+    :param template_name: The name of the requested template.
+    :type template_name: str
+
+    :param framework: The framework in use.
+    :type framework: str
+
+    :rtype: list[str]
+
+    """
+    if framework is None or not template_name.startswith("htmgel/"):
+        return [template_name]
+
+    # Only the top-level components, e.g. htmgel/alert.html, are resolved to the framework.
+    component = template_name[len("htmgel/"):]
+    if "/" in component:
+        return [template_name]
+
+    return ["htmgel/%s/%s" % (framework, component), template_name]
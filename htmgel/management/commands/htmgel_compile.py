@@ -0,0 +1,90 @@
+# Imports
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.template import TemplateDoesNotExist
+from importlib import import_module
+import os
+from ...compiler import CompilationError, TemplateCompiler
+from ...constants import COMPONENTS
+from ...frameworks import get_framework
+from ...shortcuts import get_component_template_name
+
+# Classes
+
+
+class Command(BaseCommand):
+    help = "Compile component templates into Python render functions."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "components",
+            nargs="*",
+            help="The names of the components to compile. Defaults to all components."
+        )
+
+        parser.add_argument(
+            "--framework",
+            dest="framework",
+            help="The HTML framework to compile for. Defaults to the framework in use."
+        )
+
+        parser.add_argument(
+            "-o",
+            "--output",
+            dest="output",
+            help="The path to the module to be written. Defaults to the module named by HTMGEL_COMPILED_TEMPLATES."
+        )
+
+    def handle(self, *args, **options):
+        output = options['output'] or self.get_output_path()
+
+        framework = options['framework']
+        if framework is None:
+            framework = get_framework()
+            if framework is None:
+                raise CommandError("HTML framework is not installed.")
+
+        compiler = TemplateCompiler(framework=framework)
+
+        compiled = list()
+        for name in options['components'] or COMPONENTS:
+            template_name = get_component_template_name(name)
+            try:
+                compiler.add(template_name)
+            except TemplateDoesNotExist:
+                continue
+            except CompilationError as e:
+                self.stderr.write("Skipped %s: %s" % (template_name, e))
+                continue
+
+            compiled.append(template_name)
+
+        for template_name, reason in sorted(compiler.uncompiled.items()):
+            self.stderr.write("Included %s will be rendered by Django: %s" % (template_name, reason))
+
+        with open(output, "w") as f:
+            f.write(compiler.get_source())
+
+        self.stdout.write("Compiled %s templates for %s to %s" % (len(compiled), framework, output))
+
+    # noinspection PyMethodMayBeStatic
+    def get_output_path(self):
+        """Get the path of the module named by the ``HTMGEL_COMPILED_TEMPLATES`` setting.
+
+        :rtype: str
+
+        """
+        module_name = getattr(settings, "HTMGEL_COMPILED_TEMPLATES", None)
+        if not module_name:
+            raise CommandError("Either --output or the HTMGEL_COMPILED_TEMPLATES setting is required.")
+
+        if "." in module_name:
+            package_name, name = module_name.rsplit(".", 1)
+            package = import_module(package_name)
+            path = os.path.dirname(package.__file__)
+        else:
+            name = module_name
+            path = os.getcwd()
+
+        return os.path.join(path, "%s.py" % name)
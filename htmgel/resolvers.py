@@ -0,0 +1,315 @@
+"""
+Memoize the reversal of URL patterns. Reversing a pattern name is comparatively expensive on a large URLconf, while
+the same few URLs (e.g. those of breadcrumbs and menus) are reversed on every request.
+
+``LazyURL`` defers reversal until a URL is used, and ``URLTemplate`` reverses a pattern once for many objects (e.g.
+the rows of a table) by substituting each object's value into the reversed URL.
+
+"""
+# Imports
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.urls import NoReverseMatch, get_resolver, get_script_prefix, get_urlconf, reverse
+from django.utils.http import RFC3986_SUBDELIMS
+from functools import lru_cache
+from urllib.parse import quote
+
+# Exports
+
+__all__ = (
+    "LazyURL",
+    "URLTemplate",
+    "clear_url_cache",
+    "reverse_url",
+)
+
+# Constants
+
+URL_CACHE_SIZE = 2048
+"""The maximum number of reversed URLs that are kept."""
+
+URL_TEMPLATE_VALUES = (
+    "8301974652",
+    "htmgel-url-template",
+    "83019746-5283-4019-8746-528301974652",
+)
+"""The values tried in turn in place of the object value when a ``URLTemplate`` is reversed, so that the value
+satisfies the converter of the pattern (e.g. int, slug, or uuid)."""
+
+_SAFE_CHARACTERS = RFC3986_SUBDELIMS + "/~:@"
+"""The characters that are not quoted when a value is substituted into a URL, as with ``reverse()``."""
+
+# Classes
+
+
+class LazyURL(object):
+    """A URL pattern that is reversed when the URL is first used, e.g. rendered as an attribute."""
+
+    __slots__ = (
+        "args",
+        "kwargs",
+        "name",
+        "namespace",
+        "urlconf",
+    )
+
+    def __init__(self, name, args=None, kwargs=None, namespace=None, urlconf=None):
+        """Initialize the URL. See ``reverse_url()`` for the parameters."""
+        self.args = args
+        self.kwargs = kwargs
+        self.name = name
+        self.namespace = namespace
+        self.urlconf = urlconf
+
+    def __repr__(self):
+        return "<%s %s>" % (self.__class__.__name__, self.name)
+
+    def __str__(self):
+        return reverse_url(self.name, args=self.args, kwargs=self.kwargs, namespace=self.namespace,
+                           urlconf=self.urlconf)
+
+
+class URLTemplate(object):
+    """A URL pattern that is reversed once for many objects.
+
+    The pattern is reversed with a placeholder for the varying argument (by default the ``pk`` keyword argument), and
+    the URL for each object is formatted by substituting its value for the placeholder. This turns a ``reverse()`` per
+    object into one per template. Values are quoted as by ``reverse()`` but are not checked against the pattern, so
+    they should be of the kind the pattern accepts (e.g. primary keys).
+
+    """
+
+    __slots__ = (
+        "args",
+        "key",
+        "kwargs",
+        "name",
+        "namespace",
+        "urlconf",
+        "_parts",
+        "_placeholder",
+        "_url",
+    )
+
+    def __init__(self, name, key="pk", args=None, kwargs=None, namespace=None, urlconf=None):
+        """Initialize the template.
+
+        :param name: The pattern name.
+        :type name: str
+
+        :param key: The name of the keyword argument, or the index of the positional argument, that varies by object.
+        :type key: str | int
+
+        :param args: The other positional arguments of the pattern. The argument at ``key`` may be omitted or ``None``.
+        :type args: list | tuple
+
+        :param kwargs: The other keyword arguments of the pattern.
+        :type kwargs: dict
+
+        :param namespace: The application namespace of the pattern.
+        :type namespace: str
+
+        :param urlconf: The URLconf module to use. Defaults to that of the current thread.
+        :type urlconf: str
+
+        """
+        self.args = args
+        self.key = key
+        self.kwargs = kwargs
+        self.name = name
+        self.namespace = namespace
+        self.urlconf = urlconf
+
+        self._parts = None
+        self._placeholder = None
+        self._url = None
+
+    def __call__(self, value):
+        return self.format(value)
+
+    def __repr__(self):
+        return "<%s %s>" % (self.__class__.__name__, self.name)
+
+    def format(self, value):
+        """Get the URL for an object.
+
+        :param value: The value of the varying argument, e.g. the primary key of the object.
+
+        :rtype: str
+        :raise: NoReverseMatch
+
+        """
+        parts = self.get_parts()
+        if parts is None:
+            return self._reverse(value)
+
+        prefix, suffix = parts
+
+        return prefix + _quote(value) + suffix
+
+    def format_many(self, values):
+        """Get the URLs for a number of objects.
+
+        :param values: The values of the varying argument.
+        :type values: collections.Iterable
+
+        :rtype: list[str]
+
+        """
+        parts = self.get_parts()
+        if parts is None:
+            return [self._reverse(v) for v in values]
+
+        prefix, suffix = parts
+
+        return [prefix + _quote(v) + suffix for v in values]
+
+    def get_formatter(self):
+        """Get a function that formats the URL for a value, with the pattern reversed once beforehand. This is the
+        fastest way to format URLs one at a time, e.g. as the cells of a table are rendered.
+
+        :rtype: callable
+        :raise: NoReverseMatch
+
+        """
+        parts = self.get_parts()
+        if parts is None:
+            return self._reverse
+
+        prefix, suffix = parts
+
+        return lambda value: prefix + _quote(value) + suffix
+
+    def get_parts(self):
+        """Get the parts of the reversed URL before and after the placeholder.
+
+        :rtype: tuple(str, str) | None
+        :returns: ``None`` when the pattern cannot be reversed with a placeholder. URLs are then reversed for each
+                  object.
+        :raise: NoReverseMatch
+
+        The pattern is reversed through ``reverse_url()``, so the template follows changes to the URLconf.
+
+        """
+        # The placeholder that matched the pattern before is tried first, so that a failed reversal is not repeated.
+        placeholders = URL_TEMPLATE_VALUES
+        if self._placeholder is not None:
+            placeholders = (self._placeholder,) + placeholders
+
+        error = None
+        for placeholder in placeholders:
+            try:
+                url = self._reverse(placeholder)
+            except NoReverseMatch as e:
+                error = e
+                continue
+
+            if url is not self._url:
+                self._placeholder = placeholder
+                self._url = url
+
+                # The placeholder must appear exactly once for the URL to be split unambiguously.
+                if url.count(placeholder) == 1:
+                    self._parts = tuple(url.split(placeholder))
+                else:
+                    self._parts = None
+
+            return self._parts
+
+        raise error
+
+    def _reverse(self, value):
+        """Reverse the pattern for a value of the varying argument."""
+        args = self.args
+        kwargs = self.kwargs
+
+        if isinstance(self.key, int):
+            args = list(args or ())
+            if len(args) <= self.key:
+                args.extend([None] * (self.key + 1 - len(args)))
+
+            args[self.key] = value
+        else:
+            kwargs = dict(kwargs or ())
+            kwargs[self.key] = value
+
+        return reverse_url(self.name, args=args, kwargs=kwargs, namespace=self.namespace, urlconf=self.urlconf)
+
+# Functions
+
+
+def clear_url_cache():
+    """Remove all reversed URLs from the cache."""
+    _reverse.cache_clear()
+
+
+def reverse_url(name, args=None, kwargs=None, namespace=None, urlconf=None):
+    """Reverse a URL pattern, using the result of a previous call with the same arguments.
+
+    :param name: The pattern name.
+    :type name: str
+
+    :param args: Pattern arguments.
+    :type args: list | tuple
+
+    :param kwargs: Pattern keyword arguments.
+    :type kwargs: dict
+
+    :param namespace: The application namespace of the pattern.
+    :type namespace: str
+
+    :param urlconf: The URLconf module to use. Defaults to that of the current thread.
+    :type urlconf: str
+
+    :rtype: str
+    :raise: NoReverseMatch
+
+    Reversed URLs are cached by the arguments along with the URLconf, the script prefix and the resolver itself. The
+    resolver is replaced when Django's URL caches are cleared (e.g. by ``clear_url_caches()``), so URLs reversed with
+    a previous URLconf are not returned.
+
+    """
+    if namespace is not None:
+        name = "%s:%s" % (namespace, name)
+
+    if urlconf is None:
+        urlconf = get_urlconf()
+
+    key = (
+        name,
+        tuple(args) if args else (),
+        tuple(sorted(kwargs.items())) if kwargs else (),
+    )
+
+    try:
+        hash(key)
+    except TypeError:
+        return reverse(name, urlconf=urlconf, args=args, kwargs=kwargs)
+
+    return _reverse(key, urlconf, get_script_prefix(), get_resolver(urlconf))
+
+
+def _quote(value):
+    """Quote a value for a URL. Integers and plain ASCII text (e.g. most primary keys) are left as they are."""
+    text = str(value)
+    if value.__class__ is int or (text.isascii() and text.isalnum()):
+        return text
+
+    return quote(text, safe=_SAFE_CHARACTERS)
+
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def _reverse(key, urlconf, prefix, resolver):
+    """Reverse the URL identified by a key of ``reverse_url()``. The prefix and resolver are only used to vary the
+    cache.
+    """
+    name, args, kwargs = key
+
+    return reverse(name, urlconf=urlconf, args=args, kwargs=dict(kwargs))
+
+
+@receiver(setting_changed)
+def _setting_changed(setting, **kwargs):
+    if setting == "ROOT_URLCONF":
+        clear_url_cache()
@@ -1,12 +1,69 @@
 # Imports
 
-from decimal import Decimal
-from django.utils.safestring import mark_safe
+from django.conf import settings
 from django.template import Context, loader, Template, TemplateDoesNotExist
+from django.template.autoreload import reset_loaders
+from django.template.context import make_context
+from functools import lru_cache
+import os
+from .constants import COMPONENTS
+from .currency import format_currency
+
+# Exports
+
+__all__ = (
+    "clear_component_templates",
+    "get_component_template",
+    "get_component_template_name",
+    "get_currency_display",
+    "parse_template",
+    "preload_components",
+)
+
+# Constants
+
+_templates = dict()
+"""The compiled templates by framework and template name. See ``_get_template()``."""
 
 # Functions
 
 
+def clear_component_templates():
+    """Remove all compiled templates from the registry."""
+    _templates.clear()
+
+
+def get_component_template(path, framework=None):
+    """Get the compiled template for a component.
+
+    :param path: The component name, e.g. ``page_header``, or its path relative to the ``htmgel`` templates.
+    :type path: str
+
+    :param framework: The HTML framework in use.
+    :type framework: str
+
+    :rtype: django.template.Template
+
+    """
+    return _get_template(get_component_template_name(path), framework=framework)
+
+
+@lru_cache(maxsize=None)
+def get_component_template_name(path):
+    """Get the template name of a component.
+
+    :param path: The component name, e.g. ``page_header``, or its path relative to the ``htmgel`` templates.
+    :type path: str
+
+    :rtype: str
+
+    """
+    if ".html" not in path:
+        path += ".html"
+
+    return os.path.join("htmgel", path)
+
+
 def get_currency_display(amount, unit="USD"):
     """Display a currency amount in human friendly format.
 
@@ -18,20 +75,12 @@ def get_currency_display(amount, unit="USD"):
 
     :rtype: str
 
-    """
-    if isinstance(amount, Decimal):
-        value = "{:,.2f}".format(amount)
-    elif isinstance(amount, int):
-        value = "{:,.2f}".format(amount)
-    else:
-        value = "{:,.2f}".format(int(amount))
+    .. note::
+        This is a shortcut for ``htmgel.currency.format_currency()``.
 
-    # Set the default symbol. Override only when the given unit is not the same.
-    symbol = "$"
-    if unit == "EUR":
-        symbol = "&euro;"
+    """
+    return format_currency(amount, unit=unit)
 
-    return mark_safe("%s%s" % (symbol, value))
 
 def parse_template(template, context):
     """Ad hoc means of parsing a template using Django's built-in loader.
@@ -45,4 +94,72 @@ def parse_template(template, context):
     :rtype: str
 
     """
-    return loader.render_to_string(template, context)
+    return _get_template(template).render(make_context(context))
+
+
+def preload_components(names=COMPONENTS, framework=None):
+    """Load and compile component templates ahead of time, for example, when the application starts.
+
+    :param names: The component names.
+    :type names: list[str]
+
+    :param framework: The HTML framework in use.
+    :type framework: str
+
+    :rtype: list[str]
+    :returns: The names of the components that were found.
+
+    """
+    loaded = list()
+    for name in names:
+        try:
+            get_component_template(name, framework=framework)
+        except TemplateDoesNotExist:
+            continue
+
+        loaded.append(name)
+
+    return loaded
+
+
+def _get_mtime(template):
+    """Get the modification time of a template's file, if it has one."""
+    try:
+        return os.path.getmtime(template.origin.name)
+    except (AttributeError, OSError, TypeError):
+        return None
+
+
+def _get_template(template_name, framework=None):
+    """Get a compiled template from the registry, loading it when needed.
+
+    Templates are only loaded once per framework. When ``DEBUG`` is enabled, a template is loaded again after its file
+    has been modified.
+
+    """
+    key = (framework, template_name)
+
+    try:
+        template, mtime = _templates[key]
+    except KeyError:
+        pass
+    else:
+        if not settings.DEBUG or mtime == _get_mtime(template):
+            return template
+
+        # The template has changed, so it must also be removed from Django's cached loaders.
+        reset_loaders()
+
+    template = loader.get_template(template_name)
+
+    # Use the engine's template rather than the backend's, which only renders a dict.
+    template = getattr(template, "template", template)
+
+    if settings.DEBUG:
+        mtime = _get_mtime(template)
+    else:
+        mtime = None
+
+    _templates[key] = (template, mtime)
+
+    return template
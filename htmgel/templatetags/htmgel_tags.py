@@ -3,15 +3,20 @@
 # noinspection PyPackageRequirements
 from django import template
 # noinspection PyPackageRequirements
-from django import forms
-# noinspection PyPackageRequirements
 from django.conf import settings
 # noinspection PyPackageRequirements
 from django.core.exceptions import ImproperlyConfigured
 # noinspection PyPackageRequirements
+from django.core.signals import setting_changed
+# noinspection PyPackageRequirements
+from django.dispatch import receiver
+# noinspection PyPackageRequirements
 from django.utils.safestring import mark_safe
-import os
-from ..shortcuts import get_currency_display, parse_template
+# noinspection PyPackageRequirements
+from django.utils.translation import get_language
+import logging
+from ..frameworks import get_framework
+from ..icons import get_icon_registry
 
 register = template.Library()
 
@@ -36,27 +41,149 @@ __all__ = (
     "is_select",
     "is_select_multiple",
     "is_text",
+    "render_form",
+    "render_menu",
     "replace",
+    "widget_kind",
+    "widget_type",
 )
 
 # Constants
 
-DEFAULT_CURRENCY = getattr(settings, "DEFAULT_CURRENCY", "USD")
-ICON_FRAMEWORK = getattr(settings, "ICON_FRAMEWORK", "fontawesome")
+# Settings are read on first use rather than when the library is imported, so that the module may be imported before
+# settings are configured. The module-level names below (e.g. ``DEFAULT_CURRENCY``) remain available through
+# ``__getattr__()``.
+SETTINGS = {
+    'DEFAULT_CURRENCY': ("DEFAULT_CURRENCY", "USD"),
+    'ICON_FRAMEWORK': ("ICON_FRAMEWORK", "fontawesome"),
+    # A dict of component names and the number of seconds their output is cached, or ``None`` to cache indefinitely.
+    'FRAGMENT_CACHE': ("HTMGEL_FRAGMENT_CACHE", dict()),
+    'FRAGMENT_CACHE_ALIAS': ("HTMGEL_FRAGMENT_CACHE_ALIAS", "default"),
+    'FRAGMENT_CACHE_SIZE': ("HTMGEL_FRAGMENT_CACHE_SIZE", 256),
+    'FRAGMENT_CACHE_TIMEOUT': ("HTMGEL_FRAGMENT_CACHE_TIMEOUT", 300),
+}
+
+_settings = dict()
+
+_fragments = None
+
+# These are imported on first use rather than with the library, which would also import Django's forms and template
+# loaders. See ``_import_deferred()``.
+FragmentCache = None
+Layout = None
+format_currency = None
+get_compiled_renderer = None
+get_component_template = None
+get_component_template_name = None
+get_form_render_plan = None
+get_fragment_key = None
+get_widget_kind = None
+get_widget_kinds = None
+
+_widget_kinds = dict()
+"""The kinds of each widget class, as used by the widget filters. See ``_get_widget_kinds()``."""
+
+log = logging.getLogger(__name__)
+
+
+def __getattr__(name):
+    if name == "HTML_FRAMEWORK":
+        return _get_html_framework()
+
+    if name == "fragments":
+        return _get_fragments()
+
+    if name in SETTINGS:
+        return _get_setting(name)
+
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+def _get_fragments():
+    """Get the fragment cache, which is created on first use.
+
+    :rtype: htmgel.cache.FragmentCache
+
+    """
+    global _fragments
+
+    if _fragments is None:
+        if FragmentCache is None:
+            _import_deferred()
+
+        _fragments = FragmentCache(
+            alias=_get_setting("FRAGMENT_CACHE_ALIAS"),
+            max_size=_get_setting("FRAGMENT_CACHE_SIZE")
+        )
+
+    return _fragments
+
+
+def _import_deferred():
+    """Import the names that are not needed until a tag is used, binding them to the module so that each is only
+    imported once."""
+    global FragmentCache, Layout, format_currency, get_compiled_renderer, get_component_template, \
+        get_component_template_name, get_form_render_plan, get_fragment_key, get_widget_kind, get_widget_kinds
+
+    from ..cache import FragmentCache, get_fragment_key
+    from ..compiler import get_compiled_renderer
+    from ..currency import format_currency
+    from ..library.forms import Layout, get_form_render_plan, get_widget_kind, get_widget_kinds
+    from ..shortcuts import get_component_template, get_component_template_name
+
+
+def _get_html_framework():
+    """Get the HTML framework in use.
+
+    :rtype: str
+    :raise: ImproperlyConfigured
+
+    """
+    framework = get_framework()
+    if framework is None:
+        raise ImproperlyConfigured("HTML framework is not installed.")
+
+    return framework
+
 
-if "htmgel_bootstrap3" in settings.INSTALLED_APPS:
-    HTML_FRAMEWORK = "bootstrap3"
-elif "htmgel_bootstrap4" in settings.INSTALLED_APPS:
-    HTML_FRAMEWORK = "bootstrap4"
-else:
-    raise ImproperlyConfigured("HTML framework is not installed.")
+def _get_setting(name):
+    """Get the value of a setting used by the library, which is read once.
+
+    :param name: The key in ``SETTINGS``.
+    :type name: str
+
+    """
+    try:
+        return _settings[name]
+    except KeyError:
+        pass
+
+    setting, default = SETTINGS[name]
+    value = _settings[name] = getattr(settings, setting, default)
+
+    return value
+
+
+@receiver(setting_changed)
+def _setting_changed(setting, **kwargs):
+    global _fragments
+
+    if setting in ("DEFAULT_CURRENCY", "ICON_FRAMEWORK") or setting.startswith("HTMGEL_FRAGMENT_CACHE"):
+        _settings.clear()
+        _fragments = None
 
 # General Tags
 
 
 @register.simple_tag()
-def display_currency(amount, unit=DEFAULT_CURRENCY):
-    return get_currency_display(amount, unit=unit)
+def display_currency(amount, unit=None):
+    if format_currency is None:
+        _import_deferred()
+
+    if unit is None:
+        unit = _get_setting("DEFAULT_CURRENCY")
+
+    return format_currency(amount, unit=unit)
 
 
 @register.filter
@@ -91,119 +218,221 @@ def get_index(obj, index):
 
 
 @register.simple_tag(takes_context=True)
-def html(context, path, **kwargs):
-    if ".html" not in path:
-        path += ".html"
+def html(context, path, cache=None, cache_key=None, only=False, timeout=None, **kwargs):
+    """Render an HTML component.
+
+    :param path: The name of the component, e.g. ``page_header``, which is loaded from the ``htmgel`` templates.
+    :type path: str
+
+    :param cache: Indicates whether the output should be cached. Defaults to ``True`` for the components listed in the
+                  ``HTMGEL_FRAGMENT_CACHE`` setting or when a ``cache_key`` is given.
+    :type cache: bool
+
+    :param cache_key: The key for the cached output, in place of the other keyword arguments. It is combined with
+                      the component name, framework, and language, so components may use the same key. By default,
+                      the key is derived from the component name and the other keyword arguments.
+    :type cache_key: str
+
+    :param only: Render the component with only the keyword arguments as its context.
+    :type only: bool
+
+    :param timeout: The number of seconds to cache the output.
+    :type timeout: int
+
+    Other keyword arguments are pushed onto the current context while the component is rendered. The names ``cache``,
+    ``cache_key``, ``only``, and ``timeout`` are reserved for the options above, so they cannot be passed to a
+    component.
 
-    template_path = os.path.join("htmgel", path)
+    .. warning::
+        Cached output only varies by the keyword arguments (along with the framework and language), so only cache
+        components that do not otherwise depend on the context, such as the current user. A key can only be derived
+        from simple values and saved model instances (see ``get_fragment_key()``). Otherwise, the output is not
+        cached unless a ``cache_key`` is given.
 
-    # print("PATH =", template_path)
-    # print("CONTEXT =", context)
-    # print("-" * 80)
+    """
+    if path.endswith(".html"):
+        name = path[:-len(".html")]
+    else:
+        name = path
+
+    if cache is None:
+        cache = name in _get_setting("FRAGMENT_CACHE") or cache_key is not None
+
+    if not cache:
+        return _render_html(context, path, kwargs, only=only)
 
-    # The context argument is a RequestContext which is *not* a dictionary, but a contains a list of dictionaries that
-    # is iterable. To pass the context, we need to process each dictionary.
-    _context = dict()
-    for d in context:
-        _context.update(d)
+    if timeout is None:
+        timeout = _get_setting("FRAGMENT_CACHE").get(name, _get_setting("FRAGMENT_CACHE_TIMEOUT"))
+
+    if get_fragment_key is None:
+        _import_deferred()
+
+    if cache_key is not None:
+        # The given key stands in for the arguments, but still varies by the component, framework, and language.
+        key = get_fragment_key(name, {'cache_key': str(cache_key)}, _get_html_framework(), get_language())
+    else:
+        try:
+            key = get_fragment_key(name, kwargs, _get_html_framework(), get_language())
+        except ValueError as e:
+            log.warning("The output of %s is not cached: %s", name, e)
+            return _render_html(context, path, kwargs, only=only)
 
-    # Add keyword arguments passed to the tag. These are specific to the template being loaded.
-    _context.update(kwargs)
+    fragments = _get_fragments()
 
-    return parse_template(template_path, _context)
+    output = fragments.get(key)
+    if output is None:
+        output = _render_html(context, path, kwargs, only=only)
+        fragments.set(key, str(output), timeout=timeout)
+
+    return mark_safe(output)
+
+
+def _render_html(context, path, kwargs, only=False):
+    """Render a component template with the given context and keyword arguments."""
+    if get_compiled_renderer is None:
+        _import_deferred()
+
+    framework = _get_html_framework()
+
+    # Prefer the render function produced by the htmgel_compile command.
+    render = get_compiled_renderer(get_component_template_name(path), framework=framework)
+    if render is not None:
+        if only:
+            return render(context.new(kwargs))
+
+        with context.push(**kwargs):
+            return render(context)
+
+    # The engine's template is rendered against the current context, in the same way as the include tag, rather than
+    # copying every dictionary in the context for the backend's template.
+    template = get_component_template(path, framework=framework)
+
+    if only:
+        return template.render(context.new(kwargs))
+
+    with context.push(**kwargs):
+        return template.render(context)
 
 
 @register.simple_tag()
-def icon(name, framework=ICON_FRAMEWORK):
+def icon(name, framework=None):
     """Output an icon.
 
     :param name: The name of the icon.
     :type name: str
 
-    :param framework: The icon framework to use.
+    :param framework: The icon framework to use. Defaults to the ``ICON_FRAMEWORK`` setting.
     :type framework: str
 
     :rtype: str
 
+    Icons are rendered (and validated) by the icon registry. See ``htmgel.icons``.
+
     """
-    # TODO: It would be a LOT of work, but we *could* validate the given icon name against the selected framework. If
-    # the icon doesn't exist, we could raise an exception, log an error, or return a default.
+    return get_icon_registry().render(name, framework=framework)
 
-    if framework in ("fa", "fontawesome"):
-        return mark_safe('<i class="fa fa-%s" aria-hidden="true"></i>' % name)
-    elif framework in ("glyph", "glyphicon"):
-        return mark_safe('<span class="glyphicon glyphicon-%s" aria-hidden="true"></span>' % name)
-    else:
-        raise ImproperlyConfigured("Unrecognized ICON_FRAMEWORK: %s" % framework)
 
+@register.simple_tag(takes_context=True)
+def render_menu(context, menu, active=None):
+    """Render a menu for the current user.
 
-@register.filter
-def replace(text, from_string, to_string):
-    """Replace a string."""
-    return text.replace(from_string, to_string)
+    :param menu: The menu.
+    :type menu: htmgel.library.menus.Menu
 
-# Field-Related Tags
+    :param active: The name of the active item. Defaults to the URL name of the current view, or the ``active_page``
+                   in the context.
+    :type active: str
 
+    :rtype: str
 
-@register.filter
-def is_checkbox(field):
-    return isinstance(field.field.widget, forms.CheckboxInput)
+    """
+    request = context.get("request")
+    user = context.get("user") or getattr(request, "user", None)
 
+    if active is None:
+        match = getattr(request, "resolver_match", None)
+        if match is not None:
+            active = (match.view_name, match.url_name)
+        else:
+            active = context.get("active_page")
 
-@register.filter
-def is_file(field):
-    return isinstance(field.field.widget, forms.FileInput)
+    return menu.render(user=user, active=active)
 
 
-@register.filter
-def is_checkbox(field):
-    return isinstance(field.field.widget, forms.CheckboxInput)
+@register.simple_tag()
+def render_form(form):
+    """Render the fields of a form using a plan that is cached for the form's class.
 
+    :param form: The form instance. When the form's class has a ``layout`` (see ``htmgel.library.forms.Layout``),
+                 the fields are arranged by the layout.
+    :type form: django.forms.Form
 
-@register.filter
-def is_clearable_file(field):
-    return isinstance(field.field.widget, forms.ClearableFileInput)
+    :rtype: str
 
+    """
+    if Layout is None:
+        _import_deferred()
 
-@register.filter
-def is_date(field):
-    """Determines whether the field is a ``DateInput``."""
-    return isinstance(field.field.widget, forms.DateInput)
+    layout = getattr(form, "layout", None)
+    if isinstance(layout, Layout):
+        return layout.render(form, framework=get_framework())
+
+    return get_form_render_plan(form, framework=get_framework()).render(form)
 
 
 @register.filter
-def is_datetime(field):
-    return isinstance(field.field.widget, forms.DateTimeInput)
+def replace(text, from_string, to_string):
+    """Replace a string."""
+    return text.replace(from_string, to_string)
 
+# Field-Related Tags
 
-@register.filter
-def is_file(field):
-    return isinstance(field.field.widget, forms.FileInput)
+# The widget filters look up the kinds of the widget's class, which is classified once by
+# ``htmgel.library.forms.get_widget_kinds()``. Each filter is made by ``_widget_filter()`` for its kind, rather than
+# calling a shared helper, so that a filter costs no more than the isinstance() check it replaces. Form fields and
+# widgets are not bound fields, so they are classified through ``_get_widget_kinds()``.
 
 
-@register.filter
-def is_hidden(field):
-    return isinstance(field.field.widget, forms.HiddenInput)
+def _widget_filter(name, kind, doc=None):
+    """Create and register a filter that determines whether a field's widget is of the given kind.
 
+    :param name: The name of the filter.
+    :type name: str
 
-@register.filter
-def is_markdown(field):
-    return field.field.widget.__class__.__name__ == "MarkdownWidget"
+    :param kind: The kind of widget. See ``htmgel.library.forms.get_widget_kinds()``.
+    :type kind: str
 
+    :param doc: The docstring of the filter.
+    :type doc: str
 
-@register.filter
-def is_multiple_checkbox(field):
-    return isinstance(field.field.widget, forms.CheckboxSelectMultiple)
+    :rtype: callable
 
+    """
+    def is_kind(field):
+        try:
+            return kind in _widget_kinds[field.field.widget.__class__]
+        except (AttributeError, KeyError):
+            return kind in _get_widget_kinds(field)
 
-@register.filter
-def is_password(field):
-    return isinstance(field.field.widget, forms.PasswordInput)
+    is_kind.__name__ = is_kind.__qualname__ = name
+    is_kind.__doc__ = doc or "Determines whether the field's widget is of the ``%s`` kind." % kind
 
+    return register.filter(name, is_kind)
 
-@register.filter
-def is_radio(field):
-    return isinstance(field.field.widget, forms.RadioSelect)
+
+is_checkbox = _widget_filter("is_checkbox", "checkbox")
+is_clearable_file = _widget_filter("is_clearable_file", "clearable_file")
+is_date = _widget_filter("is_date", "date", doc="Determines whether the field is a ``DateInput``.")
+is_datetime = _widget_filter("is_datetime", "datetime")
+is_file = _widget_filter("is_file", "file")
+is_hidden = _widget_filter("is_hidden", "hidden")
+is_markdown = _widget_filter("is_markdown", "markdown")
+is_multiple_checkbox = _widget_filter("is_multiple_checkbox", "checkbox_multiple")
+is_password = _widget_filter("is_password", "password")
+is_radio = _widget_filter("is_radio", "radio")
+is_select = _widget_filter("is_select", "select")
+is_select_multiple = _widget_filter("is_select_multiple", "select_multiple")
+is_text = _widget_filter("is_text", "textarea")
 
 
 @register.filter
@@ -227,18 +456,30 @@ def is_required(field):
 
 
 @register.filter
-def is_select(field):
-    return isinstance(field.field.widget, forms.Select)
+def widget_kind(field):
+    """Get the kind of a field's widget, which is computed once per widget class.
 
+    :rtype: str
 
-@register.filter
-def is_select_multiple(field):
-    return isinstance(field.field.widget, forms.SelectMultiple)
+    Example:
+
+    .. code::
 
+        {% with kind=field|widget_kind %}
+            {% if kind == "checkbox" %}
+                ...
+            {% elif kind == "date" %}
+                ...
+            {% endif %}
+        {% endwith %}
 
-@register.filter
-def is_text(field):
-    return isinstance(field.field.widget, forms.Textarea)
+    See ``htmgel.library.forms.get_widget_kind()`` for the kinds of widget.
+
+    """
+    if get_widget_kind is None:
+        _import_deferred()
+
+    return get_widget_kind(field)
 
 
 @register.filter
@@ -256,3 +497,19 @@ def widget_type(field):
         return field.field.widget.__class__.__name__
     except AttributeError:
         return field.widget.__class__.__name__
+
+
+def _get_widget_kinds(field):
+    """Get every kind that a field's widget is an instance of, adding the kinds of a bound field's widget class to
+    ``_widget_kinds``."""
+    if get_widget_kinds is None:
+        _import_deferred()
+
+    try:
+        widget_class = field.field.widget.__class__
+    except AttributeError:
+        return get_widget_kinds(field)[1]
+
+    kinds = _widget_kinds[widget_class] = get_widget_kinds(field)[1]
+
+    return kinds
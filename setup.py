@@ -24,6 +24,7 @@ setup(
     packages=find_packages(),
     include_package_data=True,
     install_requires=["bs4"],
+    python_requires=">=3.7",
     extras_require = {
         'bootstrap3': "django-htmgel-bootstrap3",
         'bootstrap4': "django-htmgel-bootstrap4",
@@ -36,9 +37,8 @@ setup(
         'License :: OSI Approved :: BSD License',
         'Operating System :: OS Independent',
         'Programming Language :: Python',
-        'Programming Language :: Python :: 2.7',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.6',
+        'Programming Language :: Python :: 3 :: Only',
         'Programming Language :: Python :: 3.7',
         'Framework :: Django',
     ],
@@ -0,0 +1,31 @@
+# Imports
+
+import django
+from django.conf import settings
+import os
+
+# Settings
+
+TESTS_PATH = os.path.dirname(os.path.abspath(__file__))
+
+if not settings.configured:
+    settings.configure(
+        DATABASES={
+            'default': {
+                'ENGINE': "django.db.backends.sqlite3",
+                'NAME': ":memory:",
+            },
+        },
+        INSTALLED_APPS=[
+            "django.contrib.auth",
+            "django.contrib.contenttypes",
+            "tests.testapp",
+        ],
+        TEMPLATES=[
+            {
+                'BACKEND': "django.template.backends.django.DjangoTemplates",
+                'DIRS': [os.path.join(TESTS_PATH, "templates")],
+            },
+        ],
+    )
+    django.setup()
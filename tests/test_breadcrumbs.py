@@ -1,10 +1,35 @@
-# import mock
+from django.test import override_settings
 import unittest
-from htmgel.library import Breadcrumb, Breadcrumbs
+from unittest import mock
+from htmgel.library import Breadcrumb, Breadcrumbs, clear_breadcrumbs, register_breadcrumb
 
 # Helpers
 
 
+class Project(object):
+
+    def __init__(self, pk, title):
+        self.pk = pk
+        self.title = title
+
+    def __str__(self):
+        return self.title
+
+
+class Task(Project):
+    pass
+
+
+def get_model(*instances):
+    """Get a fake model whose manager returns the given instances from ``in_bulk()``."""
+    model = mock.Mock()
+    model._default_manager.in_bulk.side_effect = lambda values, field_name="pk": {
+        i.pk: i for i in instances if i.pk in values
+    }
+
+    return model
+
+
 # Tests
 
 
@@ -38,11 +63,81 @@ class TestBreadcrumbs(unittest.TestCase):
 
         self.assertEqual(3, count)
 
-    # Can't test without django project and settings.
-    # def test_add(self):
-    #     """Check adding a breadcrumb from a pattern."""
-    #     with mock.patch("django.urls.base.reverse", return_value="projects/detail/1"):
-    #         crumbs = Breadcrumbs()
-    #         crumbs.add("Test Project", "project_detail", pattern_args=[1])
-    #
-    #         self.assertEqual("projects/detail/1", crumbs.items[0].url)
+    def test_add(self):
+        """Check adding a breadcrumb from a pattern, which is reversed when used."""
+        with mock.patch("htmgel.library.breacrumbs.reverse_url", return_value="/projects/1/") as reverse_url:
+            crumbs = Breadcrumbs()
+            crumbs.add("Test Project", "project_detail", pattern_args=[1], namespace="projects")
+            reverse_url.assert_not_called()
+
+            self.assertEqual("/projects/1/", crumbs.items[0].url)
+            reverse_url.assert_called_once_with("project_detail", args=[1], kwargs=None, namespace="projects")
+
+    def test_add_with_urlconf(self):
+        """Check the URL of a breadcrumb added from a pattern."""
+        crumbs = Breadcrumbs()
+        crumbs.add("Home", "/")
+        crumbs.add("Task", "task_detail", pattern_kwargs={'project': 1, 'pk': 2}, namespace="projects")
+
+        with override_settings(ROOT_URLCONF="tests.urls"):
+            self.assertEqual(["/", "/projects/1/tasks/2/"], [b.get_absolute_url() for b in crumbs])
+
+
+class TestBreadcrumbsForRequest(unittest.TestCase):
+
+    def setUp(self):
+        self.settings = override_settings(ROOT_URLCONF="tests.urls")
+        self.settings.enable()
+
+        self.projects = get_model(Project(1, "Alpha"), Project(2, "Beta"))
+        self.tasks = get_model(Task(5, "Design"))
+
+        register_breadcrumb("home", "Home")
+        register_breadcrumb("projects:project_list", "Projects", parent="home")
+        register_breadcrumb("projects:project_detail", parent="projects:project_list", model=self.projects)
+        register_breadcrumb(
+            "projects:task_detail",
+            title=lambda task: "Task: %s" % task.title,
+            parent="projects:project_detail",
+            model=self.tasks,
+            kwargs=["project", "pk"],
+            parent_kwargs={'pk': "project"}
+        )
+
+    def tearDown(self):
+        clear_breadcrumbs()
+        self.settings.disable()
+
+    def test_for_request(self):
+        """Check that the breadcrumbs of a request are built from the definitions."""
+        request = mock.Mock(resolver_match=mock.Mock(view_name="projects:task_detail", kwargs={'project': 2, 'pk': 5}))
+
+        crumbs = Breadcrumbs.for_request(request)
+
+        self.assertEqual(["Home", "Projects", "Beta", "Task: Design"], [c.text for c in crumbs])
+        self.assertEqual(["/", "/projects/", "/projects/2/", "/projects/2/tasks/5/"], [c.url for c in crumbs])
+
+        # Each model is queried once.
+        self.projects._default_manager.in_bulk.assert_called_once_with([2], field_name="pk")
+        self.tasks._default_manager.in_bulk.assert_called_once_with([5], field_name="pk")
+
+    def test_for_request_with_object(self):
+        """Check that the object of the current view is not fetched again."""
+        request = mock.Mock(resolver_match=mock.Mock(view_name="projects:project_detail", kwargs={'pk': "1"}))
+
+        crumbs = Breadcrumbs.for_request(request, obj=Project(1, "Current"))
+
+        self.assertEqual(["Home", "Projects", "Current"], [c.text for c in crumbs])
+        self.projects._default_manager.in_bulk.assert_not_called()
+
+    def test_for_view(self):
+        """Check the breadcrumbs of views that are not registered or have no arguments."""
+        self.assertEqual(0, len(Breadcrumbs.for_view("unregistered")))
+
+        with mock.patch("htmgel.library.breacrumbs.reverse_url", return_value="/") as reverse_url:
+            Breadcrumbs.for_view("projects:project_list")
+            crumbs = Breadcrumbs.for_view("projects:project_list")
+
+            # The static breadcrumbs are cached.
+            self.assertEqual(2, reverse_url.call_count)
+            self.assertEqual(["Home", "Projects"], [c.text for c in crumbs])
@@ -0,0 +1,72 @@
+import unittest
+from django.utils.safestring import mark_safe
+from htmgel.cache import FragmentCache, get_fragment_key
+from .testapp.models import Client, Invoice
+
+# Tests
+
+
+class TestFragmentCache(unittest.TestCase):
+
+    def test_get(self):
+        """Check getting and setting fragments in process."""
+        fragments = FragmentCache(alias=None)
+        self.assertIsNone(fragments.get("header"))
+
+        fragments.set("header", "<h1>Testing</h1>")
+        self.assertEqual("<h1>Testing</h1>", fragments.get("header"))
+
+        fragments.set("footer", "<footer></footer>", timeout=-1)
+        self.assertIsNone(fragments.get("footer"))
+
+        fragments.clear()
+        self.assertIsNone(fragments.get("header"))
+
+    def test_max_size(self):
+        """Check that the least recently used fragments are evicted."""
+        fragments = FragmentCache(alias=None, max_size=2)
+        fragments.set("a", "A")
+        fragments.set("b", "B", timeout=None)
+        fragments.get("a")
+        fragments.set("c", "C")
+
+        self.assertEqual("A", fragments.get("a"))
+        self.assertIsNone(fragments.get("b"))
+        self.assertEqual("C", fragments.get("c"))
+
+
+class TestGetFragmentKey(unittest.TestCase):
+
+    def test_get_fragment_key(self):
+        """Check that keys depend on the arguments but not their order."""
+        a = get_fragment_key("page_header", {'title': "Projects", 'level': 1}, "bootstrap3")
+        b = get_fragment_key("page_header", {'level': 1, 'title': "Projects"}, "bootstrap3")
+        c = get_fragment_key("page_header", {'level': 1, 'title': "Projects"}, "foundation6")
+
+        self.assertTrue(a.startswith("htmgel:page_header:"))
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, c)
+
+    def test_values(self):
+        """Check keys derived from values whose repr() does not identify them."""
+        a = get_fragment_key("client", {'client': Client(pk=1, name="Acme")})
+        b = get_fragment_key("client", {'client': Client(pk=1, name="Acme Inc")})
+        c = get_fragment_key("client", {'client': Client(pk=2, name="Acme")})
+        d = get_fragment_key("client", {'client': Invoice(pk=1, number="Acme")})
+
+        # Model instances are identified by their model and primary key.
+        self.assertEqual(a, b)
+        self.assertEqual(4, len(set([a, c, d, get_fragment_key("client", {'client': "Acme"})])))
+
+        # Values with the same repr() but a different type are not rendered the same.
+        self.assertNotEqual(get_fragment_key("p", {'text': "<b>"}), get_fragment_key("p", {'text': mark_safe("<b>")}))
+        self.assertNotEqual(get_fragment_key("p", {'level': 1}), get_fragment_key("p", {'level': True}))
+
+        self.assertEqual(
+            get_fragment_key("p", {'items': [1, {'b': 2, 'a': 1}]}),
+            get_fragment_key("p", {'items': [1, {'a': 1, 'b': 2}]})
+        )
+
+        self.assertRaises(ValueError, get_fragment_key, "client", {'client': Client(name="Acme")})
+        self.assertRaises(ValueError, get_fragment_key, "p", {'value': object()})
+        self.assertRaises(ValueError, get_fragment_key, "p", {'items': [object()]})
@@ -0,0 +1,117 @@
+from django.core.management import call_command
+from django.template import Context, Engine, engines
+from django.test import override_settings
+from io import StringIO
+import os
+import sys
+import tempfile
+import unittest
+from htmgel.compiler import CompilationError, Runtime, TemplateCompiler, get_compiled_renderer, \
+    reset_compiled_renderers
+from htmgel.management.commands.htmgel_compile import Command
+
+# Helpers
+
+
+def render(function, values):
+    """Render a compiled template within the context of an (empty) template, as when called by the html tag."""
+    context = Context(values)
+    with context.bind_template(Engine.get_default().from_string("")):
+        return function(context)
+
+
+def load(source):
+    """Execute the source of a compiled module."""
+    namespace = dict()
+    exec(compile(source, "<compiled>", "exec"), namespace)
+
+    return namespace
+
+# Tests
+
+
+class TestTemplateCompiler(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = engines['django'].engine
+        self.values = {
+            'HTML_FRAMEWORK': "bootstrap3",
+            'html': "<b>bold</b>",
+            'items': ["<one>", "two"],
+            'label': "Snap!",
+            'message': "Something & something",
+            'pairs': [("a", 1), ("b", 2)],
+            'status': "warning",
+        }
+
+    def test_add(self):
+        """Check that compiled output is the same as the template's."""
+        compiler = TemplateCompiler(framework="bootstrap3")
+        compiler.add("htmgel/alert.html")
+
+        self.assertEqual(["htmgel/foundation6/alert.html"], list(compiler.uncompiled.keys()))
+
+        renderers = load(compiler.get_source())['RENDERERS']
+        function = renderers[("bootstrap3", "htmgel/alert.html")]
+
+        for values in (self.values, {'HTML_FRAMEWORK': "bootstrap3"}, {'message': "Default"}):
+            expected = self.engine.get_template("htmgel/alert.html").render(Context(values))
+            self.assertEqual(expected, render(function, values))
+
+    def test_add_unsupported(self):
+        """Check that templates with unsupported tags are not compiled."""
+        compiler = TemplateCompiler()
+        with self.assertRaises(CompilationError):
+            compiler.add("htmgel/unsupported.html")
+
+
+class TestRuntime(unittest.TestCase):
+
+    def test_loop(self):
+        """Check that the context is restored when the body of a loop raises an exception."""
+        runtime = Runtime()
+        context = Context({'pairs': [("a", 1), ("b", 2)]})
+        count = len(context.dicts)
+
+        def render():
+            for _ in runtime.loop(context, runtime.expression("pairs"), ["key", "value"], False):
+                raise ValueError()
+
+        self.assertRaises(ValueError, render)
+        self.assertEqual(count, len(context.dicts))
+        self.assertNotIn("key", context)
+
+
+class TestGetCompiledRenderer(unittest.TestCase):
+
+    def tearDown(self):
+        reset_compiled_renderers()
+
+    def test_get_compiled_renderer(self):
+        """Check that renderers are loaded from the compiled module."""
+        self.assertIsNone(get_compiled_renderer("htmgel/page_header.html"))
+
+        path = tempfile.mkdtemp()
+        sys.path.insert(0, path)
+        try:
+            with override_settings(HTMGEL_COMPILED_TEMPLATES="htmgel_compiled_test"):
+                reset_compiled_renderers()
+
+                output = StringIO()
+                call_command(Command(), "page_header", "nonexistent", framework="bootstrap3",
+                             output=os.path.join(path, "htmgel_compiled_test.py"), stdout=output)
+                self.assertIn("Compiled 1 templates", output.getvalue())
+
+                function = get_compiled_renderer("htmgel/page_header.html", framework="bootstrap3")
+                self.assertEqual("<h1>Testing</h1>\n", render(function, {'title': "Testing"}))
+        finally:
+            sys.path.remove(path)
+            sys.modules.pop("htmgel_compiled_test", None)
+
+    def test_missing_module(self):
+        """Check that a warning is logged when the compiled module cannot be imported."""
+        with override_settings(HTMGEL_COMPILED_TEMPLATES="htmgel_compiled_missing"):
+            reset_compiled_renderers()
+
+            with self.assertLogs("htmgel.compiler", level="WARNING"):
+                self.assertIsNone(get_compiled_renderer("htmgel/page_header.html", framework="bootstrap3"))
@@ -0,0 +1,66 @@
+from decimal import Decimal
+import unittest
+from htmgel.currency import format_currency, format_currency_many, get_currency_formatter
+
+# Tests
+
+
+class TestFormatCurrency(unittest.TestCase):
+
+    def test_format_currency(self):
+        """Check the format of amounts in English."""
+        self.assertEqual("$1,234.50", format_currency(Decimal("1234.5"), locale="en"))
+        self.assertEqual("$10.99", format_currency("10.99", locale="en"))
+        self.assertEqual("-$1,000.00", format_currency(-1000, locale="en"))
+        self.assertEqual("&euro;0.01", format_currency(Decimal("0.005"), unit="EUR", locale="en"))
+        self.assertEqual("$2.68", format_currency(2.675, locale="en"))
+        self.assertEqual("$0.00", format_currency(Decimal("-0.001"), locale="en"))
+        self.assertEqual("&yen;1,235", format_currency(Decimal("1234.5"), unit="JPY", locale="en"))
+        self.assertEqual("CHF&nbsp;5.00", format_currency(5, unit="CHF", locale="en"))
+        self.assertEqual("XYZ&nbsp;5.00", format_currency(5, unit="XYZ", locale="en"))
+        self.assertEqual("", format_currency(None))
+
+        with self.assertRaises(ValueError):
+            format_currency("ten")
+
+    def test_format_currency_with_large_int(self):
+        """Check that integers are formatted exactly, however large."""
+        self.assertEqual("$100,000,000,000,000,001.00", format_currency(10 ** 17 + 1, locale="en"))
+        self.assertEqual("-$100,000,000,000,000,001.00", format_currency(-10 ** 17 - 1, locale="en"))
+        self.assertEqual("&yen;100,000,000,000,000,001", format_currency(10 ** 17 + 1, unit="JPY", locale="en"))
+        self.assertEqual("100.000.000.000.000.001,00&nbsp;&euro;",
+                         format_currency(10 ** 17 + 1, unit="EUR", locale="de"))
+
+    def test_format_currency_with_bool(self):
+        """Check that booleans are amounts of one and zero, as with other integers."""
+        self.assertEqual("$1.00", format_currency(True, locale="en"))
+        self.assertEqual("$0.00", format_currency(False, locale="en"))
+        self.assertEqual(["$1.00", "$0.00"], format_currency_many([True, False], locale="en"))
+
+    def test_format_currency_not_finite(self):
+        """Check that amounts which are not finite are rejected."""
+        for amount in (Decimal("NaN"), Decimal("-NaN"), Decimal("sNaN"), Decimal("Infinity"), float("nan"),
+                       float("-inf"), "NaN", "Infinity"):
+            with self.assertRaises(ValueError, msg=repr(amount)):
+                format_currency(amount, locale="en")
+
+    def test_format_currency_with_locale(self):
+        """Check separators and symbol placement of other locales."""
+        self.assertEqual("1.234,50&nbsp;&euro;", format_currency(Decimal("1234.5"), unit="EUR", locale="de"))
+        self.assertEqual("-1.234,50&nbsp;&euro;", format_currency(Decimal("-1234.5"), unit="EUR", locale="de-at"))
+        self.assertEqual("1&#8239;234,50&nbsp;&euro;", format_currency(Decimal("1234.5"), unit="EUR", locale="fr_FR"))
+        self.assertEqual("$1,234.50", format_currency(Decimal("1234.5"), locale="xx"))
+
+    def test_format_currency_many(self):
+        """Check formatting a number of amounts."""
+        self.assertEqual(
+            ["$1.00", "", "$2,000.25"],
+            format_currency_many([1, None, Decimal("2000.25")], locale="en")
+        )
+
+    def test_get_currency_formatter(self):
+        """Check that formatters are built once for each currency and locale."""
+        formatter = get_currency_formatter("EUR", locale="de")
+        self.assertIs(formatter, get_currency_formatter("EUR", locale="de"))
+        self.assertIsNot(formatter, get_currency_formatter("EUR", locale="fr"))
+        self.assertEqual("<CurrencyFormatter EUR de>", repr(formatter))
@@ -0,0 +1,255 @@
+import builtins
+from django import forms
+import unittest
+from unittest import mock
+from htmgel.library.forms import Fieldset, Layout, LayoutColumn, LayoutRow, clear_form_render_plans, \
+    get_form_render_plan, get_widget_kind, get_widget_kinds
+from htmgel.library import forms as forms_module
+from htmgel.templatetags import htmgel_tags
+
+# Helpers
+
+
+class ExampleForm(forms.Form):
+    agree = forms.BooleanField(required=False)
+    attachment = forms.FileField()
+    notes = forms.CharField(widget=forms.Textarea)
+    status = forms.ChoiceField(choices=(("open", "Open"), ("closed", "Closed")))
+    tags = forms.MultipleChoiceField(choices=(("a", "A"),), widget=forms.CheckboxSelectMultiple)
+    title = forms.CharField()
+
+
+class DynamicForm(forms.Form):
+    title = forms.CharField()
+
+    def __init__(self, *args, **kwargs):
+        label = kwargs.pop("label", None)
+        optional = kwargs.pop("optional", False)
+        super(DynamicForm, self).__init__(*args, **kwargs)
+
+        if label:
+            self.fields['title'].label = label
+
+        if optional:
+            self.fields['title'].required = False
+
+
+class LayoutForm(forms.Form):
+    layout = Layout(
+        Fieldset("Name", [
+            LayoutRow("first_name", LayoutColumn("last_name", size=4, classes="last")),
+        ]),
+        "removed",
+        LayoutRow("email"),
+    )
+
+    email = forms.EmailField()
+    first_name = forms.CharField()
+    last_name = forms.CharField()
+    notes = forms.CharField(required=False, widget=forms.Textarea)
+
+
+class MarkdownWidget(forms.Textarea):
+    pass
+
+
+class PickerInput(forms.DateInput):
+    pass
+
+# Tests
+
+
+class TestWidgetKind(unittest.TestCase):
+
+    def setUp(self):
+        self.form = ExampleForm()
+
+    def test_get_widget_kind(self):
+        """Check the kind of widgets, fields and bound fields."""
+        self.assertEqual("checkbox", get_widget_kind(self.form['agree']))
+        self.assertEqual("clearable_file", get_widget_kind(self.form['attachment']))
+        self.assertEqual("textarea", get_widget_kind(self.form.fields['notes']))
+        self.assertEqual("select", get_widget_kind(forms.Select()))
+        self.assertEqual("checkbox_multiple", get_widget_kind(self.form['tags']))
+        self.assertEqual("text", get_widget_kind(self.form['title']))
+        self.assertEqual("other", get_widget_kind(forms.NumberInput()))
+
+    def test_get_widget_kinds(self):
+        """Check that the kinds follow the MRO of custom widgets."""
+        kind, kinds = get_widget_kinds(PickerInput())
+        self.assertEqual("date", kind)
+        self.assertEqual(frozenset(["date", "text"]), kinds)
+
+        kind, kinds = get_widget_kinds(MarkdownWidget())
+        self.assertEqual("markdown", kind)
+        self.assertEqual(frozenset(["markdown", "textarea"]), kinds)
+
+        self.assertIs(get_widget_kinds(forms.Select()), get_widget_kinds(forms.Select()))
+
+    def test_filters(self):
+        """Check that the filters match isinstance() for each widget."""
+        filters = (
+            (htmgel_tags.is_checkbox, forms.CheckboxInput),
+            (htmgel_tags.is_clearable_file, forms.ClearableFileInput),
+            (htmgel_tags.is_date, forms.DateInput),
+            (htmgel_tags.is_datetime, forms.DateTimeInput),
+            (htmgel_tags.is_file, forms.FileInput),
+            (htmgel_tags.is_hidden, forms.HiddenInput),
+            (htmgel_tags.is_multiple_checkbox, forms.CheckboxSelectMultiple),
+            (htmgel_tags.is_password, forms.PasswordInput),
+            (htmgel_tags.is_radio, forms.RadioSelect),
+            (htmgel_tags.is_select, forms.Select),
+            (htmgel_tags.is_select_multiple, forms.SelectMultiple),
+            (htmgel_tags.is_text, forms.Textarea),
+        )
+
+        widgets = [cls() for f, cls in filters] + [forms.NullBooleanSelect(), forms.TextInput(), PickerInput()]
+        for widget in widgets:
+            field = forms.Field(widget=widget)
+            for f, cls in filters:
+                self.assertEqual(isinstance(widget, cls), f(field), "%s(%s)" % (f.__name__, widget.__class__.__name__))
+
+        self.assertTrue(htmgel_tags.is_markdown(forms.Field(widget=MarkdownWidget())))
+        self.assertFalse(htmgel_tags.is_markdown(self.form['notes']))
+        self.assertEqual("checkbox", htmgel_tags.widget_kind(self.form['agree']))
+
+        # Once a widget class has been classified, the filters only look up its kinds.
+        for field in self.form:
+            htmgel_tags.is_checkbox(field)
+
+        with mock.patch("builtins.__import__", wraps=builtins.__import__) as _import:
+            with mock.patch.object(htmgel_tags, "_get_widget_kinds", wraps=htmgel_tags._get_widget_kinds) as _kinds:
+                for field in self.form:
+                    for f, cls in filters:
+                        f(field)
+
+        _import.assert_not_called()
+        _kinds.assert_not_called()
+
+
+class TestFormRenderPlan(unittest.TestCase):
+
+    def setUp(self):
+        clear_form_render_plans()
+
+    def test_get_form_render_plan(self):
+        """Check that plans are cached by form class and prefix."""
+        plan = get_form_render_plan(ExampleForm())
+        self.assertIs(plan, get_form_render_plan(ExampleForm(data={'title': "Example"})))
+        self.assertIsNot(plan, get_form_render_plan(ExampleForm(prefix="other")))
+        self.assertIsNot(plan, get_form_render_plan(ExampleForm(), framework="bootstrap4"))
+
+        self.assertEqual(
+            ("checkbox", "clearable_file", "textarea", "select", "checkbox_multiple", "text"),
+            plan.kinds
+        )
+        self.assertEqual((False, True, True, True, True, True), plan.required)
+
+    def test_get_form_render_plan_with_changed_fields(self):
+        """Check that a form which changes its fields does not use a stale plan."""
+        required = get_form_render_plan(DynamicForm())
+        optional = get_form_render_plan(DynamicForm(optional=True))
+
+        self.assertEqual((True,), required.required)
+        self.assertEqual((False,), optional.required)
+
+    def test_get_form_render_plan_with_changed_text(self):
+        """Check that the text of labels is added when rendering, so that forms with other labels share a plan."""
+        form = DynamicForm(label="Name")
+        plan = get_form_render_plan(form)
+
+        self.assertIs(plan, get_form_render_plan(DynamicForm()))
+        self.assertIn(">Name <span", plan.render(form))
+        self.assertIn(">Title <span", plan.render(DynamicForm()))
+
+    def test_max_plans(self):
+        """Check that the least recently used plans are discarded."""
+        with mock.patch.object(forms_module, "MAX_FORM_RENDER_PLANS", 2):
+            plan = get_form_render_plan(ExampleForm())
+            get_form_render_plan(DynamicForm())
+            get_form_render_plan(ExampleForm())
+            get_form_render_plan(LayoutForm())
+
+            self.assertIs(plan, get_form_render_plan(ExampleForm()))
+            self.assertIsNot(plan, get_form_render_plan(ExampleForm(), framework="bootstrap4"))
+            self.assertEqual(2, len(forms_module._plans))
+
+    def test_render(self):
+        """Check the output of a form with values and errors."""
+        form = ExampleForm(data={'title': "<Example>", 'status': "open"})
+        form.is_valid()
+
+        output = get_form_render_plan(form, framework="bootstrap3").render(form)
+
+        self.assertIn('<div class="checkbox"><label><input type="checkbox" name="agree"', output)
+        self.assertIn('<label for="id_title" class="control-label">Title <span class="text-danger">*</span></label>',
+                      output)
+        self.assertIn('value="&lt;Example&gt;"', output)
+        self.assertIn('class="form-control"', output)
+        self.assertIn('<div class="form-group has-error"><label for="id_notes"', output)
+        self.assertIn('<p class="error">This field is required.</p>', output)
+
+        # The same plan renders the values and errors of another instance.
+        form = ExampleForm()
+        output = get_form_render_plan(form, framework="bootstrap3").render(form)
+        self.assertNotIn("has-error", output)
+        self.assertNotIn("Example", output)
+
+        self.assertEqual(output, htmgel_tags.render_form(form))
+
+    def test_render_hidden_errors(self):
+        """Check that the errors of hidden fields are shown with the errors of the form."""
+        class HiddenForm(forms.Form):
+            token = forms.CharField(widget=forms.HiddenInput)
+            title = forms.CharField()
+
+            def clean(self):
+                raise forms.ValidationError("<Invalid>")
+
+        form = HiddenForm(data={'title': "Example"})
+        form.is_valid()
+
+        output = get_form_render_plan(form, framework="bootstrap3").render(form)
+
+        hidden = '<p class="error">(Hidden field token) This field is required.</p>'
+        self.assertIn(hidden, output)
+        self.assertIn('<p class="error">&lt;Invalid&gt;</p>', output)
+        self.assertLess(output.index(hidden), output.index("&lt;Invalid&gt;"))
+        self.assertIn('<input type="hidden" name="token"', output)
+
+
+class TestLayout(unittest.TestCase):
+
+    def setUp(self):
+        clear_form_render_plans()
+
+    def test_get_parts(self):
+        """Check that a layout is compiled once into static HTML and fields."""
+        form = LayoutForm()
+        plan = get_form_render_plan(form)
+
+        parts = LayoutForm.layout.get_parts(plan)
+        self.assertIs(parts, LayoutForm.layout.get_parts(get_form_render_plan(LayoutForm())))
+
+        self.assertEqual(
+            '<fieldset><legend>Name</legend><div class="row"><div class="col-md-8">',
+            parts[0]
+        )
+        self.assertEqual(
+            ["first_name", "last_name", "email", "notes"],
+            [p.name for p in parts if not isinstance(p, str)]
+        )
+
+    def test_render(self):
+        """Check the output of a form with a layout."""
+        form = LayoutForm(data={'first_name': "Alice"})
+        form.is_valid()
+
+        output = LayoutForm.layout.render(form, framework="foundation6")
+        self.assertIn('<div class="grid-x grid-padding-x"><div class="cell medium-8">', output)
+        self.assertIn('<div class="last cell medium-4"><div class="is-invalid-label">', output)
+        self.assertIn('value="Alice"', output)
+        self.assertTrue(output.endswith("</textarea></div>"))
+
+        self.assertEqual(output, "".join(LayoutForm.layout.iter_html(form, framework="foundation6")))
+        self.assertEqual(LayoutForm.layout.render(form), htmgel_tags.render_form(form))
@@ -1,5 +1,9 @@
+from django.forms.utils import flatatt
+from django.test import override_settings
 import unittest
 from htmgel.library import BaseHTML, Link
+from htmgel.resolvers import URLTemplate, clear_url_cache
+from htmgel.library.html import flatten_attributes, get_class_attribute
 
 # Tests
 
@@ -24,6 +28,54 @@ class TestBaseHTML(unittest.TestCase):
 
         # self.assertEqual('<span class="bold" id="myspan">testing</span>', span.to_html())
 
+    def test_set_attribute(self):
+        """Check that changing attributes updates the output."""
+        span = BaseHTML("testing", id="myspan")
+        self.assertEqual(' id="myspan"', span.attributes)
+
+        span.set_attribute("title", "Testing")
+        self.assertEqual(' id="myspan" title="Testing"', span.attributes)
+
+        span.add_class("bold", "italic")
+        span.add_class("bold")
+        self.assertEqual('span class="bold italic" id="myspan" title="Testing"', span.get_open_tag())
+
+        span.remove_attribute("title")
+        span.remove_attribute("title")
+        self.assertEqual('<BaseHTML span class="bold italic" id="myspan">', repr(span))
+
+
+class TestFlattenAttributes(unittest.TestCase):
+
+    def test_flatten_attributes(self):
+        """Check that identical attributes share the same output."""
+        a = flatten_attributes({'class': "row", 'data-id': 1})
+        b = flatten_attributes({'class': "row", 'data-id': 1})
+        self.assertEqual(' class="row" data-id="1"', a)
+        self.assertIs(a, b)
+
+        # The output is identical to that of flatatt(), whatever the order of the attributes.
+        examples = (
+            {'data-id': 1, 'class': "row"},
+            {'required': True, 'id': "x", 'class': "a", 'hidden': False},
+        )
+        for attributes in examples:
+            self.assertEqual(flatatt(attributes), flatten_attributes(attributes))
+
+        self.assertEqual(' disabled', flatten_attributes({'disabled': True}))
+        self.assertEqual(' disabled="1"', flatten_attributes({'disabled': 1}))
+        self.assertEqual(' data-ids="[1, 2]"', flatten_attributes({'data-ids': [1, 2]}))
+        self.assertEqual("", flatten_attributes({}))
+
+
+class TestGetClassAttribute(unittest.TestCase):
+
+    def test_get_class_attribute(self):
+        """Check that empty class names are skipped and the names are escaped."""
+        self.assertEqual(' class="nav-item active"', get_class_attribute("nav-item", "", None, "active"))
+        self.assertEqual(' class="a&amp;b"', get_class_attribute("a&b"))
+        self.assertEqual("", get_class_attribute("", None))
+
 
 class TestLink(unittest.TestCase):
 
@@ -35,3 +87,26 @@ class TestLink(unittest.TestCase):
 
         link = Link("http://example.com", text="Example")
         self.assertEqual('<a href="http://example.com">Example</a>', link.to_html())
+
+    def test_pattern_name(self):
+        """Check that a link to a URL pattern is reversed when it is rendered."""
+        with override_settings(ROOT_URLCONF="tests.urls"):
+            clear_url_cache()
+
+            link = Link(pattern_name="project_detail", pattern_args=[1], namespace="projects", text="Project")
+            self.assertEqual("/projects/1/", link.url)
+            self.assertEqual('<a href="/projects/1/">Project</a>', link.to_html())
+
+            link = Link(pattern_name="home")
+            self.assertEqual('<a href="/">/</a>', link.to_html())
+
+    def test_from_template(self):
+        """Check that links are created for a number of objects."""
+        with override_settings(ROOT_URLCONF="tests.urls"):
+            clear_url_cache()
+
+            links = Link.from_template(URLTemplate("projects:project_detail"), [1, 2], text="View", classes="btn")
+            self.assertEqual(
+                ['<a class="btn" href="/projects/1/">View</a>', '<a class="btn" href="/projects/2/">View</a>'],
+                [link.to_html() for link in links]
+            )
@@ -0,0 +1,138 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
+import json
+import os
+import tempfile
+import unittest
+from htmgel.icons import IconRegistry, UnknownIcon, get_icon_registry, load_icon_set, render_icon
+
+# Helpers
+
+SPRITE = """<?xml version="1.0" encoding="utf-8"?>
+<svg xmlns="http://www.w3.org/2000/svg" style="display: none;">
+    <symbol id="user" viewBox="0 0 16 16"><path d="M8 8a3 3 0 1 0 0-6 3 3 0 0 0 0 6z"/></symbol>
+    <symbol id="home" viewBox="0 0 16 16"><path d="M8 1l7 7h-2v7H3V8H1z"/></symbol>
+</svg>
+"""
+
+# Tests
+
+
+class TestIconRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        for file_name in os.listdir(self.path):
+            os.remove(os.path.join(self.path, file_name))
+
+        os.rmdir(self.path)
+
+    def write(self, file_name, content):
+        path = os.path.join(self.path, file_name)
+        with open(path, "w") as f:
+            f.write(content)
+
+        return path
+
+    def test_font(self):
+        """Check the output of icon fonts, which is rendered once per name and framework."""
+        registry = IconRegistry()
+
+        output = registry.render("user")
+        self.assertEqual('<i class="fa fa-user" aria-hidden="true"></i>', output)
+        self.assertIs(output, registry.render("user"))
+
+        self.assertEqual('<span class="glyphicon glyphicon-user" aria-hidden="true"></span>',
+                         registry.render("user", framework="glyph"))
+
+        self.assertRaises(ImproperlyConfigured, registry.render, "user", framework="unknown")
+
+    def test_load_icon_set(self):
+        """Check that icon sets are loaded from each kind of manifest."""
+        path = self.write("icons.json", json.dumps(["home", "user"]))
+        self.assertEqual({'home': None, 'user': None}, load_icon_set(path))
+
+        path = self.write("fontawesome.json", json.dumps({
+            'user': {'svg': {'solid': {'raw': '<svg xmlns="http://www.w3.org/2000/svg"><path d="M1"/></svg>'}}},
+        }))
+        self.assertEqual(
+            '<svg class="icon icon-user" aria-hidden="true" focusable="false" xmlns="http://www.w3.org/2000/svg">'
+            '<path d="M1"/></svg>',
+            load_icon_set(path)['user']
+        )
+
+        path = self.write("sprite.svg", SPRITE)
+        icons = load_icon_set(path)
+        self.assertEqual(["home", "user"], sorted(icons))
+        self.assertEqual(
+            '<svg xmlns="http://www.w3.org/2000/svg" class="icon icon-home" aria-hidden="true" focusable="false" '
+            'viewBox="0 0 16 16"><path d="M8 1l7 7h-2v7H3V8H1z"/></svg>',
+            icons['home']
+        )
+
+        os.remove(path)
+        os.remove(os.path.join(self.path, "icons.json"))
+        os.remove(os.path.join(self.path, "fontawesome.json"))
+        self.write("star.svg", '<?xml version="1.0"?>\n<svg viewBox="0 0 1 1"><path d="M0"/></svg>')
+        self.write("notes.txt", "Not an icon.")
+        self.assertEqual(
+            {'star': '<svg class="icon icon-star" aria-hidden="true" focusable="false" viewBox="0 0 1 1">'
+                     '<path d="M0"/></svg>'},
+            load_icon_set(self.path)
+        )
+
+        self.assertRaises(ImproperlyConfigured, load_icon_set, os.path.join(self.path, "missing.json"))
+
+    def test_sprite(self):
+        """Check the output of sprite mode."""
+        registry = IconRegistry(mode="sprite", sprite_url="/static/icons.svg")
+
+        self.assertEqual(
+            '<svg class="icon icon-user" aria-hidden="true" focusable="false">'
+            '<use href="/static/icons.svg#user"></use></svg>',
+            registry.render("user")
+        )
+
+    def test_svg(self):
+        """Check that icons are inlined in svg mode."""
+        registry = IconRegistry.from_path(self.write("sprite.svg", SPRITE), mode="svg", unknown="raise")
+
+        self.assertTrue(registry.render("user").startswith('<svg xmlns="http://www.w3.org/2000/svg" class="icon'))
+        self.assertTrue("user" in registry)
+        self.assertFalse("missing" in registry)
+
+        self.assertRaises(ImproperlyConfigured, IconRegistry, icons={'user': None}, mode="svg")
+
+    def test_unknown(self):
+        """Check each policy for icons that are not in the icon set."""
+        icons = {'home': None, 'question': None}
+
+        self.assertRaises(UnknownIcon, IconRegistry(icons, unknown="raise").render, "missing")
+
+        registry = IconRegistry(icons, fallback="question", unknown="fallback")
+        self.assertEqual('<i class="fa fa-question" aria-hidden="true"></i>', registry.render("missing"))
+
+        registry = IconRegistry(icons, unknown="log")
+        with self.assertLogs("htmgel.icons", level="WARNING") as logs:
+            self.assertEqual('<i class="fa fa-missing" aria-hidden="true"></i>', registry.render("missing"))
+            registry.render("missing")
+
+        self.assertEqual(1, len(logs.records))
+
+        self.assertRaises(ImproperlyConfigured, IconRegistry, unknown="ignore")
+
+
+class TestRenderIcon(unittest.TestCase):
+
+    def test_settings(self):
+        """Check that the registry is created from settings, and again when they change."""
+        with override_settings(HTMGEL_ICON_MODE="sprite"):
+            registry = get_icon_registry()
+            self.assertEqual("sprite", registry.mode)
+            self.assertIs(registry, get_icon_registry())
+            self.assertIn('<use href="#home">', render_icon("home"))
+
+        self.assertEqual("font", get_icon_registry().mode)
+        self.assertEqual('<i class="fa fa-home" aria-hidden="true"></i>', render_icon("home"))
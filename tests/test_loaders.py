@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.template import Engine
+from django.test import override_settings
+import os
+import unittest
+from unittest import mock
+from htmgel.frameworks import get_framework, resolve_framework
+from htmgel.loaders import get_template_names
+from . import TESTS_PATH
+
+# Tests
+
+
+class TestLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = Engine(
+            dirs=[os.path.join(TESTS_PATH, "templates")],
+            libraries={'i18n': "django.templatetags.i18n"},
+            loaders=[
+                ("htmgel.loaders.Loader", ["django.template.loaders.filesystem.Loader"]),
+            ]
+        )
+
+    def test_get_template(self):
+        """Check that components are loaded from the framework's templates."""
+        with override_settings(HTML_FRAMEWORK="bootstrap3"):
+            template = self.engine.get_template("htmgel/alert.html")
+            self.assertTrue(template.origin.name.endswith(os.path.join("bootstrap3", "alert.html")))
+
+            # There is no framework-specific template for the page header.
+            template = self.engine.get_template("htmgel/page_header.html")
+            self.assertTrue(template.origin.name.endswith(os.path.join("htmgel", "page_header.html")))
+
+        with override_settings(HTML_FRAMEWORK="foundation6"):
+            template = self.engine.get_template("htmgel/alert.html")
+            self.assertTrue(template.origin.name.endswith(os.path.join("htmgel", "alert.html")))
+
+    def test_get_template_names(self):
+        """Check which templates are looked for."""
+        self.assertEqual(
+            ["htmgel/bootstrap3/alert.html", "htmgel/alert.html"],
+            get_template_names("htmgel/alert.html", "bootstrap3")
+        )
+        self.assertEqual(["htmgel/alert.html"], get_template_names("htmgel/alert.html", None))
+        self.assertEqual(
+            ["htmgel/bootstrap3/alert.html"],
+            get_template_names("htmgel/bootstrap3/alert.html", "bootstrap3")
+        )
+        self.assertEqual(["projects/list.html"], get_template_names("projects/list.html", "bootstrap3"))
+
+
+class TestGetFramework(unittest.TestCase):
+
+    def test_get_framework(self):
+        """Check how the framework is resolved."""
+        with override_settings(HTML_FRAMEWORK="foundation6"):
+            self.assertEqual("foundation6", get_framework())
+
+        with mock.patch.object(settings, "INSTALLED_APPS", ["htmgel", "htmgel_bootstrap4"]):
+            self.assertEqual("bootstrap4", resolve_framework())
+
+        self.assertIsNone(get_framework())
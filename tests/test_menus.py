@@ -0,0 +1,125 @@
+from django.test import override_settings
+from django.utils import translation
+import unittest
+from unittest import mock
+from htmgel.library import Menu, MenuItem
+from htmgel.templatetags import htmgel_tags
+
+# Helpers
+
+
+class User(object):
+
+    def __init__(self, *permissions):
+        self.checked = list()
+        self.permissions = permissions
+
+    def has_perm(self, permission):
+        self.checked.append(permission)
+        return permission in self.permissions
+
+# Tests
+
+
+class TestMenu(unittest.TestCase):
+
+    def setUp(self):
+        self.menu = Menu(framework="bootstrap3")
+        self.menu.add("Home", "/", name="home")
+        self.menu.add("Projects", "/projects/", name="project_list", permissions="projects.view_project")
+        self.menu.add("Tasks", "/tasks/", name="task_list", permissions="projects.view_project")
+        self.menu.add("Admin", "/admin/", name="admin", permissions=["auth.change_user", "projects.view_project"])
+
+    def test_from_items(self):
+        """Check that a menu may be created from the lists of the menu_items component."""
+        menu = Menu.from_items([
+            ["Home", "/", "home", None],
+            ["Projects", "/projects/", "project_list", "projects.view_project"],
+        ])
+
+        self.assertEqual(2, len(menu))
+        self.assertEqual(("projects.view_project",), menu.items[1].permissions)
+
+    def test_get_visible_items(self):
+        """Check which items a user may see."""
+        self.assertEqual(["Home"], [i.title for i in self.menu.get_visible_items()])
+
+        user = User("projects.view_project")
+        self.assertEqual(["Home", "Projects", "Tasks"], [i.title for i in self.menu.get_visible_items(user)])
+
+        # Each permission is checked once.
+        self.assertEqual(["auth.change_user", "projects.view_project"], sorted(user.checked))
+
+    def test_render(self):
+        """Check the output of the menu."""
+        output = self.menu.render(user=User("projects.view_project"), active="project_list")
+        self.assertEqual(
+            '<ul class="nav navbar-nav"><li><a href="/">Home</a></li>'
+            '<li class="active"><a href="/projects/">Projects</a></li>'
+            '<li><a href="/tasks/">Tasks</a></li></ul>',
+            output
+        )
+
+        output = self.menu.render(active=("missing", "home"))
+        self.assertEqual('<ul class="nav navbar-nav"><li class="active"><a href="/">Home</a></li></ul>', output)
+
+    def test_render_cache(self):
+        """Check that items are rendered once for each set of permissions."""
+        with mock.patch("htmgel.library.menus._render_link", return_value="") as render_link:
+            self.menu.render(user=User("projects.view_project"))
+            self.menu.render(user=User("projects.view_project"), active="home")
+            self.assertEqual(3, render_link.call_count)
+
+            self.menu.render(user=User("projects.view_project", "auth.change_user"))
+            self.assertEqual(7, render_link.call_count)
+
+            # Switching languages does not discard the items rendered in other languages.
+            with translation.override("de"):
+                self.menu.render(user=User("projects.view_project"))
+                self.assertEqual(10, render_link.call_count)
+
+            self.menu.render(user=User("projects.view_project"))
+            self.assertEqual(10, render_link.call_count)
+
+    def test_render_cache_size(self):
+        """Check that the least recently used renderings are discarded."""
+        with mock.patch("htmgel.library.menus.MAX_RENDERED_MENUS", 2):
+            self.menu.render()
+            self.menu.render(user=User("projects.view_project"))
+            self.menu.render()
+            self.menu.render(user=User("projects.view_project", "auth.change_user"))
+
+            self.assertEqual(2, len(self.menu._cache))
+
+            with mock.patch("htmgel.library.menus._render_link", return_value="") as render_link:
+                self.menu.render()
+                self.assertEqual(0, render_link.call_count)
+
+                self.menu.render(user=User("projects.view_project"))
+                self.assertEqual(3, render_link.call_count)
+
+    def test_render_request(self):
+        """Check that the item of the current view is active."""
+        menu = Menu(framework="bootstrap4")
+        menu.add("Home", pattern_name="home")
+        menu.add("Projects", pattern_name="projects:project_list")
+
+        request = mock.Mock(resolver_match=mock.Mock(view_name="home", url_name="home"), user=None)
+
+        with override_settings(ROOT_URLCONF="tests.urls"):
+            output = menu.render_request(request)
+            self.assertIn('<li class="nav-item active"><a class="nav-link" href="/">Home</a></li>', output)
+
+            output = htmgel_tags.render_menu({'request': request}, menu)
+            self.assertIn('<li class="nav-item active">', output)
+
+
+class TestMenuItem(unittest.TestCase):
+
+    def test_url(self):
+        """Check that a pattern is reversed when the URL is used."""
+        item = MenuItem("Home", pattern_name="home")
+        self.assertEqual("home", item.name)
+
+        with override_settings(ROOT_URLCONF="tests.urls"):
+            self.assertEqual("/", item.url)
@@ -0,0 +1,160 @@
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import caches
+from django.core.paginator import EmptyPage
+from django.db import connection
+from django.http import QueryDict
+from django.test.utils import CaptureQueriesContext
+import unittest
+from unittest import mock
+from htmgel.library import Pagination, get_page_range
+from htmgel.library import pagination
+from htmgel.library.pagination import COUNT_CACHED, COUNT_ESTIMATE, COUNT_EXACT, get_estimated_count
+
+# Helpers
+
+
+def count_queries(captured):
+    return len([q for q in captured.captured_queries if "COUNT(" in q['sql']])
+
+# Tests
+
+
+class TestGetPageRange(unittest.TestCase):
+
+    def test_get_page_range(self):
+        """Check the pages that are linked."""
+        self.assertEqual([1], get_page_range(1, 1))
+        self.assertEqual([1, 2, 3, 4, 5, None, 100], get_page_range(3, 100))
+        self.assertEqual([1, None, 48, 49, 50, 51, 52, None, 100], get_page_range(50, 100))
+        self.assertEqual([1, None, 96, 97, 98, 99, 100], get_page_range(98, 100))
+
+        # A gap of one page is filled in.
+        self.assertEqual([1, 2, 3, 4, 5, 6, 7], get_page_range(4, 7))
+
+        self.assertEqual([1, None, 8, 9, 10, 11], get_page_range(10, 11, show_last=False))
+
+    def test_size_is_constant(self):
+        """Check that the number of pages linked does not depend on the number of pages."""
+        self.assertEqual(len(get_page_range(500, 1000)), len(get_page_range(500000, 1000000)))
+
+
+class TestPagination(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with connection.schema_editor() as editor:
+            editor.create_model(ContentType)
+
+        ContentType.objects.bulk_create([ContentType(app_label="app", model="model%02d" % i) for i in range(55)])
+
+    @classmethod
+    def tearDownClass(cls):
+        with connection.schema_editor() as editor:
+            editor.delete_model(ContentType)
+
+        ContentType.objects.clear_cache()
+
+    def setUp(self):
+        caches['default'].clear()
+        self.queryset = ContentType.objects.order_by("model")
+
+    def test_count_cached(self):
+        """Check that the records are counted once while the count is cached."""
+        with CaptureQueriesContext(connection) as captured:
+            self.assertEqual(55, Pagination(self.queryset, page_size=10, count=COUNT_CACHED).count)
+            self.assertEqual(55, Pagination(self.queryset, page=2, page_size=10, count=COUNT_CACHED).count)
+
+        self.assertEqual(1, count_queries(captured))
+
+    def test_count_estimate(self):
+        """Check that the count is estimated from the statistics of the database."""
+        self.assertIsNone(get_estimated_count(self.queryset.filter(model="model01")))
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        self.assertEqual(55, get_estimated_count(self.queryset))
+
+        with mock.patch.object(pagination, "ESTIMATE_THRESHOLD", 0):
+            with CaptureQueriesContext(connection) as captured:
+                p = Pagination(self.queryset, page_size=10, count=COUNT_ESTIMATE)
+                self.assertEqual(55, p.count)
+                self.assertTrue(p.is_estimated)
+
+            self.assertEqual(0, count_queries(captured))
+
+        # Filtered querysets are counted and cached.
+        p = Pagination(self.queryset.filter(model__startswith="model0"), page_size=10, count=COUNT_ESTIMATE)
+        self.assertEqual(10, p.count)
+        self.assertFalse(p.is_estimated)
+
+    def test_count_exact(self):
+        """Check the page interface when the records are counted."""
+        p = Pagination(self.queryset, page=3, page_size=10, count=COUNT_EXACT)
+
+        self.assertEqual(55, p.count)
+        self.assertEqual(6, p.num_pages)
+        self.assertEqual([1, 2, 3, 4, 5, 6], p.page_range)
+        self.assertEqual(21, p.start_index())
+        self.assertEqual(30, p.end_index())
+        self.assertEqual(2, p.previous_page_number())
+        self.assertEqual(4, p.next_page_number())
+
+    def test_has_next(self):
+        """Check that the next page is found without counting the records."""
+        with CaptureQueriesContext(connection) as captured:
+            p = Pagination(self.queryset, page_size=10, count=None)
+            self.assertEqual(10, len(p))
+            self.assertTrue(p.has_next())
+            self.assertFalse(p.has_previous())
+            self.assertIsNone(p.num_pages)
+            self.assertEqual([1, 2], p.page_range)
+
+        self.assertEqual(1, len(captured.captured_queries))
+
+        p = Pagination(self.queryset, page="6", page_size=10, count=None)
+        self.assertEqual(5, len(p))
+        self.assertFalse(p.has_next())
+        self.assertEqual([1, None, 4, 5, 6], p.page_range)
+        self.assertRaises(EmptyPage, p.next_page_number)
+
+        self.assertEqual(1, Pagination(self.queryset, page="x", count=None).number)
+
+    def test_past_the_end(self):
+        """Check that a page past the end is the last page."""
+        p = Pagination(self.queryset, page=10, page_size=10, count=COUNT_EXACT)
+        self.assertEqual(5, len(p))
+        self.assertEqual(6, p.number)
+        self.assertEqual(6, p.num_pages)
+        self.assertEqual(5, p.previous_page_number())
+        self.assertEqual(51, p.start_index())
+        self.assertEqual(55, p.end_index())
+
+        # The last page is found by counting the records, even when they are not otherwise counted.
+        p = Pagination(self.queryset, page=10, page_size=10, count=None)
+        self.assertTrue(p.has_previous())
+        self.assertEqual(6, p.number)
+        self.assertIsNone(p.count)
+        self.assertEqual([1, None, 4, 5, 6], p.page_range)
+
+        output = p.to_html(framework="bootstrap4")
+        self.assertIn('href="?page=5">&laquo; Previous</a>', output)
+        self.assertNotIn("page=7", output)
+
+        p = Pagination(self.queryset.none(), page=3, count=None)
+        self.assertEqual(0, len(p))
+        self.assertEqual(1, p.number)
+        self.assertFalse(p.has_previous())
+
+    def test_to_html(self):
+        """Check the output of the page links."""
+        query = QueryDict("page=2&q=a%26b&tag=x&tag=y")
+        p = Pagination(self.queryset, page=query['page'], page_size=10, count=COUNT_EXACT, query=query)
+
+        self.assertEqual("?q=a%26b&tag=x&tag=y&page=3", p.get_url(3))
+
+        output = p.to_html(framework="bootstrap4")
+        self.assertTrue(output.startswith('<ul class="pagination">'))
+        self.assertIn('<li class="page-item active"><span class="page-link">2</span></li>', output)
+        self.assertIn('<a class="page-link" href="?q=a%26b&amp;tag=x&amp;tag=y&amp;page=6">6</a>', output)
+        self.assertEqual(8, output.count("<li"))
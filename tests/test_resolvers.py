@@ -0,0 +1,124 @@
+from django.test import override_settings
+from django.urls import NoReverseMatch, clear_url_caches, reverse, set_urlconf
+import unittest
+from unittest import mock
+from htmgel.resolvers import LazyURL, URLTemplate, clear_url_cache, reverse_url
+
+# Helpers
+
+
+class UnhashableKey(object):
+    __hash__ = None
+
+    def __str__(self):
+        return "1"
+
+# Tests
+
+
+class TestReverseURL(unittest.TestCase):
+
+    def setUp(self):
+        self.settings = override_settings(ROOT_URLCONF="tests.urls")
+        self.settings.enable()
+        clear_url_cache()
+
+    def tearDown(self):
+        self.settings.disable()
+
+    def test_reverse_url(self):
+        """Check that URLs are reversed once for the same arguments."""
+        with mock.patch("htmgel.resolvers.reverse", wraps=reverse) as _reverse:
+            self.assertEqual("/projects/1/", reverse_url("project_detail", args=[1], namespace="projects"))
+            self.assertEqual("/projects/1/", reverse_url("projects:project_detail", args=(1,)))
+            self.assertEqual("/projects/1/tasks/2/",
+                             reverse_url("projects:task_detail", kwargs={'project': 1, 'pk': 2}))
+            self.assertEqual("/projects/1/tasks/2/",
+                             reverse_url("projects:task_detail", kwargs={'pk': 2, 'project': 1}))
+
+            self.assertEqual(2, _reverse.call_count)
+
+            # Unhashable arguments are reversed every time.
+            self.assertEqual("/projects/1/", reverse_url("projects:project_detail", kwargs={'pk': UnhashableKey()}))
+            self.assertEqual(3, _reverse.call_count)
+
+        with self.assertRaises(NoReverseMatch):
+            reverse_url("missing")
+
+    def test_reverse_url_after_urlconf_changes(self):
+        """Check that URLs are reversed again when the URLconf changes."""
+        with mock.patch("htmgel.resolvers.reverse", wraps=reverse) as _reverse:
+            reverse_url("home")
+            reverse_url("home")
+            self.assertEqual(1, _reverse.call_count)
+
+            clear_url_caches()
+            reverse_url("home")
+            self.assertEqual(2, _reverse.call_count)
+
+            set_urlconf("tests.urls")
+            try:
+                reverse_url("home")
+            finally:
+                set_urlconf(None)
+
+            self.assertEqual(3, _reverse.call_count)
+
+
+class TestLazyURL(unittest.TestCase):
+
+    def setUp(self):
+        self.settings = override_settings(ROOT_URLCONF="tests.urls")
+        self.settings.enable()
+        clear_url_cache()
+
+    def tearDown(self):
+        self.settings.disable()
+
+    def test_str(self):
+        """Check that the URL is reversed when it is used."""
+        with mock.patch("htmgel.resolvers.reverse", wraps=reverse) as _reverse:
+            url = LazyURL("project_detail", args=[1], namespace="projects")
+            self.assertEqual(0, _reverse.call_count)
+
+            self.assertEqual("/projects/1/", str(url))
+            self.assertEqual(1, _reverse.call_count)
+
+
+class TestURLTemplate(unittest.TestCase):
+
+    def setUp(self):
+        self.settings = override_settings(ROOT_URLCONF="tests.urls")
+        self.settings.enable()
+        clear_url_cache()
+
+    def tearDown(self):
+        self.settings.disable()
+
+    def test_format(self):
+        """Check that the pattern is reversed once for any number of values."""
+        with mock.patch("htmgel.resolvers.reverse", wraps=reverse) as _reverse:
+            template = URLTemplate("projects:task_detail", kwargs={'project': 1})
+
+            self.assertEqual("/projects/1/tasks/2/", template.format(2))
+            self.assertEqual(
+                ["/projects/1/tasks/%s/" % i for i in range(100)],
+                template.format_many(range(100))
+            )
+            self.assertEqual(1, _reverse.call_count)
+
+    def test_format_positional(self):
+        """Check that a positional argument may vary."""
+        template = URLTemplate("project_detail", key=0, namespace="projects")
+
+        self.assertEqual(["/projects/1/", "/projects/2/"], template.format_many([1, 2]))
+
+    def test_format_without_placeholder(self):
+        """Check that URLs are reversed for each value when the placeholder cannot be split out of the URL."""
+        with mock.patch("htmgel.resolvers.URL_TEMPLATE_VALUES", ("1",)):
+            template = URLTemplate("projects:task_detail", kwargs={'project': 1})
+            self.assertIsNone(template.get_parts())
+            self.assertEqual("/projects/1/tasks/3/", template.format(3))
+
+        with self.assertRaises(NoReverseMatch):
+            URLTemplate("missing").format(1)
@@ -1,7 +1,13 @@
 from decimal import Decimal
+from django.template import TemplateDoesNotExist
+from django.test import override_settings
+from django.template import loader
 # import mock
+import os
 import unittest
-from htmgel.shortcuts import get_currency_display
+from unittest import mock
+from htmgel.shortcuts import clear_component_templates, get_component_template, get_component_template_name, \
+    get_currency_display, parse_template, preload_components
 
 # Helpers
 
@@ -27,3 +33,54 @@ class TestShortcuts(unittest.TestCase):
 
         output = get_currency_display(10, unit="EUR")
         self.assertEqual("&euro;10.00", output)
+
+        # Strings are not truncated to whole units.
+        output = get_currency_display("10.5")
+        self.assertEqual("$10.50", output)
+
+
+class TestComponentTemplates(unittest.TestCase):
+
+    def setUp(self):
+        clear_component_templates()
+
+    def tearDown(self):
+        clear_component_templates()
+
+    def test_get_component_template(self):
+        """Check that component templates are loaded once per framework."""
+        with mock.patch("htmgel.shortcuts.loader.get_template", wraps=loader.get_template) as get_template:
+            template = get_component_template("page_header")
+            self.assertIs(template, get_component_template("page_header.html"))
+            self.assertEqual(1, get_template.call_count)
+
+            get_component_template("page_header", framework="bootstrap3")
+            self.assertEqual(2, get_template.call_count)
+
+        self.assertRaises(TemplateDoesNotExist, get_component_template, "nonexistent")
+
+    def test_get_component_template_debug(self):
+        """Check that templates are loaded again after they are modified when debugging."""
+        with override_settings(DEBUG=True):
+            template = get_component_template("page_header")
+            self.assertIs(template, get_component_template("page_header"))
+
+            stat = os.stat(template.origin.name)
+            os.utime(template.origin.name, (stat.st_atime, stat.st_mtime + 1))
+            try:
+                self.assertIsNot(template, get_component_template("page_header"))
+            finally:
+                os.utime(template.origin.name, (stat.st_atime, stat.st_mtime))
+
+    def test_get_component_template_name(self):
+        """Check the template name of a component."""
+        self.assertEqual("htmgel/alert.html", get_component_template_name("alert"))
+        self.assertEqual("htmgel/bootstrap3/alert.html", get_component_template_name("bootstrap3/alert.html"))
+
+    def test_parse_template(self):
+        """Check rendering a template with a dict."""
+        self.assertEqual("<h1>Testing</h1>", parse_template("htmgel/page_header.html", {'title': "Testing"}).strip())
+
+    def test_preload_components(self):
+        """Check that only the components that exist are preloaded."""
+        self.assertEqual(["alert", "page_header"], preload_components())
@@ -1,10 +1,49 @@
 # import mock
+from datetime import date
+from decimal import Decimal
+from django.core.paginator import EmptyPage, InvalidPage
+from django.db import connection
+from django.db.models.query import QuerySet
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from functools import partial
 import unittest
-from htmgel.library import Table
+from unittest import mock
+from htmgel.library import Column, ColumnarTable, QuerysetTable, Row, SimpleRow, Table
+from htmgel.library.tables import _is_field_lookup, format_number_column, numpy
+from htmgel.resolvers import clear_url_cache
+from .testapp.models import Client, Invoice
 
 # Helpers
 
 
+def create_invoices():
+    """Create the tables of the benchmark project's models, and a few invoices."""
+    with connection.schema_editor() as editor:
+        editor.create_model(Client)
+        editor.create_model(Invoice)
+
+    acme = Client.objects.create(name="Acme")
+    widgets = Client.objects.create(name="Widgets & Co")
+
+    for i in range(1, 6):
+        Invoice.objects.create(
+            amount=Decimal(i * 100),
+            client=acme if i % 2 else widgets,
+            issued=date(2018, 1, i),
+            number="INV-%s" % i,
+            status="paid" if i < 3 else "open"
+        )
+
+
+def delete_invoices():
+    """Drop the tables created by ``create_invoices()``."""
+    with connection.schema_editor() as editor:
+        editor.delete_model(Invoice)
+        editor.delete_model(Client)
+
+
 # Tests
 
 
@@ -29,6 +68,30 @@ class TestTable(unittest.TestCase):
 
         self.assertEqual(3, count)
 
+    def test_add_row(self):
+        """Check that added rows may be changed."""
+        t = Table()
+        row = t.add_row(self.data[0])
+        self.assertIsInstance(row, Row)
+        self.assertFalse(hasattr(row, "__dict__"))
+
+        row.add_class("danger")
+        self.assertTrue(t.rows[0].to_html().startswith('<tr class="danger">'))
+
+    def test_add_rows(self):
+        """Check that rows added together are stored as tuples."""
+        t = Table()
+        t.add_rows(self.data[:2])
+
+        row = t.rows[0]
+        self.assertIsInstance(row, SimpleRow)
+        self.assertEqual(self.data[0], row.data)
+        self.assertEqual("<SimpleRow tr>", repr(row))
+        self.assertFalse(hasattr(row, "__dict__"))
+
+        self.assertEqual(Row(self.data[0]).to_html(), row.to_html())
+        self.assertEqual(2, len(t.rows))
+
     def test_add_column(self):
         """Check that table columns are properly added."""
         t = Table(caption="Test Table", classes="table table-bordered", id="test-table")
@@ -52,3 +115,332 @@ class TestTable(unittest.TestCase):
 
         output = t.to_html()
         self.assertTrue("Website Project" in output)
+
+    def test_to_html_columns(self):
+        """Check that cells are rendered using the options of their columns."""
+        t = Table()
+        t.add_column("project", attrs={'class': "name"})
+        t.add_column("start", formatter=lambda value: value.replace("-", "/"))
+        t.add_column("notes", escape=False)
+
+        t.add_row(("R&D", "2017-12-01", "<em>Late</em>"))
+        t.add_row(("Website", "2017-11-01", None), classes="warning")
+        t.add_row(("<Other>",))
+        t.add_row(("Intranet", "2018-01-01", "<em>On time</em>", "<Extra>"))
+
+        output = t.to_html()
+
+        self.assertTrue(
+            '<tr>\n<td class="name">R&amp;D</td>\n<td>2017/12/01</td>\n<td><em>Late</em></td>\n</tr>' in output
+        )
+        self.assertTrue('<tr class="warning">\n<td class="name">Website</td>' in output)
+
+        # The options of each column are applied by index when a row has fewer or more values than columns.
+        self.assertTrue('<tr>\n<td class="name">&lt;Other&gt;</td>\n</tr>' in output)
+        self.assertTrue('<td>2018/01/01</td>\n<td><em>On time</em></td>\n<td>&lt;Extra&gt;</td>' in output)
+
+    def test_add_action_column(self):
+        """Check that action buttons are rendered from a URL reversed once for the table."""
+        t = Table()
+        t.add_column("project")
+        t.add_action_column("projects:project_detail", text="View", framework="bootstrap4")
+        t.add_action_column("projects:task_detail", icon="pencil", pattern_kwargs={'project': 7},
+                            button_class="btn btn-link")
+
+        self.assertEqual(["project", "pk"], [c.name for c in t.get_data_columns()])
+        self.assertTrue(t.columns[1].hidden)
+
+        for i, d in enumerate(self.data):
+            t.add_row((d[0], i + 1))
+
+        with override_settings(ROOT_URLCONF="tests.urls"):
+            clear_url_cache()
+
+            with mock.patch("htmgel.resolvers.reverse", wraps=reverse) as _reverse:
+                output = t.to_html()
+
+            self.assertEqual(2, _reverse.call_count)
+
+        self.assertEqual(3, output.count("<th>"))
+        self.assertTrue(
+            '<tr>\n<td>Website Project</td>\n'
+            '<td><a class="btn btn-outline-secondary btn-sm" href="/projects/2/">View</a></td>\n'
+            '<td><a class="btn btn-link" href="/projects/7/tasks/2/">'
+            '<i class="fa fa-pencil" aria-hidden="true"></i></a></td>\n</tr>' in output
+        )
+
+        # Without its key, a row cannot be rendered.
+        t.add_row(("Intranet",))
+        with override_settings(ROOT_URLCONF="tests.urls"):
+            self.assertRaises(ValueError, t.to_html)
+
+    def test_iter_html(self):
+        """Check that streamed output is chunked and matches the full output."""
+        t = Table(caption="Test Table", classes="table table-bordered", id="test-table")
+        t.add_column("project")
+        t.add_column("start", title="Start Date")
+        t.add_column("end", title="End Date")
+        t.add_column("status")
+
+        for d in self.data:
+            t.add_row(d)
+
+        chunks = list(t.iter_html(batch_size=2))
+
+        # head, two batches of rows, foot
+        self.assertEqual(4, len(chunks))
+        self.assertTrue(chunks[0].endswith("<tbody>\n"))
+        self.assertTrue(chunks[-1].endswith("</table>"))
+        self.assertEqual(t.to_html(), "".join(chunks))
+
+
+class TestQuerysetTable(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        create_invoices()
+
+    @classmethod
+    def tearDownClass(cls):
+        delete_invoices()
+
+    def setUp(self):
+        self.queryset = Invoice.objects.order_by("number")
+
+    def test_iter_html(self):
+        """Check that rows are streamed from the queryset iterator."""
+        t = QuerysetTable(self.queryset, chunk_size=50)
+        t.add_column("number")
+        t.add_column("status")
+        t.add_column("missing")
+
+        with mock.patch.object(QuerySet, "iterator", autospec=True, side_effect=QuerySet.iterator) as iterator:
+            output = "".join(t.iter_html())
+
+        self.assertEqual(50, iterator.call_args[1]['chunk_size'])
+        self.assertTrue("<td>INV-2</td>" in output)
+        self.assertTrue("<td>None</td>" in output)
+        self.assertEqual(0, len(t.rows))
+
+    def test_load(self):
+        """Check that loading populates rows."""
+        t = QuerysetTable(self.queryset)
+        t.add_column("number")
+        t.add_column("is_paid")
+
+        count = 0
+        for row in t:
+            count += 1
+
+        self.assertEqual(5, count)
+        self.assertTrue(t.is_loaded)
+        self.assertEqual(("INV-2", True), t.rows[1].data)
+
+    def test_load_values_list(self):
+        """Check that only the columns are selected when every column is a field lookup."""
+        t = QuerysetTable(self.queryset)
+        t.add_column("number")
+        t.add_column("client__name")
+
+        self.assertEqual(("number", "client__name"), t.get_queryset().query.values_select)
+
+        t.load()
+        self.assertEqual(("INV-1", "Acme"), t.rows[0].data)
+
+    def test_load_action_column(self):
+        """Check that the key of an action column is selected along with the other columns."""
+        t = QuerysetTable(self.queryset)
+        t.add_column("number")
+        t.add_action_column("projects:project_detail", text="View", framework="bootstrap3")
+
+        self.assertEqual(("number", "pk"), t.get_queryset().query.values_select)
+
+        pk = self.queryset.get(number="INV-2").pk
+        with override_settings(ROOT_URLCONF="tests.urls"):
+            clear_url_cache()
+            output = t.to_html()
+
+        self.assertTrue('<a class="btn btn-default btn-xs" href="/projects/%s/">View</a>' % pk in output)
+
+    def test_load_relation(self):
+        """Check that a relation column displays the related object, whichever way the rows are loaded."""
+        self.assertFalse(_is_field_lookup(Invoice, "client"))
+        self.assertTrue(_is_field_lookup(Invoice, "client__name"))
+
+        t = QuerysetTable(self.queryset)
+        t.add_column("number")
+        t.add_column("client")
+
+        self.assertEqual({'client': {}}, t.get_queryset().query.select_related)
+        self.assertTrue("<td>Widgets &amp; Co</td>" in t.to_html())
+
+    def test_load_select_related(self):
+        """Check that model instances are loaded with related fields when a column is not a field lookup."""
+        t = QuerysetTable(self.queryset)
+        t.add_column("client__name")
+        t.add_column("is_paid")
+        t.add_column("client__missing")
+
+        queryset = t.get_queryset()
+        self.assertFalse(queryset.query.values_select)
+        self.assertEqual({'client': {}}, queryset.query.select_related)
+
+        with CaptureQueriesContext(connection) as captured:
+            t.load()
+
+        self.assertEqual(1, len(captured.captured_queries))
+        self.assertEqual(("Acme", True, None), t.rows[0].data)
+        self.assertEqual(("Widgets & Co", True, None), t.rows[1].data)
+
+    def test_page(self):
+        """Check offset paging without counting records."""
+        t = QuerysetTable(self.queryset, page=2, page_size=2)
+        t.add_column("number")
+        t.add_column("is_paid")
+        t.load()
+
+        self.assertEqual(["INV-3", "INV-4"], [row.data[0] for row in t.rows])
+        self.assertTrue(t.has_next())
+        self.assertTrue(t.has_previous())
+        self.assertEqual(3, t.next_page_number())
+        self.assertEqual(1, t.previous_page_number())
+
+        t = QuerysetTable(self.queryset, page="3", page_size=2)
+        t.add_column("number")
+        t.add_column("is_paid")
+        t.load()
+
+        self.assertEqual(1, len(t.rows))
+        self.assertFalse(t.has_next())
+
+        t = QuerysetTable(self.queryset, page_size=2)
+        self.assertRaises(EmptyPage, t.previous_page_number)
+
+    def test_page_keyset(self):
+        """Check keyset paging with a cursor."""
+        first = self.queryset.first().pk
+
+        t = QuerysetTable(self.queryset, cursor=first, order_by="id", page_size=2)
+        t.add_column("number")
+        output = t.to_html()
+
+        self.assertEqual(("number", "id"), t.get_queryset().query.values_select)
+        self.assertTrue("<td>INV-3</td>" in output)
+        self.assertFalse("INV-1" in output)
+        self.assertFalse("INV-4" in output)
+        self.assertFalse("<td>%s</td>" % (first + 1) in output)
+        self.assertTrue(t.has_next())
+        self.assertEqual(first + 2, t.next_cursor)
+
+        # There is no cursor for the previous page, and pages have no numbers.
+        self.assertFalse(t.has_previous())
+        self.assertRaises(EmptyPage, t.previous_page_number)
+        self.assertRaises(InvalidPage, t.next_page_number)
+
+        t = QuerysetTable(self.queryset, order_by="-id", page_size=2)
+        t.add_column("number")
+        t.load()
+
+        self.assertEqual(["INV-5", "INV-4"], [row.data[0] for row in t.rows])
+        self.assertFalse(t.has_previous())
+
+    def test_page_keyset_lookup(self):
+        """Check the cursor for an order by lookup across a relation when model instances are loaded."""
+        t = QuerysetTable(self.queryset, order_by="-client__name", page_size=1)
+        t.add_column("number")
+        t.add_column("is_paid")
+
+        queryset = t.get_queryset()
+        self.assertFalse(queryset.query.values_select)
+        self.assertEqual({'client': {}}, queryset.query.select_related)
+
+        with CaptureQueriesContext(connection) as captured:
+            t.load()
+
+        self.assertEqual(1, len(captured.captured_queries))
+        self.assertTrue(t.has_next())
+        self.assertEqual("Widgets & Co", t.next_cursor)
+
+        t = QuerysetTable(self.queryset, cursor=t.next_cursor, order_by="-client__name", page_size=1)
+        t.add_column("number")
+        t.add_column("is_paid")
+        t.load()
+
+        self.assertEqual("Acme", t.next_cursor)
+        self.assertTrue(t.rows[0].data[0] in ("INV-1", "INV-3", "INV-5"))
+
+
+class TestColumnarTable(unittest.TestCase):
+
+    def setUp(self):
+        self.t = ColumnarTable(caption="Invoices")
+        self.t.add_column("client")
+        self.t.add_column("issued", column_formatter="date")
+        self.t.add_column("amount", column_formatter="currency")
+        self.t.add_column("hours", column_formatter=lambda values: ["%sh" % v for v in values])
+
+        self.t.add_row(("Acme", date(2018, 1, 31), Decimal("1250.5"), 10))
+        self.t.add_row(("Widgets Inc", date(2017, 12, 1), Decimal("99"), 2))
+        self.t.add_row(("Example Co", date(2018, 1, 1), None, 4))
+
+    def test_add_rows(self):
+        """Check that rows given to the table or added together are split into the columns."""
+        self.t.add_rows([("Example Co", date(2018, 2, 1), Decimal("5"), 1)])
+
+        self.assertEqual(4, len(self.t))
+        self.assertEqual([10, 2, 4, 1], self.t.get_column("hours"))
+        self.assertEqual([], self.t.rows)
+
+        t = ColumnarTable(columns=[Column("client"), Column("hours")], rows=[("Acme", 10), ("Widgets Inc", 2)])
+        self.assertEqual(["Acme", "Widgets Inc"], t.get_column("client"))
+        self.assertEqual(("Widgets Inc", 2), list(t)[1].data)
+
+        row = t.add_row(("Example Co", 4))
+        self.assertEqual(("Example Co", 4), row.data)
+        self.assertRaises(ValueError, t.add_row, ("Example Co", 4), attrs={'class': "total"})
+
+    def test_iter(self):
+        """Check that rows are assembled from formatted columns."""
+        rows = list(self.t)
+
+        self.assertEqual(3, len(self.t))
+        self.assertEqual(("Acme", "2018-01-31", "$1,250.50", "10h"), rows[0].data)
+        self.assertEqual("", rows[2].data[2])
+        self.assertTrue("<td>$99.00</td>" in self.t.to_html())
+
+    def test_lengths(self):
+        """Check that columns of different lengths are not truncated."""
+        self.assertRaises(ValueError, self.t.add_row, ("Acme", date(2018, 1, 31)))
+
+        self.t.set_column("hours", [10, 2])
+        self.assertRaises(ValueError, list, self.t)
+
+    def test_sort(self):
+        """Check sorting all columns by one column."""
+        self.t.sort("issued")
+        self.assertEqual(["Widgets Inc", "Example Co", "Acme"], self.t.get_column("client"))
+
+        self.t.sort("amount", reverse=True)
+        self.assertEqual(["Acme", "Widgets Inc", "Example Co"], self.t.get_column("client"))
+
+    def test_total(self):
+        """Check the sum of a column."""
+        self.assertEqual(Decimal("1349.5"), self.t.total("amount"))
+        self.assertEqual(16, self.t.total("hours"))
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed.")
+    def test_arrays(self):
+        """Check columns given as NumPy arrays."""
+        t = ColumnarTable()
+        t.add_column("day", column_formatter="date",
+                     values=numpy.array(["2018-01-02", "2018-01-01"], dtype="datetime64[D]"))
+        t.add_column("total", column_formatter=partial(format_number_column, places=1),
+                     values=numpy.array([1500.25, 2.0]))
+
+        t.sort("total")
+
+        self.assertEqual(("2018-01-01", "2.0"), list(t)[0].data)
+        self.assertEqual(1502.25, t.total("total"))
+
+        t.add_row(("2018-01-03", 3))
+        self.assertEqual(3, len(t))
@@ -0,0 +1,182 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.template import Context, Engine
+from django.test import override_settings
+import os
+import subprocess
+import sys
+import unittest
+from unittest import mock
+from htmgel.shortcuts import parse_template
+from htmgel.templatetags import htmgel_tags
+from . import TESTS_PATH
+
+# Helpers
+
+
+def render(source, **context):
+    engine = Engine(libraries={'htmgel_tags': "htmgel.templatetags.htmgel_tags"})
+    template = engine.from_string("{% load htmgel_tags %}" + source)
+
+    return template.render(Context(context))
+
+
+class Title(object):
+
+    def __init__(self, text):
+        self.text = text
+
+    def __str__(self):
+        return self.text
+
+# Tests
+
+
+class TestHTML(unittest.TestCase):
+
+    def setUp(self):
+        self.settings = override_settings(HTML_FRAMEWORK="bootstrap3", HTMGEL_FRAGMENT_CACHE_ALIAS=None)
+        self.settings.enable()
+
+    def tearDown(self):
+        self.settings.disable()
+
+    def test_cache(self):
+        """Check that output is cached by the component and its arguments."""
+        source = '{% html "page_header" title=title cache=True %}'
+
+        with mock.patch.object(htmgel_tags, "_render_html", wraps=htmgel_tags._render_html) as _render_html:
+            self.assertEqual("<h1>Projects</h1>", render(source, title="Projects").strip())
+            self.assertEqual("<h1>Projects</h1>", render(source, title="Projects").strip())
+            self.assertEqual(1, _render_html.call_count)
+
+            self.assertEqual("<h1>Tasks</h1>", render(source, title="Tasks").strip())
+            self.assertEqual(2, _render_html.call_count)
+
+        # Components listed in the setting are cached by default.
+        with override_settings(HTMGEL_FRAGMENT_CACHE={'page_header': None}):
+            with mock.patch.object(htmgel_tags, "_render_html", wraps=htmgel_tags._render_html) as _render_html:
+                render('{% html "page_header" title="Projects" %}')
+                render('{% html "page_header" title="Projects" %}')
+                render('{% html "page_header" title="Projects" cache=False %}')
+
+            self.assertEqual(2, _render_html.call_count)
+
+    def test_cache_key(self):
+        """Check that output is cached by the given key rather than the arguments."""
+        source = '{% html "page_header" title=title cache_key="header" %}'
+
+        self.assertEqual("<h1>Projects</h1>", render(source, title="Projects").strip())
+        self.assertEqual("<h1>Projects</h1>", render(source, title="Tasks").strip())
+
+    def test_cache_key_components(self):
+        """Check that components given the same cache key do not share their output."""
+        header = render('{% html "page_header" title="Projects" cache_key="shared" %}')
+        alert = render('{% html "alert" message="Saved" cache_key="shared" %}')
+
+        self.assertEqual("<h1>Projects</h1>", header.strip())
+        self.assertIn("Saved", alert)
+        self.assertNotIn("<h1>", alert)
+
+    def test_context(self):
+        """Check that a component is rendered with the outer context and the arguments, which are then removed."""
+        context = {'items': ["a", "b"], 'label': "Note", 'message': "Outer", 'status': "warning"}
+        source = '{{ message }}|{% html "bootstrap3/alert" message="Saved" is_dismissible=True %}|{{ message }}' \
+                 '{{ is_dismissible }}'
+
+        component = parse_template("htmgel/bootstrap3/alert.html", dict(context, message="Saved", is_dismissible=True))
+        self.assertIn('<div class="alert alert-warning">', component)
+        self.assertEqual("Outer|%s|Outer" % component, render(source, **context))
+
+    def test_only(self):
+        """Check that a component is rendered with only the arguments, and that the outer context is unchanged."""
+        context = {'items': ["a", "b"], 'label': "Note", 'message': "Outer", 'status': "warning"}
+        source = '{{ message }}|{% html "bootstrap3/alert" message="Saved" only=True %}|{{ message }}{{ status }}'
+
+        component = parse_template("htmgel/bootstrap3/alert.html", {'message': "Saved"})
+        self.assertIn('<div class="alert alert-danger" role="alert">', component)
+        self.assertEqual("Outer|%s|Outerwarning" % component, render(source, **context))
+
+    def test_timeout(self):
+        """Check that output is cached for the given number of seconds."""
+        source = '{% html "page_header" title="Projects" cache=True timeout=timeout %}'
+
+        with mock.patch.object(htmgel_tags, "_render_html", wraps=htmgel_tags._render_html) as _render_html:
+            render(source, timeout=-1)
+            render(source, timeout=-1)
+            self.assertEqual(2, _render_html.call_count)
+
+            render(source, timeout=60)
+            render(source, timeout=60)
+            self.assertEqual(3, _render_html.call_count)
+
+    def test_uncacheable(self):
+        """Check that output is not cached when a key cannot be derived from the arguments."""
+        source = '{% html "page_header" title=title cache=True %}'
+
+        with self.assertLogs("htmgel.templatetags.htmgel_tags", level="WARNING"):
+            self.assertEqual("<h1>Projects</h1>", render(source, title=Title("Projects")).strip())
+            self.assertEqual("<h1>Tasks</h1>", render(source, title=Title("Tasks")).strip())
+
+
+class TestImport(unittest.TestCase):
+
+    def test_import_without_settings(self):
+        """Check that the library may be imported before settings are configured."""
+        code = "; ".join((
+            "import sys",
+            "import htmgel.constants",
+            "import htmgel.templatetags.htmgel_tags",
+            "from django.conf import settings",
+            "assert not settings.configured",
+            "assert 'django.forms' not in sys.modules",
+        ))
+
+        env = dict(os.environ)
+        env.pop("DJANGO_SETTINGS_MODULE", None)
+
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=os.path.dirname(TESTS_PATH),
+            env=env,
+            stderr=subprocess.PIPE
+        )
+        self.assertEqual(0, result.returncode, result.stderr.decode("utf-8"))
+
+
+class TestSettings(unittest.TestCase):
+
+    def test_html_framework(self):
+        """Check that the framework is only required when used."""
+        with self.assertRaises(ImproperlyConfigured):
+            # noinspection PyStatementEffect
+            htmgel_tags.HTML_FRAMEWORK
+
+        with override_settings(HTML_FRAMEWORK="bootstrap3"):
+            self.assertEqual("bootstrap3", htmgel_tags.HTML_FRAMEWORK)
+
+    def test_settings(self):
+        """Check that settings are read on first use and again when changed."""
+        self.assertEqual("USD", htmgel_tags.DEFAULT_CURRENCY)
+
+        with override_settings(DEFAULT_CURRENCY="EUR", HTMGEL_FRAGMENT_CACHE_SIZE=10):
+            self.assertEqual("EUR", htmgel_tags.DEFAULT_CURRENCY)
+            self.assertEqual(10, htmgel_tags.fragments.max_size)
+
+        self.assertEqual("USD", htmgel_tags.DEFAULT_CURRENCY)
+        self.assertEqual(256, htmgel_tags.fragments.max_size)
+
+        with self.assertRaises(AttributeError):
+            # noinspection PyStatementEffect
+            htmgel_tags.UNKNOWN
+
+    def test_display_currency(self):
+        """Check that the currency defaults to the DEFAULT_CURRENCY setting."""
+        with override_settings(DEFAULT_CURRENCY="EUR"):
+            self.assertEqual("&euro;10.00", htmgel_tags.display_currency(10))
+
+    def test_icon(self):
+        """Check that the icon framework defaults to the ICON_FRAMEWORK setting."""
+        self.assertIn("fa-user", htmgel_tags.icon("user"))
+
+        with override_settings(ICON_FRAMEWORK="glyphicon"):
+            self.assertIn("glyphicon-user", htmgel_tags.icon("user"))
@@ -0,0 +1,4 @@
+"""
+A Django application with the models the tests run against.
+
+"""
@@ -0,0 +1,18 @@
+from django.http import HttpResponse
+from django.urls import include, path
+
+
+def view(request, **kwargs):
+    return HttpResponse()
+
+
+project_patterns = [
+    path("", view, name="project_list"),
+    path("<int:pk>/", view, name="project_detail"),
+    path("<int:project>/tasks/<int:pk>/", view, name="task_detail"),
+]
+
+urlpatterns = [
+    path("", view, name="home"),
+    path("projects/", include((project_patterns, "projects"))),
+]